@@ -0,0 +1,362 @@
+"""
+性能基准测试（不需要网络，翻页测试使用本地模拟服务）
+
+用法:
+    python -m benchmarks.bench                       # 运行全部基准
+    python -m benchmarks.bench --only decode,table   # 只运行部分基准
+    python -m benchmarks.bench --save base.json      # 保存结果
+    python -m benchmarks.bench --compare base.json   # 与保存的结果对比，变慢超过阈值时退出码为1
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from benchmarks.mock_fofa import MockFofaServer, MockOptions, ResultGenerator
+from main.config import FofaConfig
+from models.table_bean import TabDataBean
+from utils.data_util import DataUtil
+from utils.export_util import CsvStreamWriter
+from utils.page_util import PaginationEngine
+from utils.project_util import ProjectUtil
+from utils.rate_limiter import RateLimiter
+from utils.request_util import RequestUtil
+from utils.warehouse_util import ResultWarehouse
+
+
+# 全部请求字段（基础字段 + 额外字段）
+FIELDS = FofaConfig.getInstance().fields + [
+    "lastupdatetime", "fid", "os", "icp", "product", "certs_subject_cn", "certs_subject_org"
+]
+ADDITIONAL_FIELDS = FIELDS[len(FofaConfig.getInstance().fields):]
+
+
+class Benchmark:
+    """
+    单项基准：setup准备数据（不计时），run执行一次（计时），返回处理的行数
+    
+    run也可以返回(行数, 耗时)，用于自行计时的基准（如子进程的启动时间）
+    """
+    
+    def __init__(self, name: str, description: str, run: Callable[[], Union[int, Tuple[int, float]]],
+                 setup: Optional[Callable[[], None]] = None, repeat: int = 3):
+        self.name = name
+        self.description = description
+        self.run = run
+        self.setup = setup
+        self.repeat = repeat
+    
+    def measure(self) -> Dict:
+        """执行repeat次，取最快的一次"""
+        best = None
+        rows = 0
+        for _ in range(self.repeat):
+            if self.setup:
+                self.setup()
+            gc.collect()
+            start = time.perf_counter()
+            rows = self.run()
+            elapsed = time.perf_counter() - start
+            if isinstance(rows, tuple):
+                rows, elapsed = rows
+            best = elapsed if best is None else min(best, elapsed)
+        return {"seconds": best, "rows": rows, "rows_per_sec": rows / best if best else 0.0}
+
+
+class Suite:
+    """基准测试集合（数据规模按scale缩放）"""
+    
+    def __init__(self, scale: float = 1.0, tempDir: str = ""):
+        """
+        Args:
+            scale: 数据规模系数（1.0为默认规模）
+            tempDir: 导出文件的临时目录
+        """
+        self.scale = scale
+        self.tempDir = tempDir
+        self.generator = ResultGenerator(MockOptions(duplicateRate=0.05))
+        self.rows = self.scaled(100000)
+        self.pageSize = 1000
+        self.bodies: List[bytes] = []
+        self.records: List[List[tuple]] = []
+        self.bean: Optional[TabDataBean] = None
+        self.benchmarks = [
+            Benchmark("decode", "解码响应并解析为行记录（loadsJson + parseResults）", self.runDecode, self.prepareBodies),
+            Benchmark("load_json", "loadJsonData写入Tab数据（表格模式）", self.runLoadJson, self.prepareBodies),
+            Benchmark("table", "逐页写入Tab数据并追加到表格模型、按IP排序", self.runTable, self.prepareRecords),
+            Benchmark("export_excel", "从Tab数据流式导出Excel", self.runExportExcel, self.prepareBean, repeat=1),
+            Benchmark("export_csv", "从Tab数据流式导出CSV", self.runExportCsv, self.prepareBean),
+            Benchmark("export_txt", "从Tab数据导出URL到TXT", self.runExportTxt, self.prepareBean),
+            Benchmark("project_save", "保存项目文件（按块列式序列化）", self.runProjectSave, self.prepareBean),
+            Benchmark("project_open", "打开项目文件并加载第一个数据块", self.runProjectOpen, self.prepareProject),
+            Benchmark("warehouse", "逐页写入本地结果库（新库插入后再合并一遍）", self.runWarehouse, self.prepareRecords),
+            Benchmark("pagination", "沿游标翻页拉取（模拟服务，每页20ms延迟）", self.runPagination, repeat=1),
+            Benchmark("pagination_502", "翻页拉取，单页条数超过账号限制（返回502后缩小条数）且5%的请求返回503", self.runPagination502, repeat=1),
+            Benchmark("startup", "冷启动到主窗口首次绘制完成（子进程）", self.runStartup, repeat=5),
+            Benchmark("startup_home", "冷启动到首页命令指南构建完成（子进程）", self.runStartupHome, repeat=5),
+        ]
+    
+    def scaled(self, count: int) -> int:
+        """按规模系数缩放的数量"""
+        return max(1000, int(count * self.scale))
+    
+    # 数据准备
+    
+    def prepareBodies(self):
+        """生成原始响应（每页pageSize条）"""
+        if self.bodies:
+            return
+        for cursor in range(0, self.rows, self.pageSize):
+            page = self.generator.page("bench", FIELDS, cursor, self.pageSize)
+            self.bodies.append(json.dumps(page, ensure_ascii=False).encode("utf-8"))
+    
+    def prepareRecords(self):
+        """生成解析后的行记录"""
+        if self.records:
+            return
+        self.prepareBodies()
+        for body in self.bodies:
+            self.records.append(DataUtil.parseResults(DataUtil.loadsJson(body)["results"], FIELDS))
+    
+    def prepareBean(self):
+        """生成写满数据的Tab数据"""
+        if self.bean is not None:
+            return
+        self.prepareRecords()
+        self.bean = TabDataBean(fields=list(ADDITIONAL_FIELDS))
+        for records in self.records:
+            DataUtil.loadRecords(self.bean, records, None, None, False)
+    
+    def prepareProject(self):
+        """生成项目文件"""
+        self.prepareBean()
+        if not os.path.exists(self.projectPath):
+            self.runProjectSave()
+    
+    @property
+    def projectPath(self) -> str:
+        return os.path.join(self.tempDir, "bench.fofa")
+    
+    # 基准
+    
+    def runDecode(self) -> int:
+        count = 0
+        for body in self.bodies:
+            count += len(DataUtil.parseResults(DataUtil.loadsJson(body)["results"], FIELDS))
+        return count
+    
+    def runLoadJson(self) -> int:
+        FofaConfig.getInstance().additionalField = list(ADDITIONAL_FIELDS)
+        bean = TabDataBean(fields=list(ADDITIONAL_FIELDS))
+        for body in self.bodies:
+            DataUtil.loadJsonData(bean, DataUtil.loadsJson(body), None, None, False)
+        return len(bean.rows)
+    
+    def runTable(self) -> int:
+        bean = TabDataBean(fields=list(ADDITIONAL_FIELDS))
+        model = createModel(bean)
+        for records in self.records:
+            DataUtil.loadRecords(bean, records, None, None, False)
+            if model is not None:
+                model.appendRows()
+        if model is not None:
+            model.sort(model.columnOf("ip"))
+        return len(bean.rows)
+    
+    def runExportExcel(self) -> int:
+        rows = list(self.bean.rows)
+        success, message = DataUtil.exportToExcel(
+            os.path.join(self.tempDir, "bench.xlsx"), "bench",
+            DataUtil.iterExcelBeans(rows), ([url] for url in DataUtil.iterUrls(rows)),
+            "", list(ADDITIONAL_FIELDS)
+        )
+        if not success:
+            raise RuntimeError(message)
+        return len(rows)
+    
+    def runExportCsv(self) -> int:
+        writer = CsvStreamWriter(os.path.join(self.tempDir, "bench.csv"), DataUtil.getExcelHeaders(ADDITIONAL_FIELDS))
+        for data in DataUtil.iterExcelBeans(self.bean.rows):
+            writer.writeRow(DataUtil.getExcelRow(data, ADDITIONAL_FIELDS))
+        writer.close()
+        return writer.rowCount
+    
+    def runExportTxt(self) -> int:
+        success, message = DataUtil.exportToTxt(
+            os.path.join(self.tempDir, "bench.txt"), DataUtil.iterUrls(self.bean.rows)
+        )
+        if not success:
+            raise RuntimeError(message)
+        return len(self.bean.rows)
+    
+    def runProjectSave(self) -> int:
+        error = ProjectUtil.save(self.projectPath, [("bench", self.bean)])
+        if error:
+            raise RuntimeError(error)
+        return len(self.bean.rows)
+    
+    def runProjectOpen(self) -> int:
+        count = 0
+        for tab in ProjectUtil.open(self.projectPath):
+            tab.loader.loadNext()
+            tab.loader.close()
+            count += tab.loader.rowCount
+        return count
+    
+    def runWarehouse(self) -> int:
+        path = Path(self.tempDir) / "warehouse.db"
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+        config = FofaConfig.getInstance()
+        config.warehouseStatus = True
+        try:
+            warehouse = ResultWarehouse(path)
+            for _ in range(2):
+                for records in self.records:
+                    warehouse.add("bench", records)
+                warehouse.flush()
+        finally:
+            config.warehouseStatus = False
+        return warehouse.written
+    
+    def paginate(self, options: MockOptions) -> int:
+        """对模拟服务翻页拉取全部结果，返回写入Tab数据的行数"""
+        with MockFofaServer(options) as server:
+            config = FofaConfig.getInstance()
+            config.API = server.url
+            config.key = "bench"
+            config.keyPool = []
+            url = config.getParam(False, str(self.pageSize), list(ADDITIONAL_FIELDS))
+            url += RequestUtil.getInstance().encode(f'mock_total="{self.scaled(20000)}"')
+            bean = TabDataBean(fields=list(ADDITIONAL_FIELDS))
+            for page in PaginationEngine(url).pages():
+                if page.error:
+                    raise RuntimeError(page.error)
+                DataUtil.ingestPage(bean, page)
+            return len(bean.rows)
+    
+    @staticmethod
+    def startupTimes() -> Dict[str, float]:
+        """在新进程中启动主窗口，返回各阶段距进程启动的时间（秒）"""
+        env = dict(os.environ)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        env["FOFA_BENCH_START"] = repr(time.time())
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup"], env=env, capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent.parent, timeout=60, check=True
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+    
+    def runStartup(self) -> Tuple[int, float]:
+        return 1, self.startupTimes()["first_frame"]
+    
+    def runStartupHome(self) -> Tuple[int, float]:
+        return 1, self.startupTimes()["home_ready"]
+    
+    def runPagination(self) -> int:
+        return self.paginate(MockOptions(latency=0.02))
+    
+    def runPagination502(self) -> int:
+        return self.paginate(MockOptions(latency=0.02, errorRate=0.05, errorStatus=503, retryAfter=0, maxSize=400))
+
+
+def createModel(bean: TabDataBean):
+    """创建表格模型（未安装PySide6时为None，只测试数据写入）"""
+    try:
+        from models.result_model import ResultTableModel
+    except ImportError:
+        return None
+    return ResultTableModel(bean.rows, bean.fields)
+
+
+def isolateConfig():
+    """使用独立的配置：不读写查询缓存和本地结果库、不限流"""
+    config = FofaConfig.getInstance()
+    config.cacheStatus = False
+    config.cacheOffline = False
+    config.warehouseStatus = False
+    config.apiRate = 0
+    config.fetchLimit = 0
+    RateLimiter._instances.clear()
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    与基线对比
+    
+    Returns:
+        变慢超过阈值的基准名称
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("seconds"):
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        result["baseline"] = base["seconds"]
+        result["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def printResults(results: Dict[str, Dict], regressions: List[str]):
+    """输出结果表格"""
+    print(f"{'基准':<16}{'行数':>10}{'耗时(s)':>12}{'行/秒':>14}{'对比基线':>12}")
+    for name, result in results.items():
+        ratio = f"{result['ratio']:.2f}x" if "ratio" in result else "-"
+        flag = "  <-- 变慢" if name in regressions else ""
+        print(f"{name:<16}{result['rows']:>10}{result['seconds']:>12.3f}{result['rows_per_sec']:>14.0f}{ratio:>12}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，返回退出码（有性能回退时为1）"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description="FOFA Viewer性能基准测试")
+    parser.add_argument("--only", help="只运行指定的基准（逗号分隔）")
+    parser.add_argument("--scale", type=float, default=1.0, help="数据规模系数（默认1.0，即10万行）")
+    parser.add_argument("--save", help="保存结果到JSON文件")
+    parser.add_argument("--compare", help="与JSON文件中的基线对比")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定为变慢的比例（默认0.2，即慢20%%）")
+    parser.add_argument("--list", action="store_true", help="列出全部基准")
+    args = parser.parse_args(argv)
+    
+    isolateConfig()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        suite = Suite(args.scale, temp_dir)
+        benchmarks = suite.benchmarks
+        if args.list:
+            for benchmark in benchmarks:
+                print(f"{benchmark.name:<16}{benchmark.description}")
+            return 0
+        if args.only:
+            names = {name.strip() for name in args.only.split(",")}
+            unknown = names - {benchmark.name for benchmark in benchmarks}
+            if unknown:
+                parser.error(f"未知的基准: {','.join(sorted(unknown))}")
+            benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in names]
+        
+        results = {}
+        for benchmark in benchmarks:
+            print(f"运行 {benchmark.name}: {benchmark.description}...", file=sys.stderr, flush=True)
+            results[benchmark.name] = benchmark.measure()
+    
+    regressions = []
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", baseline), args.threshold)
+    printResults(results, regressions)
+    
+    if args.save:
+        report = {"python": sys.version.split()[0], "scale": args.scale, "results": results}
+        Path(args.save).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+本地FOFA API模拟服务（/api/v1/search/next、/api/v1/info/my、/v1/search/tip）
+
+结果由查询语句和序号确定性生成，可配置结果数量、延迟和错误注入，
+用于在没有网络的环境下运行翻页、导出、分片和性能测试。
+查询中的country/protocol/port（=和!=）和after/before条件会过滤结果，
+分片查询的结果是原查询结果的子集。
+
+用法:
+    python -m benchmarks.mock_fofa --port 8765 --total 50000 --latency 0.05 --error-rate 0.02
+    # config.properties中设置 api=http://127.0.0.1:8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+# 端口 -> 协议
+PORTS = [(80, "http"), (443, "https"), (8080, "http"), (22, "ssh"), (3306, "mysql"), (8443, "https")]
+SERVERS = ["nginx", "Apache", "Microsoft-IIS/10.0", "openresty", "Tengine", ""]
+PRODUCTS = ["nginx", "Apache-Web-Server", "IIS", "OpenSSH", "MySQL", "Tomcat"]
+OSES = ["centos", "ubuntu", "windows", "debian", ""]
+COUNTRIES = ["CN", "CN", "CN", "US", "US", "JP", "DE", "HK", "SG", "RU", "BR", "VN", "ZA"]
+
+# 更新时间的范围（包含2015年之前的数据）
+DATE_FIRST = date(2012, 1, 1)
+DATE_DAYS = (date(2025, 12, 31) - DATE_FIRST).days + 1
+
+
+class MockOptions:
+    """模拟服务的行为参数"""
+    
+    def __init__(self, total: int = 10000, latency: float = 0.0, jitter: float = 0.0,
+                 errorRate: float = 0.0, errorStatus: int = 502, retryAfter: int = 1,
+                 duplicateRate: float = 0.0, quota: int = 100000, maxSize: int = 10000):
+        """
+        Args:
+            total: 每个查询的结果总数（查询中的 mock_total="N" 可单独指定）
+            latency: 每个请求的固定延迟（秒）
+            jitter: 延迟的随机波动（秒）
+            errorRate: 翻页请求返回错误的比例（0~1）
+            errorStatus: 注入的错误状态码（502/429/500/503等）
+            retryAfter: 429/503时的Retry-After（秒）
+            duplicateRate: 与前一条重复的结果比例（测试去重）
+            quota: 每个key的剩余查询次数
+            maxSize: 单页条数上限，超过时返回502（模拟账号限制）
+        """
+        self.total = total
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.errorStatus = errorStatus
+        self.retryAfter = retryAfter
+        self.duplicateRate = duplicateRate
+        self.quota = quota
+        self.maxSize = maxSize
+
+
+class ResultGenerator:
+    """
+    按查询语句和序号确定性生成结果行
+    
+    去掉过滤条件后的查询语句决定结果集合（mock_total条），过滤条件从中筛选；
+    after/before都按不包含当天处理（最严格的语义）。
+    """
+    
+    TOTAL_PATTERN = re.compile(r'mock_total="?(\d+)"?')
+    
+    # 过滤条件
+    CONDITION_PATTERN = re.compile(r'\b(country|protocol|port|after|before)\s*(!=|=)\s*"([^"]*)"')
+    
+    def __init__(self, options: MockOptions):
+        self.options = options
+        self._lock = threading.Lock()
+        # (种子, 总数, 条件) -> 符合条件的序号
+        self._matched: Dict[tuple, List[int]] = {}
+    
+    def totalOf(self, query: str) -> int:
+        """查询的结果总数（不考虑过滤条件）"""
+        match = self.TOTAL_PATTERN.search(query)
+        return int(match.group(1)) if match else self.options.total
+    
+    @staticmethod
+    def seedOf(query: str) -> int:
+        """查询对应的随机种子"""
+        return int.from_bytes(hashlib.md5(query.encode("utf-8")).digest()[:4], "big")
+    
+    @classmethod
+    def parseQuery(cls, query: str) -> Tuple[str, Tuple[Tuple[str, str, str], ...]]:
+        """
+        拆分查询语句
+        
+        Returns:
+            (去掉过滤条件及分片拼接的括号和&&后的查询, 过滤条件(字段, 运算符, 值))
+        """
+        conditions = tuple(cls.CONDITION_PATTERN.findall(query))
+        base = re.sub(r"[()&\s]", "", cls.CONDITION_PATTERN.sub("", query))
+        return base, conditions
+    
+    @staticmethod
+    def matches(values: Dict[str, str], conditions) -> bool:
+        """结果是否符合全部过滤条件"""
+        for name, operator, value in conditions:
+            if name == "after":
+                ok = values["lastupdatetime"][:10] > value
+            elif name == "before":
+                ok = values["lastupdatetime"][:10] < value
+            else:
+                ok = (values[name] == value) == (operator == "=")
+            if not ok:
+                return False
+        return True
+    
+    def matchedIndexes(self, seed: int, total: int, conditions) -> List[int]:
+        """符合过滤条件的结果序号（按查询缓存）"""
+        key = (seed, total, conditions)
+        with self._lock:
+            indexes = self._matched.get(key)
+        if indexes is None:
+            indexes = [
+                index for index in range(total)
+                if self.matches(self.values(seed, index), conditions)
+            ]
+            with self._lock:
+                self._matched[key] = indexes
+        return indexes
+    
+    def row(self, seed: int, index: int, fields: List[str]) -> List[str]:
+        """生成第index条结果（字段顺序与fields一致）"""
+        values = self.values(seed, index)
+        return [values.get(name, "") for name in fields]
+    
+    def values(self, seed: int, index: int) -> Dict[str, str]:
+        """生成第index条结果的全部字段"""
+        if index and self.options.duplicateRate:
+            # 按比例与前一条重复
+            if random.Random(seed ^ (index * 7919)).random() < self.options.duplicateRate:
+                index -= 1
+        rng = random.Random(seed * 1000003 + index)
+        n = seed % 997 + index
+        ip = f"{10 + n // 16581375 % 200}.{n // 65025 % 255}.{n // 255 % 255}.{n % 255 + 1}"
+        port, protocol = PORTS[rng.randrange(len(PORTS))]
+        domain = f"site{n}.example.com" if rng.random() < 0.6 else ""
+        name = domain or ip
+        if protocol in ("http", "https"):
+            host = name if port in (80, 443) else f"{name}:{port}"
+            if protocol == "https":
+                host = f"https://{host}"
+            link = host if host.startswith("https://") else f"http://{host}"
+            title = f"Site {n} - {rng.choice(['Login', 'Home', 'Dashboard', 'Welcome'])}"
+        else:
+            host = f"{name}:{port}"
+            link = ""
+            title = ""
+        values = {
+            "host": host,
+            "title": title,
+            "ip": ip,
+            "domain": domain,
+            "port": str(port),
+            "protocol": protocol,
+            "server": rng.choice(SERVERS) if protocol in ("http", "https") else "",
+            "link": link,
+            "fid": hashlib.md5(f"fid{n % 50}".encode()).hexdigest()[:24],
+            "os": rng.choice(OSES),
+            "icp": f"京ICP备{n % 1000:08d}号" if domain and rng.random() < 0.3 else "",
+            "product": rng.choice(PRODUCTS),
+            "certs_subject_cn": domain if protocol == "https" else "",
+            "certs_subject_org": "Example Inc." if protocol == "https" else "",
+            "country": rng.choice(COUNTRIES),
+        }
+        # 更新时间分布在DATE_FIRST之后的DATE_DAYS天中
+        day = DATE_FIRST + timedelta(days=rng.randrange(DATE_DAYS))
+        values["lastupdatetime"] = f"{day.isoformat()} 00:00:00"
+        return values
+    
+    def page(self, query: str, fields: List[str], cursor: int, size: int) -> Dict:
+        """生成一页响应"""
+        base, conditions = self.parseQuery(query)
+        seed = self.seedOf(base)
+        if conditions:
+            indexes = self.matchedIndexes(seed, self.totalOf(base), conditions)
+        else:
+            indexes = range(self.totalOf(base))
+        total = len(indexes)
+        end = min(cursor + size, total)
+        return {
+            "error": False,
+            "size": total,
+            "page": cursor // max(size, 1) + 1,
+            "mode": "extended",
+            "query": query,
+            "results": [self.row(seed, index, fields) for index in indexes[cursor:end]],
+            "next": str(end) if end < total else "",
+        }
+
+
+class MockFofaServer:
+    """
+    本地FOFA API模拟服务
+    
+    key为"invalid"时返回[-700]错误；每个key的查询次数用完后返回[820031]错误。
+    """
+    
+    def __init__(self, options: Optional[MockOptions] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            options: 行为参数
+            host: 监听地址
+            port: 监听端口，0表示随机端口
+        """
+        self.options = options or MockOptions()
+        self.generator = ResultGenerator(self.options)
+        self.requests = 0  # 收到的请求数
+        self.errors = 0  # 注入的错误数
+        self.remain: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+        self.httpd = ThreadingHTTPServer((host, port), self._handlerClass())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """服务地址（可直接作为FofaConfig.API）"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'MockFofaServer':
+        """在后台线程启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MockFofa", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self) -> 'MockFofaServer':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _sleep(self):
+        """模拟网络延迟"""
+        delay = self.options.latency
+        if self.options.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.options.jitter)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _injectError(self) -> bool:
+        """按比例决定本次请求是否返回错误"""
+        if not self.options.errorRate:
+            return False
+        with self._lock:
+            inject = self._random.random() < self.options.errorRate
+            if inject:
+                self.errors += 1
+        return inject
+    
+    def _consume(self, key: str) -> Optional[Dict]:
+        """扣除一次查询次数，key无效或额度用完时返回错误响应"""
+        if not key or key == "invalid":
+            return {"error": True, "errmsg": "[-700] 账号无效"}
+        with self._lock:
+            remain = self.remain.setdefault(key, self.options.quota)
+            if remain <= 0:
+                return {"error": True, "errmsg": "[820031] F点余额不足"}
+            self.remain[key] = remain - 1
+        return None
+    
+    def search(self, params: Dict[str, List[str]]):
+        """/api/v1/search/next，返回(状态码, 响应头, 响应体)"""
+        self._sleep()
+        if self._injectError():
+            headers = {}
+            if self.options.errorStatus in (429, 503):
+                headers["Retry-After"] = str(self.options.retryAfter)
+            return self.options.errorStatus, headers, b"error"
+        
+        size = int(params.get("size", ["100"])[0] or 100)
+        if size > self.options.maxSize:
+            return 502, {}, b"Bad Gateway"
+        error = self._consume(params.get("key", [""])[0])
+        if error:
+            return 200, {}, json.dumps(error).encode()
+        
+        try:
+            query = base64.b64decode(params.get("qbase64", [""])[0]).decode("utf-8")
+        except ValueError:
+            return 200, {}, json.dumps({"error": True, "errmsg": "[-1] qbase64解码失败"}).encode()
+        fields = params.get("fields", ["host,ip,port"])[0].split(",")
+        cursor = int(params.get("next", ["0"])[0] or 0)
+        body = self.generator.page(query, fields, cursor, size)
+        return 200, {}, json.dumps(body, ensure_ascii=False).encode("utf-8")
+    
+    def info(self, params: Dict[str, List[str]]):
+        """/api/v1/info/my"""
+        self._sleep()
+        key = params.get("key", [""])[0]
+        if not key or key == "invalid":
+            return 200, {}, json.dumps({"error": True, "errmsg": "[-700] 账号无效"}).encode()
+        with self._lock:
+            remain = self.remain.setdefault(key, self.options.quota)
+        body = {
+            "error": False, "email": f"{key}@example.com", "username": key, "fofa_point": 0,
+            "remain_free_point": 0, "remain_api_query": remain, "remain_api_data": remain * 100,
+            "isvip": True, "vip_level": 2,
+        }
+        return 200, {}, json.dumps(body).encode()
+    
+    def tip(self, params: Dict[str, List[str]]):
+        """/v1/search/tip"""
+        self._sleep()
+        word = params.get("q", [""])[0]
+        data = [{"name": f"{word}{i}", "company": f"Company {i}"} for i in range(5)] if word else []
+        return 200, {}, json.dumps({"code": 0, "data": data}, ensure_ascii=False).encode("utf-8")
+    
+    def _handlerClass(self):
+        """请求处理类（绑定到本实例）"""
+        server = self
+        routes = {
+            "/api/v1/search/next": self.search,
+            "/api/v1/search/all": self.search,
+            "/api/v1/info/my": self.info,
+            "/v1/search/tip": self.tip,
+        }
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                parsed = urlparse(self.path)
+                route = routes.get(parsed.path)
+                if route is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    status, headers, body = route(parse_qs(parsed.query))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+        
+        return Handler
+
+
+def main():
+    """命令行启动模拟服务"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mock_fofa", description="本地FOFA API模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--total", type=int, default=10000, help="每个查询的结果总数")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟的随机波动（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="翻页请求返回错误的比例")
+    parser.add_argument("--error-status", type=int, default=502, help="注入的错误状态码")
+    parser.add_argument("--retry-after", type=int, default=1, help="429/503的Retry-After（秒）")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="重复结果的比例")
+    parser.add_argument("--quota", type=int, default=100000, help="每个key的剩余查询次数")
+    parser.add_argument("--max-size", type=int, default=10000, help="单页条数上限，超过时返回502")
+    args = parser.parse_args()
+    
+    options = MockOptions(
+        total=args.total, latency=args.latency, jitter=args.jitter, errorRate=args.error_rate,
+        errorStatus=args.error_status, retryAfter=args.retry_after, duplicateRate=args.duplicate_rate,
+        quota=args.quota, maxSize=args.max_size
+    )
+    server = MockFofaServer(options, args.host, args.port)
+    print(f"FOFA模拟服务: {server.url}（Ctrl+C退出）")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
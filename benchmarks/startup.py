@@ -0,0 +1,66 @@
+"""
+启动时间探测（由bench.py的startup基准在子进程中运行）
+
+从进程启动开始计时，输出一行JSON：
+    first_frame: 主窗口首次绘制完成、事件循环空闲（可交互）的时间
+    home_ready: 首页内容（命令指南）构建完成的时间
+"""
+import json
+import os
+import sys
+import time
+
+# 父进程启动子进程前记录的时间，未指定时从导入本模块开始计时
+START = float(os.environ.get("FOFA_BENCH_START") or time.time())
+
+from PySide6.QtCore import QEvent, QObject, QTimer  # noqa: E402
+
+from main.app import createApplication  # noqa: E402
+from controllers.main_controller import MainWindow  # noqa: E402
+
+
+class StartupProbe(QObject):
+    """监听主窗口的首次绘制"""
+    
+    def __init__(self, app, window: MainWindow):
+        super().__init__()
+        self.app = app
+        self.window = window
+        self.result = {}
+        self.painted = False
+        window.installEventFilter(self)
+    
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Type.Paint and not self.painted:
+            # 绘制结束、回到事件循环后才算可交互
+            self.painted = True
+            QTimer.singleShot(0, self.onFirstFrame)
+        return False
+    
+    def onFirstFrame(self):
+        self.result["first_frame"] = time.time() - START
+        self.waitHome()
+    
+    def waitHome(self):
+        """等待首页内容构建完成（旧版本在构造主窗口时就已构建）"""
+        home_tab = getattr(self.window, "home_tab", None)
+        if home_tab is not None and home_tab.layout() is None:
+            QTimer.singleShot(0, self.waitHome)
+            return
+        self.result["home_ready"] = time.time() - START
+        self.app.quit()
+
+
+def main():
+    app = createApplication(sys.argv)
+    window = MainWindow()
+    probe = StartupProbe(app, window)
+    window.show()
+    # 防止窗口未绘制时一直等待
+    QTimer.singleShot(30000, app.quit)
+    app.exec()
+    print(json.dumps(probe.result))
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,10 @@ class ConfigDialog(QDialog):
         proxy_tab = self.createProxyTab()
         tab_widget.addTab(proxy_tab, "代理配置")
         
+        # 缓存配置Tab
+        cache_tab = self.createCacheTab()
+        tab_widget.addTab(cache_tab, "缓存配置")
+        
         layout.addWidget(tab_widget)
         
         # 按钮
@@ -76,6 +80,19 @@ class ConfigDialog(QDialog):
         key_layout.addWidget(self.key_input)
         layout.addLayout(key_layout)
         
+        # 额外密钥（多账号）
+        pool_layout = QHBoxLayout()
+        pool_layout.addWidget(QLabel("Key Pool:"))
+        self.pool_input = QLineEdit()
+        self.pool_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.pool_input.setPlaceholderText("其他账号的Key，逗号分隔")
+        self.pool_input.setText(",".join(self.config.keyPool))
+        pool_layout.addWidget(self.pool_input)
+        pool_btn = ModernButton("查询额度", self)
+        pool_btn.clicked.connect(self.showKeyPoolStatus)
+        pool_layout.addWidget(pool_btn)
+        layout.addLayout(pool_layout)
+        
         # 最大条数
         size_layout = QHBoxLayout()
         size_layout.addWidget(QLabel("Max Size:"))
@@ -84,6 +101,46 @@ class ConfigDialog(QDialog):
         size_layout.addWidget(self.size_input)
         layout.addLayout(size_layout)
         
+        # 翻页拉取上限
+        limit_layout = QHBoxLayout()
+        limit_layout.addWidget(QLabel("Fetch Limit:"))
+        self.limit_input = QLineEdit()
+        self.limit_input.setPlaceholderText("0表示拉取全部")
+        self.limit_input.setText(str(self.config.fetchLimit))
+        limit_layout.addWidget(self.limit_input)
+        layout.addLayout(limit_layout)
+        
+        # 批量补充数据并发数
+        concurrency_layout = QHBoxLayout()
+        concurrency_layout.addWidget(QLabel("Concurrency:"))
+        self.concurrency_input = QLineEdit()
+        self.concurrency_input.setPlaceholderText("批量获取favicon等的并发上限")
+        self.concurrency_input.setText(str(self.config.enrichConcurrency))
+        concurrency_layout.addWidget(self.concurrency_input)
+        layout.addLayout(concurrency_layout)
+        
+        # 分片查询预算
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("Shard Budget:"))
+        self.budget_input = QLineEdit()
+        self.budget_input.setPlaceholderText("分片查询最多拉取的总条数，0表示不限制")
+        self.budget_input.setText(str(self.config.shardBudget))
+        budget_layout.addWidget(self.budget_input)
+        layout.addLayout(budget_layout)
+        
+        # API限流
+        rate_layout = QHBoxLayout()
+        rate_layout.addWidget(QLabel("Rate Limit:"))
+        self.rate_input = QLineEdit()
+        self.rate_input.setPlaceholderText("每秒请求数，0表示不限流")
+        self.rate_input.setText(str(self.config.apiRate))
+        rate_layout.addWidget(self.rate_input)
+        rate_layout.addWidget(QLabel("Burst:"))
+        self.burst_input = QLineEdit()
+        self.burst_input.setText(str(self.config.apiBurst))
+        rate_layout.addWidget(self.burst_input)
+        layout.addLayout(rate_layout)
+        
         # 检查剩余用量（使用按钮主题）
         check_group = QGroupBox("检查剩余用量")
         check_layout = QHBoxLayout()
@@ -193,18 +250,167 @@ class ConfigDialog(QDialog):
         
         return widget
     
+    def createCacheTab(self) -> QWidget:
+        """创建缓存配置Tab"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        
+        # 缓存状态（使用按钮主题）
+        status_group = QGroupBox("查询缓存")
+        status_layout = QHBoxLayout()
+        status_layout.setSpacing(10)
+        
+        self.cache_enable_btn = ModernButton("启用", self)
+        self.cache_enable_btn.setCheckable(True)
+        self.cache_enable_btn.clicked.connect(lambda: self.cache_disable_btn.setChecked(False))
+        
+        self.cache_disable_btn = ModernButton("禁用", self)
+        self.cache_disable_btn.setCheckable(True)
+        self.cache_disable_btn.clicked.connect(lambda: self.cache_enable_btn.setChecked(False))
+        
+        status_layout.addWidget(self.cache_enable_btn)
+        status_layout.addWidget(self.cache_disable_btn)
+        status_layout.addStretch()
+        status_group.setLayout(status_layout)
+        layout.addWidget(status_group)
+        
+        # 离线回放（只读缓存，不消耗查询额度）
+        offline_group = QGroupBox("离线回放")
+        offline_layout = QHBoxLayout()
+        offline_layout.setSpacing(10)
+        
+        self.offline_enable_btn = ModernButton("启用", self)
+        self.offline_enable_btn.setCheckable(True)
+        self.offline_enable_btn.clicked.connect(lambda: self.offline_disable_btn.setChecked(False))
+        
+        self.offline_disable_btn = ModernButton("禁用", self)
+        self.offline_disable_btn.setCheckable(True)
+        self.offline_disable_btn.clicked.connect(lambda: self.offline_enable_btn.setChecked(False))
+        
+        offline_layout.addWidget(self.offline_enable_btn)
+        offline_layout.addWidget(self.offline_disable_btn)
+        offline_layout.addStretch()
+        offline_group.setLayout(offline_layout)
+        layout.addWidget(offline_group)
+        
+        # 本地结果库（保存全部拉取过的结果，可离线检索）
+        warehouse_group = QGroupBox("本地结果库")
+        warehouse_layout = QHBoxLayout()
+        warehouse_layout.setSpacing(10)
+        
+        self.warehouse_enable_btn = ModernButton("启用", self)
+        self.warehouse_enable_btn.setCheckable(True)
+        self.warehouse_enable_btn.clicked.connect(lambda: self.warehouse_disable_btn.setChecked(False))
+        
+        self.warehouse_disable_btn = ModernButton("禁用", self)
+        self.warehouse_disable_btn.setCheckable(True)
+        self.warehouse_disable_btn.clicked.connect(lambda: self.warehouse_enable_btn.setChecked(False))
+        
+        self.warehouse_stats_label = QLabel("")
+        
+        warehouse_layout.addWidget(self.warehouse_enable_btn)
+        warehouse_layout.addWidget(self.warehouse_disable_btn)
+        warehouse_layout.addStretch()
+        warehouse_layout.addWidget(self.warehouse_stats_label)
+        warehouse_group.setLayout(warehouse_layout)
+        layout.addWidget(warehouse_group)
+        
+        # 有效期
+        ttl_layout = QHBoxLayout()
+        ttl_label = QLabel("有效期(分钟):")
+        ttl_label.setMinimumWidth(110)
+        ttl_layout.addWidget(ttl_label)
+        self.cache_ttl_input = QLineEdit()
+        self.cache_ttl_input.setPlaceholderText("0表示永不过期")
+        ttl_layout.addWidget(self.cache_ttl_input)
+        layout.addLayout(ttl_layout)
+        
+        # 容量上限
+        size_layout = QHBoxLayout()
+        size_label = QLabel("容量上限(MB):")
+        size_label.setMinimumWidth(110)
+        size_layout.addWidget(size_label)
+        self.cache_size_input = QLineEdit()
+        size_layout.addWidget(self.cache_size_input)
+        layout.addLayout(size_layout)
+        
+        # 清空缓存
+        clear_layout = QHBoxLayout()
+        self.cache_stats_label = QLabel("")
+        clear_layout.addWidget(self.cache_stats_label)
+        clear_layout.addStretch()
+        clear_btn = ModernButton("清空缓存", self)
+        clear_btn.clicked.connect(self.clearCache)
+        clear_layout.addWidget(clear_btn)
+        layout.addLayout(clear_layout)
+        
+        layout.addStretch()
+        
+        return widget
+    
+    def updateCacheStats(self):
+        """显示缓存占用"""
+        from utils.cache_util import ResponseCache
+        stats = ResponseCache.getInstance().stats()
+        self.cache_stats_label.setText(f"已缓存 {stats['count']} 页，占用 {stats['size'] / 1024 / 1024:.1f} MB")
+        
+        from utils.warehouse_util import ResultWarehouse
+        stats = ResultWarehouse.getInstance().stats()
+        self.warehouse_stats_label.setText(f"共 {stats['count']} 条，占用 {stats['size'] / 1024 / 1024:.1f} MB")
+    
+    def showKeyPoolStatus(self):
+        """查询输入框中全部Key的剩余额度"""
+        from utils.key_pool import KeyPool
+        keys = [self.key_input.text().strip()] + self.pool_input.text().split(",")
+        keys = list(dict.fromkeys(key.strip() for key in keys if key.strip()))
+        if not keys:
+            QMessageBox.warning(self, "警告", "请先填写FOFA Key")
+            return
+        pool = KeyPool.getInstance()
+        lines = [pool.refresh(key).describe() for key in keys]
+        QMessageBox.information(self, "账号额度", "\n".join(lines))
+    
+    def clearCache(self):
+        """清空缓存"""
+        from utils.cache_util import ResponseCache
+        ResponseCache.getInstance().clear()
+        self.updateCacheStats()
+    
     def loadConfig(self):
         """加载配置"""
         # 加载FOFA配置
         self.api_input.setText(self.config.API)
         self.key_input.setText(self.config.key)
+        self.pool_input.setText(",".join(self.config.keyPool))
         self.size_input.setText(self.config.size)
+        self.limit_input.setText(str(self.config.fetchLimit))
+        self.concurrency_input.setText(str(self.config.enrichConcurrency))
+        self.budget_input.setText(str(self.config.shardBudget))
+        self.rate_input.setText(str(self.config.apiRate))
+        self.burst_input.setText(str(self.config.apiBurst))
         
         if self.config.checkStatus:
             self.check_enable_btn.setChecked(True)
         else:
             self.check_disable_btn.setChecked(True)
         
+        # 加载缓存配置
+        if self.config.cacheStatus:
+            self.cache_enable_btn.setChecked(True)
+        else:
+            self.cache_disable_btn.setChecked(True)
+        if self.config.cacheOffline:
+            self.offline_enable_btn.setChecked(True)
+        else:
+            self.offline_disable_btn.setChecked(True)
+        if self.config.warehouseStatus:
+            self.warehouse_enable_btn.setChecked(True)
+        else:
+            self.warehouse_disable_btn.setChecked(True)
+        self.cache_ttl_input.setText(str(self.config.cacheTTL))
+        self.cache_size_input.setText(str(self.config.cacheMaxSize))
+        self.updateCacheStats()
+        
         # 加载代理配置
         if self.proxy_config.status:
             self.proxy_enable_btn.setChecked(True)
@@ -228,8 +434,19 @@ class ConfigDialog(QDialog):
         # 更新配置
         self.config.API = self.api_input.text().strip()
         self.config.setKey(self.key_input.text().strip())
+        self.config.setKeyPool(self.pool_input.text())
         self.config.setSize(self.size_input.text().strip())
+        self.config.setFetchLimit(self.limit_input.text().strip())
+        self.config.setEnrichConcurrency(self.concurrency_input.text().strip())
+        self.config.setShardBudget(self.budget_input.text().strip())
+        self.config.setApiRate(self.rate_input.text().strip())
+        self.config.setApiBurst(self.burst_input.text().strip())
         self.config.checkStatus = self.check_enable_btn.isChecked()
+        self.config.cacheStatus = self.cache_enable_btn.isChecked()
+        self.config.cacheOffline = self.offline_enable_btn.isChecked()
+        self.config.warehouseStatus = self.warehouse_enable_btn.isChecked()
+        self.config.setCacheTTL(self.cache_ttl_input.text().strip())
+        self.config.setCacheMaxSize(self.cache_size_input.text().strip())
         
         self.proxy_config.status = self.proxy_enable_btn.isChecked()
         self.proxy_config.proxy_type = self.proxy_type_combo.currentText()
@@ -251,8 +468,19 @@ class ConfigDialog(QDialog):
                 # 写入配置项
                 f.write(f"api={self.config.API}\n")
                 f.write(f"key={self.config.key}\n")
+                f.write(f"key_pool={','.join(self.config.keyPool)}\n")
                 f.write(f"max_size={self.config.size}\n")
+                f.write(f"fetch_limit={self.config.fetchLimit}\n")
+                f.write(f"enrich_concurrency={self.config.enrichConcurrency}\n")
+                f.write(f"shard_budget={self.config.shardBudget}\n")
+                f.write(f"api_rate={self.config.apiRate}\n")
+                f.write(f"api_burst={self.config.apiBurst}\n")
                 f.write(f"check_status={'on' if self.config.checkStatus else 'off'}\n")
+                f.write(f"cache_status={'on' if self.config.cacheStatus else 'off'}\n")
+                f.write(f"cache_ttl={self.config.cacheTTL}\n")
+                f.write(f"cache_max_size={self.config.cacheMaxSize}\n")
+                f.write(f"cache_offline={'on' if self.config.cacheOffline else 'off'}\n")
+                f.write(f"warehouse_status={'on' if self.config.warehouseStatus else 'off'}\n")
                 f.write(f"proxy_status={'on' if self.proxy_config.status else 'off'}\n")
                 f.write(f"proxy_type={self.proxy_config.proxy_type}\n")
                 f.write(f"proxy_ip={self.proxy_config.proxy_ip}\n")
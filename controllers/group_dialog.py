@@ -0,0 +1,72 @@
+"""
+分组统计对话框
+"""
+from typing import List, Tuple
+
+from PySide6.QtWidgets import (
+    QApplication, QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QHeaderView, QDialogButtonBox
+)
+from PySide6.QtCore import Qt, Signal
+
+
+class GroupDialog(QDialog):
+    """分组统计对话框（双击分组发起对应的FOFA查询）"""
+    querySelected = Signal(str)
+    
+    def __init__(self, title: str, header: str, groups: List[Tuple[str, int]], queryFormat: str, parent=None):
+        """
+        Args:
+            title: 窗口标题
+            header: 分组值的列名
+            groups: [(分组值, 数量)]，按数量降序
+            queryFormat: 查询语句模板，如 'icon_hash="{}"'
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.queryFormat = queryFormat
+        
+        self.setWindowTitle(title)
+        self.setMinimumSize(420, 360)
+        
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"共 {len(groups)} 组，双击分组查询同{header}的资产"))
+        
+        self.table = QTableWidget(len(groups), 2)
+        self.table.setHorizontalHeaderLabels([header, "数量"])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for row, (value, count) in enumerate(groups):
+            self.table.setItem(row, 0, QTableWidgetItem(value))
+            count_item = QTableWidgetItem(str(count))
+            count_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, 1, count_item)
+        self.table.doubleClicked.connect(lambda index: self.onGroupClicked(index.row()))
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        copy_btn = button_box.addButton("复制全部查询", QDialogButtonBox.ButtonRole.ActionRole)
+        copy_btn.clicked.connect(self.copyQueries)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+    
+    def queries(self) -> List[str]:
+        """全部分组的查询语句"""
+        return [
+            self.queryFormat.format(self.table.item(row, 0).text())
+            for row in range(self.table.rowCount())
+        ]
+    
+    def copyQueries(self):
+        """复制全部分组的查询语句（每行一条）"""
+        QApplication.clipboard().setText("\n".join(self.queries()))
+    
+    def onGroupClicked(self, row: int):
+        """双击分组"""
+        item = self.table.item(row, 0)
+        if item and item.text():
+            self.querySelected.emit(self.queryFormat.format(item.text()))
+            self.accept()
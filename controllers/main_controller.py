@@ -1,52 +1,235 @@
 """
 主窗口控制器
 """
-import json
 import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-    QTableWidget, QTableWidgetItem, QLineEdit, QCheckBox,
+    QTableView, QHeaderView, QLineEdit, QCheckBox,
     QLabel, QMenuBar, QMenu, QMessageBox, QFileDialog,
-    QAbstractItemView, QGroupBox, QStatusBar, QApplication
+    QAbstractItemView, QGroupBox, QStatusBar, QApplication, QProgressDialog
 )
 from PySide6.QtCore import Qt, QThread, Signal, QTimer, QUrl
 from PySide6.QtGui import QAction, QIcon, QDesktopServices
 
 from main.config import FofaConfig, ProxyConfig
 from utils.request_util import RequestUtil
+from utils.async_request_util import AsyncRequestUtil
 from utils.data_util import DataUtil
-from models.table_bean import TableBean, ExcelBean, TabDataBean
+from utils.page_util import PaginationEngine
+from utils.export_util import PullExportJob, STREAM_WRITERS
+from utils.enrich_util import BatchJob, FaviconHashJob, CertHarvestJob, StatusCheckJob
+from utils.shard_util import ShardPlanner, ShardRunner
+from utils.task_scheduler import Task, TaskPriority, TaskScheduler
+from utils.project_util import PROJECT_SUFFIX, ProjectUtil
+from utils.warehouse_util import ResultWarehouse
+from models.table_bean import TabDataBean, PageBean
+from models.result_store import ResultRow
+from models.result_model import ResultTableModel
 from widgets.modern_button import ModernButton
 from widgets.styled_label import StyledLabel
-from widgets.command_guide import CommandGuide
+from controllers.group_dialog import GroupDialog
+from controllers.task_dialog import TaskDialog
 from utils.theme import ThemeManager, ThemeMode
-from utils.ui_style import UIStyle
 
 
-class QueryThread(QThread):
-    """查询线程"""
-    finished = Signal(dict)
+class QueryTask(Task):
+    """
+    查询任务（沿next游标翻页）
+    
+    翻页线程负责请求和解析，本任务负责去重并写入Tab数据，
+    每页写入后只向界面发出新增行数。
+    """
+    pageLoaded = Signal(object)
     error = Signal(str)
     
-    def __init__(self, url: str, parent=None):
-        super().__init__(parent)
+    PRIORITY = TaskPriority.QUERY
+    
+    def __init__(self, url: str, tabData: TabDataBean, limit: int = 0, cursor: Optional[str] = None,
+                 owner: Optional[str] = None):
+        super().__init__(f"查询 {owner}", owner)
         self.url = url
-        self.request_util = RequestUtil.getInstance()
+        self.tabData = tabData
+        self.engine = PaginationEngine(url, limit, cursor)
     
     def run(self):
         """执行查询"""
         try:
-            result = self.request_util.getHTML(self.url, 120000, 120000)
-            self.finished.emit(result)
+            for page in self.engine.pages():
+                self.pageLoaded.emit(DataUtil.ingestPage(self.tabData, page))
         except Exception as e:
             self.error.emit(str(e))
+    
+    def cancel(self):
+        """取消翻页"""
+        super().cancel()
+        self.engine.cancel()
+
+
+class ShardQueryTask(Task):
+    """分片查询任务（探测总数并规划分片，再并发拉取各分片，每页到达即发出）"""
+    planned = Signal(int, int, str)  # 结果总数, 分片数, 无法完整拉取的分片说明
+    pageLoaded = Signal(object)
+    error = Signal(str)
+    done = Signal(list)  # 拉取失败的分片查询语句
+    
+    PRIORITY = TaskPriority.QUERY
+    
+    def __init__(self, planner: ShardPlanner, tabData: TabDataBean, budget: int = 0,
+                 owner: Optional[str] = None):
+        super().__init__(f"分片查询 {owner}", owner)
+        self.planner = planner
+        self.tabData = tabData
+        self.budget = budget
+        self.runner: Optional[ShardRunner] = None
+    
+    def run(self):
+        """执行分片查询"""
+        try:
+            shards = self.planner.plan()
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        if self.isCancelled():
+            return
+        
+        self.planned.emit(self.planner.total, len(shards), self.planner.describeTruncated(shards))
+        
+        failed = []
+        
+        def on_page(shard, page):
+            if page.error:
+                failed.append(shard.query)
+                return
+            # 各分片合并到同一个Tab，总数以整个查询为准，分片结束前不视为最后一页
+            page.total = self.planner.total
+            page.next = None
+            page.hasMore = True
+            # 在分片的拉取线程中去重并写入Tab数据
+            self.pageLoaded.emit(DataUtil.ingestPage(self.tabData, page))
+        
+        self.runner = ShardRunner(self.planner, shards, self.budget)
+        if self.isCancelled():
+            return
+        self.runner.run(on_page)
+        if not self.isCancelled():
+            self.done.emit(failed)
+    
+    def cancel(self):
+        """取消分片查询"""
+        super().cancel()
+        self.planner.cancel()
+        if self.runner:
+            self.runner.cancel()
+
+
+class ExportTask(Task):
+    """导出任务（从Tab数据行流式写入Excel/TXT，支持进度和取消）"""
+    progress = Signal(int)
+    done = Signal(bool, str)
+    
+    PRIORITY = TaskPriority.EXPORT
+    
+    def __init__(self, exportFormat: str, fileName: str, tabTitle: str, rows: List[ResultRow],
+                 additionalField: Optional[List[str]] = None, errorPage: str = ""):
+        super().__init__(f"导出 {Path(fileName).name}")
+        self.exportFormat = exportFormat
+        self.fileName = fileName
+        self.tabTitle = tabTitle
+        self.rows = rows
+        self.additionalField = additionalField
+        self.errorPage = errorPage
+    
+    def run(self):
+        """执行导出"""
+        if self.exportFormat == "excel":
+            success, message = DataUtil.exportToExcel(
+                self.fileName,
+                self.tabTitle,
+                DataUtil.iterExcelBeans(self.rows),
+                ([url] for url in DataUtil.iterUrls(self.rows)),
+                self.errorPage,
+                self.additionalField,
+                self.progress.emit,
+                self.cancelEvent
+            )
+        else:
+            success, message = DataUtil.exportToTxt(
+                self.fileName,
+                DataUtil.iterUrls(self.rows),
+                self.progress.emit,
+                self.cancelEvent
+            )
+        self.done.emit(success, message)
+
+
+class PullExportTask(Task):
+    """全量导出任务（翻页拉取并直接写入文件）"""
+    progress = Signal(int, int)
+    done = Signal(bool, str)
+    
+    PRIORITY = TaskPriority.EXPORT
+    
+    def __init__(self, job: PullExportJob):
+        super().__init__(f"全量导出 {Path(job.fileName).name}")
+        self.job = job
+    
+    def run(self):
+        """执行拉取和导出"""
+        success, message = self.job.run(self.progress.emit)
+        self.done.emit(success, message)
+    
+    def cancel(self):
+        """取消导出"""
+        super().cancel()
+        self.job.cancel()
+
+
+class EnrichTask(Task):
+    """批量补充数据任务（job在异步请求工具的事件循环中并发执行）"""
+    progress = Signal(int, int)
+    done = Signal(object)
+    
+    PRIORITY = TaskPriority.ENRICH
+    
+    def __init__(self, job, title: str, owner: Optional[str] = None):
+        super().__init__(title, owner)
+        self.job = job
+    
+    def run(self):
+        """执行批量任务"""
+        self.done.emit(self.job.run(self.progress.emit))
+    
+    def cancel(self):
+        """取消任务"""
+        super().cancel()
+        self.job.cancel()
+
+
+class CallTask(Task):
+    """单次请求任务（在工作线程中调用函数，结果通过done发出）"""
+    done = Signal(object)
+    
+    PRIORITY = TaskPriority.QUERY
+    SHORT = True
+    
+    def __init__(self, title: str, func, *args):
+        super().__init__(title)
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        """执行调用"""
+        self.done.emit(self.func(*self.args))
 
 
 class MainWindow(QMainWindow):
     """主窗口"""
     
+    # 逐个写入结果的批量任务每完成多少个目标刷新一次表格
+    STREAM_REFRESH_STEP = 50
+    
     def __init__(self):
         super().__init__()
         self.config = FofaConfig.getInstance()
@@ -59,8 +242,15 @@ class MainWindow(QMainWindow):
         # Tab数据字典 {tab_title: TabDataBean}
         self.tab_data = {}
         
-        # 线程列表（用于管理线程）
-        self.threads = []
+        # 后台任务调度器
+        self.scheduler = TaskScheduler.getInstance()
+        self.scheduler.failed.connect(self.onTaskFailed)
+        
+        # 查询任务 {tab_title: QueryTask/ShardQueryTask}
+        self.query_tasks = {}
+        
+        # 当前项目文件路径
+        self.project_path = ""
         
         # 主题管理器
         self.theme_manager = ThemeManager.getInstance()
@@ -68,7 +258,8 @@ class MainWindow(QMainWindow):
         # 初始化UI
         self.initUI()
         
-        # 初始化首页
+        # 首页占位（内容在首次绘制后构建）
+        self.home_built = False
         self.initHomePage()
         
         # 应用主题
@@ -79,9 +270,6 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("FOFA By: 2tina")
         self.setMinimumSize(1280, 800)
         
-        # 应用现代样式
-        self.setStyleSheet(UIStyle.getMainStyleSheet())
-        
         # 创建中央widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -96,13 +284,7 @@ class MainWindow(QMainWindow):
         
         # 创建查询区域（卡片式）
         query_card = QWidget()
-        query_card.setStyleSheet(f"""
-            QWidget {{
-                background-color: {UIStyle.BG_CARD};
-                border-radius: {UIStyle.RADIUS_LARGE}px;
-                padding: 15px;
-            }}
-        """)
+        query_card.setObjectName("queryCard")  # 样式见UIStyle.getMainStyleSheet
         query_card_layout = QVBoxLayout(query_card)
         query_card_layout.setSpacing(12)
         query_card_layout.setContentsMargins(15, 15, 15, 15)
@@ -122,16 +304,6 @@ class MainWindow(QMainWindow):
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
         self.statusBar.showMessage("就绪")
-        
-        # 设置状态栏样式
-        self.statusBar.setStyleSheet(f"""
-            QStatusBar {{
-                background-color: rgba(42, 45, 58, 0.8);
-                color: {UIStyle.TEXT_SECONDARY};
-                border-top: 1px solid {UIStyle.BG_DIVIDER};
-                padding: 8px;
-            }}
-        """)
     
     def createMenuBar(self):
         """创建菜单栏（现代风格）"""
@@ -148,6 +320,12 @@ class MainWindow(QMainWindow):
         save_action.triggered.connect(self.saveProject)
         project_menu.addAction(save_action)
         
+        project_menu.addSeparator()
+        
+        warehouse_action = QAction("搜索本地结果库", self)
+        warehouse_action.triggered.connect(self.searchWarehouse)
+        project_menu.addAction(warehouse_action)
+        
         # 配置菜单
         config_menu = menubar.addMenu("配置")
         
@@ -168,6 +346,12 @@ class MainWindow(QMainWindow):
         white_action.triggered.connect(lambda: self.switchTheme(ThemeMode.WHITE))
         theme_menu.addAction(white_action)
         
+        config_menu.addSeparator()
+        
+        task_action = QAction("任务队列", self)
+        task_action.triggered.connect(self.showTasks)
+        config_menu.addAction(task_action)
+        
         # 帮助菜单
         help_menu = menubar.addMenu("帮助")
         
@@ -210,11 +394,31 @@ class MainWindow(QMainWindow):
         self.export_btn.clicked.connect(self.exportAction)
         first_row.addWidget(self.export_btn)
         
+        # 全量导出按钮（翻页拉取后直接写入文件，不显示到表格）
+        self.pull_export_btn = ModernButton("全量导出", self)
+        self.pull_export_btn.clicked.connect(self.pullExportAction)
+        first_row.addWidget(self.pull_export_btn)
+        
         # 全选按钮
         self.select_all_btn = ModernButton("全选", self)
         self.select_all_btn.clicked.connect(self.selectAllAction)
         first_row.addWidget(self.select_all_btn)
         
+        # 批量计算favicon hash按钮（选中行，未选中时为整个Tab）
+        self.favicon_btn = ModernButton("Favicon", self)
+        self.favicon_btn.clicked.connect(self.faviconHashAction)
+        first_row.addWidget(self.favicon_btn)
+        
+        # 批量获取证书按钮
+        self.cert_btn = ModernButton("证书", self)
+        self.cert_btn.clicked.connect(self.certHarvestAction)
+        first_row.addWidget(self.cert_btn)
+        
+        # 批量检测存活按钮（http/https资产）
+        self.status_btn = ModernButton("存活", self)
+        self.status_btn.clicked.connect(self.statusCheckAction)
+        first_row.addWidget(self.status_btn)
+        
         self.query_layout.addLayout(first_row)
         
         # 第二行：复选框（放在查询输入框下面）
@@ -251,38 +455,42 @@ class MainWindow(QMainWindow):
         self.check_is_all = QCheckBox("全部")
         checkbox_container.addWidget(self.check_is_all)
         
+        # 结果超过单次查询上限时拆分为多个分片并发拉取
+        self.check_shard = QCheckBox("分片")
+        checkbox_container.addWidget(self.check_shard)
+        
+        # 隐藏存活检测无响应的资产（作用于全部Tab）
+        self.check_hide_dead = QCheckBox("隐藏无响应")
+        self.check_hide_dead.toggled.connect(self.applyDeadFilter)
+        checkbox_container.addWidget(self.check_hide_dead)
+        
         checkbox_container.addStretch()  # 添加弹性空间，使复选框靠左对齐
         
         second_row.addLayout(checkbox_container, 3)  # 与输入框对齐
         self.query_layout.addLayout(second_row)
     
     def initHomePage(self):
-        """初始化首页"""
-        home_tab = QWidget()
-        layout = QVBoxLayout(home_tab)
+        """添加首页Tab（先占位，窗口首次绘制后再构建内容，缩短启动时间）"""
+        self.home_tab = QWidget()
+        self.tab_widget.addTab(self.home_tab, "首页")
+    
+    def paintEvent(self, event):
+        """首次绘制后构建首页内容"""
+        super().paintEvent(event)
+        if not self.home_built:
+            self.home_built = True
+            QTimer.singleShot(0, self.buildHomePage)
+    
+    def buildHomePage(self):
+        """构建首页内容（证书、Favicon计算和命令指南）"""
+        from widgets.command_guide import CommandGuide
+        
+        layout = QVBoxLayout(self.home_tab)
         layout.setSpacing(15)
         layout.setContentsMargins(15, 15, 15, 15)
         
         # 证书查询区域
         cert_group = QGroupBox("计算证书序列号")
-        cert_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_LARGE}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-size: 14px;
-                color: {UIStyle.TEXT_PRIMARY};
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-        """)
         cert_layout = QHBoxLayout()
         cert_layout.setSpacing(12)
         cert_layout.setContentsMargins(0, 0, 0, 0)
@@ -303,24 +511,6 @@ class MainWindow(QMainWindow):
         
         # Favicon查询区域
         favicon_group = QGroupBox("计算Favicon Hash")
-        favicon_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_LARGE}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-size: 14px;
-                color: {UIStyle.TEXT_PRIMARY};
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-        """)
         favicon_layout = QHBoxLayout()
         favicon_layout.setSpacing(12)
         favicon_layout.setContentsMargins(0, 0, 0, 0)
@@ -343,8 +533,6 @@ class MainWindow(QMainWindow):
         command_guide = CommandGuide(self)
         command_guide.command_clicked.connect(self.onCommandClicked)
         layout.addWidget(command_guide, 1)  # 占据剩余空间
-        
-        self.tab_widget.addTab(home_tab, "首页")
     
     def onCommandClicked(self, command: str):
         """命令指南点击事件"""
@@ -373,70 +561,89 @@ class MainWindow(QMainWindow):
             if not query_text:
                 continue
             
-            tab_title = query_text
-            
-            # 处理排除干扰选项
-            if self.check_honeypot.isChecked():
-                if not query_text.startswith("(*)"):
-                    tab_title = f"(*){query_text}"
-                    query_text = f"({query_text}) && (is_honeypot=false && is_fraud=false)"
+            tab_title, query_text = self.buildQueryText(query_text)
             
             # 检查Tab是否已存在
             if self.isTabExists(tab_title):
                 self.tab_widget.setCurrentIndex(self.getTabIndex(tab_title))
                 continue
             
-            # 设置额外字段
-            additional_fields = []
-            if self.check_fid.isChecked():
-                additional_fields.append("fid")
-            if self.check_os.isChecked():
-                additional_fields.append("os")
-            if self.check_icp.isChecked():
-                additional_fields.append("icp")
-            if self.check_product.isChecked():
-                additional_fields.append("product")
-            if self.check_cert_cn.isChecked():
-                additional_fields.append("certs_subject_cn")
-            if self.check_cert_org.isChecked():
-                additional_fields.append("certs_subject_org")
-            if self.check_last_update.isChecked():
-                additional_fields.append("lastupdatetime")
-            
-            self.config.additionalField = additional_fields
-            
             # 创建查询URL
-            encoded_query = self.request_util.encode(query_text)
-            url = self.config.getParam(self.check_is_all.isChecked()) + encoded_query
+            additional_fields = self.getAdditionalFields()
+            url = self.buildQueryUrl(query_text, additional_fields)
             
             # 创建Tab和数据Bean
-            tab = self.createResultTab(tab_title)
-            tab_data = TabDataBean()
+            tab_data = TabDataBean(fields=list(additional_fields))
+            tab = self.createResultTab(tab_title, tab_data)
             self.tab_data[tab_title] = tab_data
             
             # 执行查询
-            self.executeQuery(url, tab, tab_data, tab_title)
+            if self.check_shard.isChecked():
+                self.executeShardQuery(query_text, tab, tab_data, tab_title)
+            else:
+                self.executeQuery(url, tab, tab_data, tab_title)
+    
+    def buildQueryText(self, query_text: str):
+        """
+        处理排除干扰选项
+        
+        Returns:
+            (Tab标题, 实际查询语句)
+        """
+        tab_title = query_text
+        if self.check_honeypot.isChecked():
+            if not query_text.startswith("(*)"):
+                tab_title = f"(*){query_text}"
+                query_text = f"({query_text}) && (is_honeypot=false && is_fraud=false)"
+        return tab_title, query_text
+    
+    def getAdditionalFields(self) -> List[str]:
+        """获取勾选的额外字段"""
+        additional_fields = []
+        if self.check_fid.isChecked():
+            additional_fields.append("fid")
+        if self.check_os.isChecked():
+            additional_fields.append("os")
+        if self.check_icp.isChecked():
+            additional_fields.append("icp")
+        if self.check_product.isChecked():
+            additional_fields.append("product")
+        if self.check_cert_cn.isChecked():
+            additional_fields.append("certs_subject_cn")
+        if self.check_cert_org.isChecked():
+            additional_fields.append("certs_subject_org")
+        if self.check_last_update.isChecked():
+            additional_fields.append("lastupdatetime")
+        return additional_fields
     
-    def createResultTab(self, title: str) -> QWidget:
+    def buildQueryUrl(self, query_text: str, additional_fields: List[str]) -> str:
+        """创建查询URL（不带next游标）"""
+        self.config.additionalField = additional_fields
+        encoded_query = self.request_util.encode(query_text)
+        return self.config.getParam(self.check_is_all.isChecked()) + encoded_query
+    
+    def createResultTab(self, title: str, tab_data: TabDataBean) -> QWidget:
         """创建结果Tab"""
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
-        # 创建表格
-        table = QTableWidget()
-        table.setColumnCount(8 + len(self.config.additionalField))
-        headers = ["序号", "HOST", "标题", "IP", "端口", "域名", "协议", "Server"]
-        headers.extend(self.config.additionalField)
-        table.setHorizontalHeaderLabels(headers)
+        # 创建表格（模型直接读取Tab数据行，只渲染可见行）
+        table = QTableView()
+        model = ResultTableModel(tab_data.rows, tab_data.fields + tab_data.columns, table)
+        if self.check_hide_dead.isChecked():
+            model.setFilter(self.deadFilter(tab_data))
+        table.setModel(model)
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)  # 改为单选
+        table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)  # 多选，用于批量操作
         table.setContextMenuPolicy(Qt.ContextMenuPolicy.NoContextMenu)  # 禁用右键菜单
         table.setAlternatingRowColors(False)  # 不交替显示颜色，只显示一个颜色
         table.horizontalHeader().setStretchLastSection(True)
+        table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
         table.setSortingEnabled(True)
         
-        # 隐藏行号（verticalHeader），避免左侧乱码
+        # 隐藏行号（verticalHeader），避免左侧乱码；固定行高，大数据量时无需逐行计算
         table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
         # 设置表格字体，确保中文正确显示（使用UTF-8编码）
         font = table.font()
@@ -468,38 +675,7 @@ class MainWindow(QMainWindow):
         table.setProperty("encoding", "UTF-8")
         
         # 只保留双击访问URL功能
-        table.itemDoubleClicked.connect(lambda item: self.openUrlFromTable(table, item.row()))
-        
-        # 设置表格样式（现代深色主题）
-        table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {UIStyle.BG_SECONDARY};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_LARGE}px;
-                gridline-color: {UIStyle.BG_DIVIDER};
-                selection-background-color: {UIStyle.BTN_GRADIENT_START};
-                selection-color: {UIStyle.TEXT_PRIMARY};
-            }}
-            QTableWidget::item {{
-                padding: 10px;
-                border: none;
-                background-color: {UIStyle.BG_SECONDARY};
-                color: {UIStyle.TEXT_PRIMARY};
-            }}
-            QTableWidget::item:selected {{
-                background-color: {UIStyle.BTN_GRADIENT_START};
-                color: {UIStyle.TEXT_PRIMARY};
-            }}
-            QHeaderView::section {{
-                background-color: {UIStyle.BG_CARD};
-                color: {UIStyle.TEXT_PRIMARY};
-                padding: 12px;
-                border: none;
-                border-bottom: 2px solid {UIStyle.BG_DIVIDER};
-                font-weight: bold;
-                font-size: 13px;
-            }}
-        """)
+        table.doubleClicked.connect(lambda index: self.openUrlFromTable(table, index.row()))
         
         layout.addWidget(table)
         
@@ -510,70 +686,124 @@ class MainWindow(QMainWindow):
         return tab
     
     def executeQuery(self, url: str, tab: QWidget, tab_data: TabDataBean, tab_title: str):
-        """执行查询"""
+        """执行查询（翻页拉取，每页到达即追加到表格）"""
         # 显示加载状态
-        table = tab.findChild(QTableWidget)
-        if table:
-            table.setRowCount(1)
-            table.setItem(0, 0, QTableWidgetItem("正在查询..."))
+        table = tab.findChild(QTableView)
+        if table and not tab_data.rows:
+            table.model().setMessage("正在查询...")
         
-        # 创建查询线程
-        thread = QueryThread(url, self)
+        # 创建查询任务
+        task = QueryTask(url, tab_data, self.config.fetchLimit, tab_data.next, tab_title)
         
         # 连接信号
-        def on_finished(result):
-            self.onQueryFinished(result, tab, tab_data, tab_title)
-            if thread in self.threads:
-                self.threads.remove(thread)
+        def on_page(page):
+            self.onPageLoaded(page, tab, tab_data, tab_title)
         
         def on_error(error):
             self.onQueryError(error, tab)
-            if thread in self.threads:
-                self.threads.remove(thread)
         
-        thread.finished.connect(on_finished)
-        thread.error.connect(on_error)
-        self.threads.append(thread)
-        thread.start()
+        def on_done():
+            if self.query_tasks.get(tab_title) is task:
+                del self.query_tasks[tab_title]
+        
+        task.pageLoaded.connect(on_page)
+        task.error.connect(on_error)
+        task.finished.connect(on_done)
+        self.query_tasks[tab_title] = task
+        self.scheduler.submit(task)
     
-    def onQueryFinished(self, result: Dict, tab: QWidget, tab_data: TabDataBean, tab_title: str):
-        """查询完成回调（确保在主线程执行）"""
-        # 确保在主线程执行UI更新
-        app = QApplication.instance()
-        if app and app.thread() != QThread.currentThread():
-            QTimer.singleShot(0, lambda: self.onQueryFinished(result, tab, tab_data, tab_title))
+    def executeShardQuery(self, query_text: str, tab: QWidget, tab_data: TabDataBean, tab_title: str):
+        """执行分片查询（各分片结果合并去重到同一个Tab）"""
+        table = tab.findChild(QTableView)
+        if table:
+            table.model().setMessage("正在探测结果总数并规划分片...")
+        
+        planner = ShardPlanner(query_text, tab_data.fields, self.check_is_all.isChecked())
+        task = ShardQueryTask(planner, tab_data, self.config.shardBudget, tab_title)
+        
+        def on_planned(total, shards, note):
+            message = f"共 {total} 条结果，拆分为 {shards} 个分片，正在拉取..."
+            if note:
+                message += f"（{note}）"
+            self.statusBar.showMessage(message)
+        
+        def on_page(page):
+            self.onPageLoaded(page, tab, tab_data, tab_title)
+        
+        def on_error(error):
+            self.onQueryError(error, tab)
+            QMessageBox.warning(self, "错误", error)
+        
+        def on_shards_done(failed):
+            if self.tab_data.get(tab_title) is not tab_data:
+                return
+            tab_data.hasMoreData = False
+            message = f"分片查询完成: {tab_data.total} 条结果，已加载 {tab_data.count} 条"
+            if task.runner and task.runner.skipped:
+                message += f"，{task.runner.skipped} 个分片超出预算未拉取"
+            if failed:
+                message += f"，{len(failed)} 个分片拉取失败"
+            self.statusBar.showMessage(message)
+            if table and not tab_data.rows:
+                table.model().setMessage("无查询结果")
+        
+        def on_done():
+            if self.query_tasks.get(tab_title) is task:
+                del self.query_tasks[tab_title]
+        
+        task.planned.connect(on_planned)
+        task.pageLoaded.connect(on_page)
+        task.error.connect(on_error)
+        task.done.connect(on_shards_done)
+        task.finished.connect(on_done)
+        self.query_tasks[tab_title] = task
+        self.scheduler.submit(task)
+    
+    def onPageLoaded(self, page: PageBean, tab: QWidget, tab_data: TabDataBean, tab_title: str):
+        """单页结果到达回调（信号在主线程执行）"""
+        # Tab已关闭则丢弃
+        if self.tab_data.get(tab_title) is not tab_data:
             return
         
-        table = tab.findChild(QTableWidget)
+        table = tab.findChild(QTableView)
         if not table:
             return
+        model = table.model()
         
-        if result.get("code") == "200":
-            try:
-                obj = json.loads(result["msg"])
-                if obj.get("error"):
-                    QMessageBox.warning(self, "错误", obj.get("errmsg", "查询失败"))
-                    return
-                
-                # 加载数据（在后台线程执行）
-                data_list = DataUtil.loadJsonData(tab_data, obj, None, None, False)
-                
-                # 分批更新表格，避免UI冻结
-                self.updateTableAsync(table, data_list)
-                
-                # 更新状态
-                tab_data.total = obj.get("size", 0)
-                if obj.get("next"):
-                    tab_data.next = obj["next"]
-                if tab_data.total < int(self.config.size):
-                    tab_data.hasMoreData = False
-                
-                # 更新状态栏
-                self.statusBar.showMessage(f"查询成功: {tab_data.total} 条结果")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"解析数据失败: {str(e)}")
-        else:
-            QMessageBox.warning(self, "错误", result.get("msg", "查询失败"))
+        if page.error:
+            if page.page == 1:
+                self.onQueryError(page.error, tab)
+                QMessageBox.warning(self, "错误", page.error)
+            else:
+                self.statusBar.showMessage(
+                    f"第{page.page}页加载失败: {page.error}，已加载 {tab_data.count} 条"
+                )
+            return
+        
+        try:
+            obj = page.obj
+            
+            # 数据已在查询线程中写入，这里只显示新增行，去重时被原地替换的旧行一并刷新
+            model.appendRows()
+            model.refresh()
+            if not tab_data.rows:
+                model.setMessage("无查询结果")
+            
+            # 更新状态
+            tab_data.total = page.total or obj.get("size", 0)
+            tab_data.page = page.page
+            tab_data.next = page.next
+            tab_data.hasMoreData = page.hasMore
+            
+            # 更新状态栏
+            if page.hasMore:
+                self.statusBar.showMessage(
+                    f"正在翻页: 第{page.page}页，已加载 {tab_data.count}/{tab_data.total} 条"
+                )
+            else:
+                self.statusBar.showMessage(f"查询成功: {tab_data.total} 条结果，已加载 {tab_data.count} 条")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"解析数据失败: {str(e)}")
     
     def onQueryError(self, error: str, tab: QWidget):
         """查询错误回调（确保在主线程执行）"""
@@ -583,137 +813,12 @@ class MainWindow(QMainWindow):
             QTimer.singleShot(0, lambda: self.onQueryError(error, tab))
             return
         
-        table = tab.findChild(QTableWidget)
-        if table:
-            table.setRowCount(1)
-            table.setItem(0, 0, QTableWidgetItem(f"查询失败: {error}"))
+        table = tab.findChild(QTableView)
+        if table and table.model().isEmpty():
+            table.model().setMessage(f"查询失败: {error}")
         
         self.statusBar.showMessage(f"查询失败: {error}")
     
-    def updateTableAsync(self, table: QTableWidget, data_list: List[TableBean]):
-        """异步更新表格（分批更新避免UI冻结）"""
-        if not data_list:
-            table.setRowCount(0)
-            return
-        
-        # 禁用排序以提高性能
-        table.setSortingEnabled(False)
-        
-        # 设置行数
-        table.setRowCount(len(data_list))
-        
-        # 分批更新，每批50行
-        batch_size = 50
-        current_row = [0]  # 使用列表以在闭包中修改
-        
-        def updateBatch():
-            """更新一批数据"""
-            start = current_row[0]
-            end = min(start + batch_size, len(data_list))
-            
-            for row in range(start, end):
-                data = data_list[row]
-                if row >= table.rowCount():
-                    table.insertRow(row)
-                
-                # 序号列：确保使用正确的字体和编码，避免乱码
-                num_str = str(data.num) if data.num else "0"
-                num_item = QTableWidgetItem(num_str)
-                # 使用支持中文的字体，确保数字正确显示
-                num_font = table.font()
-                num_font.setFamily("Microsoft YaHei UI, Microsoft YaHei, SimHei, Arial, sans-serif")
-                num_font.setPixelSize(13)
-                num_font.setStyleHint(num_font.StyleHint.SansSerif)
-                num_font.setHintingPreference(num_font.HintingPreference.PreferDefaultHinting)
-                num_item.setFont(num_font)
-                num_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-                table.setItem(row, 0, num_item)
-                
-                # 确保所有文本使用正确字体，避免中文乱码
-                # 获取表格字体（已设置为支持中文的字体）
-                cell_font = table.font()
-                
-                host_item = QTableWidgetItem(data.host if data.host else "")
-                host_item.setFont(cell_font)
-                table.setItem(row, 1, host_item)
-                
-                title_item = QTableWidgetItem(data.title if data.title else "")
-                title_item.setFont(cell_font)
-                table.setItem(row, 2, title_item)
-                
-                ip_item = QTableWidgetItem(data.ip if data.ip else "")
-                ip_item.setFont(cell_font)
-                table.setItem(row, 3, ip_item)
-                
-                port_str = str(data.port) if data.port else ""
-                port_item = QTableWidgetItem(port_str)
-                port_item.setFont(cell_font)
-                table.setItem(row, 4, port_item)
-                
-                domain_item = QTableWidgetItem(data.domain if data.domain else "")
-                domain_item.setFont(cell_font)
-                table.setItem(row, 5, domain_item)
-                
-                protocol_item = QTableWidgetItem(data.protocol if data.protocol else "")
-                protocol_item.setFont(cell_font)
-                table.setItem(row, 6, protocol_item)
-                
-                server_item = QTableWidgetItem(data.server if data.server else "")
-                server_item.setFont(cell_font)
-                table.setItem(row, 7, server_item)
-                
-                # 确保所有额外字段也使用正确字体
-                cell_font = table.font()
-                
-                col = 8
-                if "fid" in self.config.additionalField:
-                    fid_item = QTableWidgetItem(data.fid if data.fid else "")
-                    fid_item.setFont(cell_font)
-                    table.setItem(row, col, fid_item)
-                    col += 1
-                if "os" in self.config.additionalField:
-                    os_item = QTableWidgetItem(data.os if data.os else "")
-                    os_item.setFont(cell_font)
-                    table.setItem(row, col, os_item)
-                    col += 1
-                if "icp" in self.config.additionalField:
-                    icp_item = QTableWidgetItem(data.icp if data.icp else "")
-                    icp_item.setFont(cell_font)
-                    table.setItem(row, col, icp_item)
-                    col += 1
-                if "product" in self.config.additionalField:
-                    product_item = QTableWidgetItem(data.product if data.product else "")
-                    product_item.setFont(cell_font)
-                    table.setItem(row, col, product_item)
-                    col += 1
-                if "certs_subject_cn" in self.config.additionalField:
-                    cert_cn_item = QTableWidgetItem(data.certCN if data.certCN else "")
-                    cert_cn_item.setFont(cell_font)
-                    table.setItem(row, col, cert_cn_item)
-                    col += 1
-                if "certs_subject_org" in self.config.additionalField:
-                    cert_org_item = QTableWidgetItem(data.certOrg if data.certOrg else "")
-                    cert_org_item.setFont(cell_font)
-                    table.setItem(row, col, cert_org_item)
-                    col += 1
-                if "lastupdatetime" in self.config.additionalField:
-                    lastupdate_item = QTableWidgetItem(data.lastupdatetime if data.lastupdatetime else "")
-                    lastupdate_item.setFont(cell_font)
-                    table.setItem(row, col, lastupdate_item)
-                    col += 1
-            
-            current_row[0] = end
-            
-            # 如果还有数据，继续更新下一批
-            if end < len(data_list):
-                QTimer.singleShot(10, updateBatch)  # 10ms后更新下一批
-            else:
-                # 所有数据更新完成，重新启用排序
-                table.setSortingEnabled(True)
-        
-        # 开始更新
-        updateBatch()
-    
     def isTabExists(self, title: str) -> bool:
         """检查Tab是否存在"""
         for i in range(self.tab_widget.count()):
@@ -732,24 +837,21 @@ class MainWindow(QMainWindow):
         """关闭Tab"""
         if index > 0:  # 保留首页
             title = self.tab_widget.tabText(index)
+            # 停止该Tab的翻页和批量任务
+            self.query_tasks.pop(title, None)
+            self.scheduler.cancelOwner(title)
             self.tab_widget.removeTab(index)
             if title in self.tab_data:
                 del self.tab_data[title]
     
-    def openUrlFromTable(self, table: QTableWidget, row: int):
+    def openUrlFromTable(self, table: QTableView, row: int):
         """从表格行打开URL（双击事件）"""
-        if row < 0 or row >= table.rowCount():
-            return
-        
-        # 获取host和protocol
-        host_item = table.item(row, 1)
-        protocol_item = table.item(row, 6)
-        
-        if not host_item:
+        data = table.model().rowAt(row)
+        if not data or not data.host:
             return
         
-        host = host_item.text()
-        protocol = protocol_item.text() if protocol_item else ""
+        host = data.host
+        protocol = data.protocol
         
         # 构建URL
         if not host.startswith("http"):
@@ -812,36 +914,28 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "Favicon URL不能为空")
             return
         
-        # 在后台线程执行网络请求
-        class FaviconQueryThread(QThread):
-            finished = Signal(dict)
-            error_signal = Signal(str)
-            
-            def __init__(self, url, request_util):
-                super().__init__()
-                self.url = url
-                self.request_util = request_util
-            
-            def run(self):
-                try:
-                    # 获取favicon链接
-                    link = self.request_util.getLinkIcon(self.url)
-                    if link:
-                        res = self.request_util.getImageFavicon(link)
-                    else:
-                        res = self.request_util.getImageFavicon(self.url + "/favicon.ico")
-                    
-                    if res:
-                        self.finished.emit(res)
-                    else:
-                        self.error_signal.emit("无法获取Favicon")
-                except Exception as e:
-                    self.error_signal.emit(str(e))
-        
-        thread = FaviconQueryThread(url, self.request_util)
-        thread.finished.connect(lambda res: self.onFaviconQueryFinished(res))
-        thread.error_signal.connect(lambda err: QMessageBox.warning(self, "错误", f"查询Favicon失败: {err}"))
-        thread.start()
+        # 在后台任务中执行网络请求
+        def fetch():
+            try:
+                # 获取favicon链接
+                link = self.request_util.getLinkIcon(url)
+                if link:
+                    res = self.request_util.getImageFavicon(link)
+                else:
+                    res = self.request_util.getImageFavicon(url + "/favicon.ico")
+                return res or {"code": "error", "msg": "无法获取Favicon"}
+            except Exception as e:
+                return {"code": "error", "msg": str(e)}
+        
+        def on_done(res):
+            if res.get("code") == "error":
+                QMessageBox.warning(self, "错误", f"查询Favicon失败: {res.get('msg')}")
+            else:
+                self.onFaviconQueryFinished(res)
+        
+        task = CallTask("查询Favicon", fetch)
+        task.done.connect(on_done)
+        self.scheduler.submit(task)
     
     def onFaviconQueryFinished(self, res: Dict):
         """Favicon查询完成回调"""
@@ -891,93 +985,237 @@ class MainWindow(QMainWindow):
         tab_title = self.tab_widget.tabText(current_index)
         tab_data = self.tab_data.get(tab_title)
         
-        if not tab_data:
+        if not tab_data or not tab_data.rows:
             QMessageBox.warning(self, "警告", "无数据可导出")
             return
         
-        # 获取表格数据
-        tab = self.tab_widget.widget(current_index)
-        table = tab.findChild(QTableWidget)
-        if not table:
-            QMessageBox.warning(self, "警告", "无法获取表格数据")
+        # 生成文件名
+        suffix = "xlsx" if export_format == "excel" else "txt"
+        safe_filename = SecurityUtil.sanitize_filename(f"fofa导出结果_{int(time.time())}.{suffix}")
+        file_path = safe_path_obj / safe_filename
+        
+        # 按表格当前的显示顺序导出行句柄快照，后台线程逐行写入
+        table = self.tab_widget.widget(current_index).findChild(QTableView)
+        if table:
+            table.model().fetchAll()
+        rows = table.model().rows() if table else list(tab_data.rows)
+        self.startExport(export_format, str(file_path), tab_title, rows,
+                         tab_data.fields + tab_data.columns)
+    
+    def pullExportAction(self):
+        """全量导出：沿游标拉取全部结果并流式写入文件"""
+        from utils.security import SecurityUtil
+        
+        query_text = SecurityUtil.sanitize_query(self.query_input.text().strip())
+        if not query_text:
+            QMessageBox.warning(self, "警告", "请输入查询条件")
             return
         
-        # 准备导出数据
-        total_data = []
-        urls = []
+        # 选择导出格式
+        format_dialog = QMessageBox(self)
+        format_dialog.setWindowTitle("选择导出格式")
+        format_dialog.setText("全量导出不会显示到表格，请选择导出格式：")
+        format_buttons = {
+            format_dialog.addButton("Excel", QMessageBox.ButtonRole.AcceptRole): "excel",
+            format_dialog.addButton("CSV", QMessageBox.ButtonRole.AcceptRole): "csv",
+            format_dialog.addButton("TXT", QMessageBox.ButtonRole.AcceptRole): "txt",
+        }
+        format_dialog.addButton("取消", QMessageBox.ButtonRole.RejectRole)
+        format_dialog.exec()
         
-        for row in range(table.rowCount()):
-            if table.item(row, 1) is None:
-                continue
-            
-            excel_bean = ExcelBean()
-            excel_bean.host = table.item(row, 1).text()
-            excel_bean.title = table.item(row, 2).text() if table.item(row, 2) else ""
-            excel_bean.ip = table.item(row, 3).text()
-            excel_bean.port = int(table.item(row, 4).text()) if table.item(row, 4) else 0
-            excel_bean.domain = table.item(row, 5).text() if table.item(row, 5) else ""
-            excel_bean.protocol = table.item(row, 6).text() if table.item(row, 6) else ""
-            excel_bean.server = table.item(row, 7).text() if table.item(row, 7) else ""
-            
-            total_data.append(excel_bean)
-            
-            # 准备URL（用于TXT导出）
-            host = excel_bean.host
-            protocol = excel_bean.protocol.lower()
-            if not host.startswith("http"):
-                if protocol == "https" or excel_bean.port == 443:
-                    url = f"https://{host}"
-                else:
-                    url = f"http://{host}"
+        export_format = format_buttons.get(format_dialog.clickedButton())
+        if not export_format:
+            return
+        
+        # 选择保存目录
+        dir_path = QFileDialog.getExistingDirectory(self, "选择导出目录")
+        if not dir_path:
+            return
+        safe_path_obj = SecurityUtil.safe_path(dir_path)
+        if not safe_path_obj:
+            QMessageBox.warning(self, "警告", "无效的导出路径")
+            return
+        
+        _, query_text = self.buildQueryText(query_text)
+        additional_fields = self.getAdditionalFields()
+        url = self.buildQueryUrl(query_text, additional_fields)
+        
+        suffix = STREAM_WRITERS[export_format][1]
+        safe_filename = SecurityUtil.sanitize_filename(f"fofa导出结果_{int(time.time())}.{suffix}")
+        file_path = safe_path_obj / safe_filename
+        
+        job = PullExportJob(url, export_format, str(file_path), additional_fields, self.config.fetchLimit)
+        task = PullExportTask(job)
+        
+        dialog = QProgressDialog("正在拉取第一页...", "取消", 0, 0, self)
+        dialog.setWindowTitle("全量导出")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(lambda: self.scheduler.cancel(task))
+        
+        def on_progress(count, total):
+            if self.config.fetchLimit:
+                total = min(total, self.config.fetchLimit)
+            dialog.setMaximum(max(total, count, 1))
+            dialog.setValue(count)
+            dialog.setLabelText(f"正在拉取并导出... {count}/{total}")
+        
+        def on_done(success, message):
+            dialog.reset()
+            if success:
+                QMessageBox.information(self, "成功", message)
             else:
-                url = host
-            urls.append(url)
+                QMessageBox.warning(self, "失败", message)
         
-        # 生成文件名
-        import time
-        if export_format == "excel":
-            safe_filename = SecurityUtil.sanitize_filename(f"fofa导出结果_{int(time.time())}.xlsx")
-            file_path = safe_path_obj / safe_filename
-            
-            # 导出Excel
-            success, message = DataUtil.exportToExcel(
-                str(file_path),
-                tab_title,
-                total_data,
-                [[url] for url in urls],
-                ""
-            )
-        else:
-            # 导出TXT
-            safe_filename = SecurityUtil.sanitize_filename(f"fofa导出结果_{int(time.time())}.txt")
-            file_path = safe_path_obj / safe_filename
-            
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for url in urls:
-                        f.write(url + '\n')
-                success = True
-                message = f"导出成功！文件保存在 {file_path}"
-            except Exception as e:
-                success = False
-                message = f"导出失败：{str(e)}"
+        task.progress.connect(on_progress)
+        task.done.connect(on_done)
+        # 在队列中被取消时不会发出done
+        task.finished.connect(dialog.reset)
+        self.scheduler.submit(task)
+    
+    def startExport(self, exportFormat: str, fileName: str, tabTitle: str, rows: List[ResultRow],
+                    additionalField: Optional[List[str]] = None, errorPage: str = ""):
+        """在后台任务中导出，显示进度并支持取消"""
+        task = ExportTask(exportFormat, fileName, tabTitle, rows, additionalField, errorPage)
+        total = len(rows)
+        
+        dialog = QProgressDialog("正在导出...", "取消", 0, max(total, 1), self)
+        dialog.setWindowTitle("导出")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(lambda: self.scheduler.cancel(task))
+        
+        def on_progress(count):
+            dialog.setValue(min(count, dialog.maximum()))
+            dialog.setLabelText(f"正在导出... {count}/{total}")
+        
+        def on_done(success, message):
+            dialog.reset()
+            if success:
+                QMessageBox.information(self, "成功", message)
+            else:
+                QMessageBox.warning(self, "失败", message)
         
-        if success:
-            QMessageBox.information(self, "成功", message)
-        else:
-            QMessageBox.warning(self, "失败", message)
+        task.progress.connect(on_progress)
+        task.done.connect(on_done)
+        # 在队列中被取消时不会发出done
+        task.finished.connect(dialog.reset)
+        self.scheduler.submit(task)
     
     def openProject(self):
-        """打开项目"""
-        file_path, _ = QFileDialog.getOpenFileName(self, "打开项目", "", "文本文件 (*.txt)")
-        if file_path:
-            # TODO: 实现打开项目
-            pass
+        """打开项目（先恢复全部Tab，数据行在表格滚动时按需加载）"""
+        import sqlite3
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "打开项目", self.project_path, f"FOFA项目 (*{PROJECT_SUFFIX})"
+        )
+        if not file_path:
+            return
+        
+        try:
+            tabs = ProjectUtil.open(file_path)
+        except (ValueError, sqlite3.Error) as e:
+            QMessageBox.warning(self, "错误", f"打开项目失败: {e}")
+            return
+        
+        row_count = 0
+        for project_tab in tabs:
+            # 同名Tab以项目中的数据为准
+            index = self.getTabIndex(project_tab.title)
+            if index > 0:
+                self.closeTab(index)
+            tab = self.createResultTab(project_tab.title, project_tab.bean)
+            self.tab_data[project_tab.title] = project_tab.bean
+            # 创建表格时的默认排序不应触发加载，最后再设置加载器
+            tab.findChild(QTableView).model().setLoader(project_tab.loader)
+            row_count += project_tab.loader.rowCount
+        
+        self.project_path = file_path
+        self.statusBar.showMessage(f"已打开项目: {len(tabs)} 个Tab，共 {row_count} 条数据")
     
     def saveProject(self):
-        """保存项目"""
-        # TODO: 实现保存项目
-        pass
+        """保存项目（全部查询Tab的查询语句、字段、游标和数据行）"""
+        indexes = [i for i in range(1, self.tab_widget.count()) if self.tab_widget.tabText(i) in self.tab_data]
+        if not indexes:
+            QMessageBox.warning(self, "警告", "没有可保存的查询结果")
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存项目", self.project_path, f"FOFA项目 (*{PROJECT_SUFFIX})"
+        )
+        if not file_path:
+            return
+        if not file_path.endswith(PROJECT_SUFFIX):
+            file_path += PROJECT_SUFFIX
+        
+        tabs = []
+        for i in indexes:
+            # 从项目打开、尚未加载完的Tab需要先加载全部数据行
+            table = self.tab_widget.widget(i).findChild(QTableView)
+            if table:
+                table.model().fetchAll()
+            title = self.tab_widget.tabText(i)
+            tabs.append((title, self.tab_data[title]))
+        
+        def on_done(error):
+            if error:
+                QMessageBox.warning(self, "错误", f"保存项目失败: {error}")
+                return
+            self.project_path = file_path
+            self.statusBar.showMessage(f"项目已保存: {file_path}")
+        
+        self.statusBar.showMessage("正在保存项目...")
+        task = CallTask("保存项目", ProjectUtil.save, file_path, tabs)
+        task.done.connect(on_done)
+        self.scheduler.submit(task)
+    
+    def searchWarehouse(self):
+        """检索本地结果库（历史查询拉取过的结果），结果显示在新Tab中，不消耗查询额度"""
+        import sqlite3
+        from PySide6.QtWidgets import QInputDialog
+        
+        expression, ok = QInputDialog.getText(
+            self, "搜索本地结果库",
+            "检索条件（字段: " + ", ".join(ResultWarehouse.SEARCH_FIELDS) + "）\n"
+            '例如: product="nginx" && icp="京ICP备xxx号"'
+        )
+        expression = expression.strip()
+        if not ok or not expression:
+            return
+        
+        tab_title = f"[本地]{expression}"
+        if self.isTabExists(tab_title):
+            self.tab_widget.setCurrentIndex(self.getTabIndex(tab_title))
+            return
+        
+        warehouse = ResultWarehouse.getInstance()
+        
+        def search():
+            # 先写入已入队的结果，刚拉取的数据也能检索到
+            warehouse.flush(5)
+            try:
+                records = warehouse.search(expression)
+            except (ValueError, sqlite3.Error) as e:
+                return str(e)
+            tab_data = TabDataBean(fields=list(ResultWarehouse.ADDITIONAL_FIELDS), hasMoreData=False)
+            DataUtil.loadRecords(tab_data, records, None, None, False)
+            tab_data.total = tab_data.count
+            return tab_data
+        
+        def on_done(result):
+            if isinstance(result, str):
+                QMessageBox.warning(self, "错误", f"检索失败: {result}")
+                return
+            if self.isTabExists(tab_title):
+                return
+            self.createResultTab(tab_title, result)
+            self.tab_data[tab_title] = result
+            self.statusBar.showMessage(f"本地结果库: {result.count} 条结果")
+        
+        self.statusBar.showMessage("正在检索本地结果库...")
+        task = CallTask("搜索本地结果库", search)
+        task.done.connect(on_done)
+        self.scheduler.submit(task)
     
     def setConfig(self):
         """设置配置"""
@@ -987,6 +1225,16 @@ class MainWindow(QMainWindow):
             # 重新加载配置
             DataUtil.loadConfigure()
     
+    def showTasks(self):
+        """显示任务队列（非模态）"""
+        dialog = TaskDialog(self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+    
+    def onTaskFailed(self, task: Task, error: str):
+        """后台任务执行失败（详情见任务队列）"""
+        self.statusBar.showMessage(f"任务执行失败 [{task.title}]: {error}")
+    
     def getQueryAPI(self):
         """获取当前查询语句"""
         from PySide6.QtGui import QClipboard
@@ -1016,10 +1264,153 @@ class MainWindow(QMainWindow):
             return
         
         tab = self.tab_widget.widget(current_index)
-        table = tab.findChild(QTableWidget)
+        table = tab.findChild(QTableView)
         if table:
             table.selectAll()
     
+    def getSelectedRows(self, table: QTableView) -> List[ResultRow]:
+        """获取表格选中的数据行，未选中时返回全部数据行"""
+        model = table.model()
+        selected = table.selectionModel().selectedRows() if table.selectionModel() else []
+        if not selected:
+            model.fetchAll()
+            return model.rows()
+        return [model.rowAt(index.row()) for index in selected if model.rowAt(index.row())]
+    
+    def startEnrichJob(self, jobClass, title: str, columns: List[str], onFinished):
+        """
+        对当前Tab的选中行（未选中时为全部行）执行批量补充数据任务
+        
+        Args:
+            jobClass: BatchJob子类
+            title: 进度窗口标题
+            columns: 需要显示的额外字段列
+            onFinished: 完成回调，参数为(job, 结果, Tab数据, 表格)
+        """
+        current_index = self.tab_widget.currentIndex()
+        if current_index == 0:  # 首页
+            return
+        
+        tab_title = self.tab_widget.tabText(current_index)
+        tab_data = self.tab_data.get(tab_title)
+        table = self.tab_widget.widget(current_index).findChild(QTableView)
+        if not tab_data or not table or not tab_data.rows:
+            QMessageBox.warning(self, "警告", "无数据")
+            return
+        
+        job: BatchJob = jobClass(self.getSelectedRows(table), self.config.enrichConcurrency)
+        if not job.targets:
+            QMessageBox.warning(self, "警告", "选中的数据中没有可处理的目标")
+            return
+        task = EnrichTask(job, title, tab_title)
+        
+        dialog = QProgressDialog(f"{title}...", "取消", 0, len(job.targets), self)
+        dialog.setWindowTitle(title)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(lambda: self.scheduler.cancel(task))
+        
+        def show_columns():
+            model = table.model()
+            for column in columns:
+                if column not in tab_data.fields and column not in tab_data.columns:
+                    tab_data.columns.append(column)
+                    model.addColumn(column)
+        
+        # 结果逐个写入数据行的任务先显示列，进度更新时刷新表格
+        if job.streaming:
+            show_columns()
+        
+        def on_progress(count, total):
+            dialog.setValue(min(count, dialog.maximum()))
+            dialog.setLabelText(f"{title}... {count}/{total}")
+            if not job.streaming or count % self.STREAM_REFRESH_STEP:
+                return
+            if self.tab_data.get(tab_title) is tab_data:
+                table.model().refresh()
+        
+        def on_done(results):
+            dialog.reset()
+            # Tab已关闭则丢弃
+            if self.tab_data.get(tab_title) is not tab_data:
+                return
+            
+            # 写入数据行并显示对应的列
+            job.apply(results)
+            show_columns()
+            table.model().refresh()
+            onFinished(job, results, tab_data, table)
+        
+        task.progress.connect(on_progress)
+        task.done.connect(on_done)
+        # 在队列中被取消时不会发出done
+        task.finished.connect(dialog.reset)
+        self.scheduler.submit(task)
+    
+    def showGroups(self, table: QTableView, tab_data: TabDataBean, attr: str, title: str, header: str,
+                   queryFormat: str):
+        """按字段分组排序表格，并显示分组窗口（双击分组发起查询）"""
+        table.model().sortByGroup(attr)
+        
+        groups = DataUtil.groupCount(tab_data.rows, attr)
+        if not groups:
+            return
+        dialog = GroupDialog(title, header, groups, queryFormat, self)
+        dialog.querySelected.connect(lambda query: self.query([query]))
+        dialog.exec()
+    
+    def faviconHashAction(self):
+        """批量计算favicon hash，写入icon_hash列并按hash分组"""
+        def on_finished(job, results, tab_data, table):
+            self.statusBar.showMessage(f"favicon hash: {len(results)}/{len(job.targets)} 个网站获取成功")
+            if not results:
+                QMessageBox.warning(self, "错误", "无法获取favicon")
+                return
+            self.showGroups(table, tab_data, "iconHash", "Favicon Hash分组", "icon_hash", 'icon_hash="{}"')
+        
+        self.startEnrichJob(FaviconHashJob, "正在获取favicon", ["icon_hash"], on_finished)
+    
+    def certHarvestAction(self):
+        """批量获取TLS证书，填充证书列并按序列号分组"""
+        def on_finished(job, results, tab_data, table):
+            self.statusBar.showMessage(f"证书: {len(results)}/{len(job.targets)} 个服务获取成功")
+            if not results:
+                QMessageBox.warning(self, "错误", "无法获取证书")
+                return
+            self.showGroups(table, tab_data, "certSerial", "证书分组", "证书序列号", 'cert="{}"')
+        
+        self.startEnrichJob(
+            CertHarvestJob, "正在获取证书",
+            ["certs_subject_cn", "certs_subject_org", "cert_serial", "cert_sans"],
+            on_finished
+        )
+    
+    def statusCheckAction(self):
+        """批量检测http(s)资产存活，状态码和响应时间逐个写入表格"""
+        def on_finished(job, results, tab_data, table):
+            dead = sum(1 for status, _ in results.values() if StatusCheckJob.isDead(status))
+            self.statusBar.showMessage(
+                f"存活检测: {len(results) - dead}/{len(job.targets)} 个网站有响应，{dead} 个无响应"
+            )
+            if self.check_hide_dead.isChecked():
+                table.model().setFilter(self.deadFilter(tab_data))
+        
+        self.startEnrichJob(StatusCheckJob, "正在检测存活", ["status", "response_time"], on_finished)
+    
+    @staticmethod
+    def deadFilter(tab_data: TabDataBean):
+        """存活检测无响应的行不显示（未检测的行保留）"""
+        status = tab_data.rows.columns["status"]
+        return lambda index: not StatusCheckJob.isDead(status.get(index))
+    
+    def applyDeadFilter(self, hide: bool):
+        """对全部Tab设置或取消无响应资产的过滤"""
+        for i in range(1, self.tab_widget.count()):
+            tab_data = self.tab_data.get(self.tab_widget.tabText(i))
+            table = self.tab_widget.widget(i).findChild(QTableView)
+            if tab_data and table:
+                table.model().setFilter(self.deadFilter(tab_data) if hide else None)
+    
     def copyToClipboard(self, text: str):
         """复制到剪贴板"""
         clipboard = QApplication.clipboard()
@@ -1046,26 +1437,16 @@ class MainWindow(QMainWindow):
         elif ":80" in url:
             url = url.replace(":80", "")
         
-        # 在后台线程执行网络请求
-        class FaviconThread(QThread):
-            finished = Signal(dict)
-            
-            def __init__(self, url, request_util):
-                super().__init__()
-                self.url = url
-                self.request_util = request_util
-            
-            def run(self):
-                link = self.request_util.getLinkIcon(self.url)
-                if link:
-                    res = self.request_util.getImageFavicon(link)
-                else:
-                    res = self.request_util.getImageFavicon(self.url + "/favicon.ico")
-                self.finished.emit(res)
+        # 在后台任务中执行网络请求
+        def fetch():
+            link = self.request_util.getLinkIcon(url)
+            if link:
+                return self.request_util.getImageFavicon(link)
+            return self.request_util.getImageFavicon(url + "/favicon.ico")
         
-        thread = FaviconThread(url, self.request_util)
-        thread.finished.connect(lambda res: self.onFaviconQueryFinished(res))
-        thread.start()
+        task = CallTask("查询Favicon", fetch)
+        task.done.connect(self.onFaviconQueryFinished)
+        self.scheduler.submit(task)
     
     def onFaviconQueryFinished(self, res: Dict):
         """Favicon查询完成回调"""
@@ -1075,7 +1456,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "无法获取favicon")
     
     def queryCertFromHost(self, host: str):
-        """从host查询证书序列号（在后台线程执行）"""
+        """从host查询证书序列号（在后台任务中执行）"""
         if not host:
             return
         
@@ -1086,22 +1467,10 @@ class MainWindow(QMainWindow):
         elif ":80" in clean_host:
             clean_host = clean_host.replace(":80", "")
         
-        # 在后台线程执行网络请求
-        class CertThread(QThread):
-            finished = Signal(str)
-            
-            def __init__(self, host, request_util):
-                super().__init__()
-                self.host = host
-                self.request_util = request_util
-            
-            def run(self):
-                cert_query = self.request_util.getCertSerialNum(self.host)
-                self.finished.emit(cert_query if cert_query else "")
-        
-        thread = CertThread(clean_host, self.request_util)
-        thread.finished.connect(lambda cert: self.onCertQueryFinished(cert))
-        thread.start()
+        # 在后台任务中执行网络请求
+        task = CallTask("查询证书", self.request_util.getCertSerialNum, clean_host)
+        task.done.connect(lambda cert: self.onCertQueryFinished(cert or ""))
+        self.scheduler.submit(task)
     
     def onCertQueryFinished(self, cert_query: str):
         """证书查询完成回调"""
@@ -1116,65 +1485,16 @@ class MainWindow(QMainWindow):
         self.applyTheme()
     
     def applyTheme(self):
-        """应用主题"""
-        # 应用主题管理器
+        """应用主题（预编译的样式表和调色板设置在主窗口上一次生效，已打开和新建的Tab、对话框都会继承）"""
         self.theme_manager.applyTheme(self)
-        
-        # 应用样式表（会根据主题更新）
-        self.setStyleSheet(UIStyle.getMainStyleSheet())
-        
-        # 更新所有子组件
-        for widget in self.findChildren(QWidget):
-            if isinstance(widget, ModernButton):
-                if hasattr(widget, 'updateStyle'):
-                    widget.updateStyle()
-        
-        # 更新所有表格样式
-        for table in self.findChildren(QTableWidget):
-            colors = self.theme_manager.getColors()
-            table.setStyleSheet(f"""
-                QTableWidget {{
-                    background-color: {UIStyle.BG_SECONDARY};
-                    border: 2px solid {UIStyle.BG_DIVIDER};
-                    border-radius: {UIStyle.RADIUS_LARGE}px;
-                    gridline-color: {UIStyle.BG_DIVIDER};
-                    selection-background-color: {UIStyle.BTN_GRADIENT_START};
-                    selection-color: {UIStyle.TEXT_PRIMARY};
-                }}
-                QTableWidget::item {{
-                    padding: 10px;
-                    border: none;
-                    background-color: {UIStyle.BG_SECONDARY};
-                    color: {UIStyle.TEXT_PRIMARY};
-                }}
-                QTableWidget::item:selected {{
-                    background-color: {UIStyle.BTN_GRADIENT_START};
-                    color: {UIStyle.TEXT_PRIMARY};
-                }}
-                QHeaderView::section {{
-                    background-color: {UIStyle.BG_CARD};
-                    color: {UIStyle.TEXT_PRIMARY};
-                    padding: 12px;
-                    border: none;
-                    border-bottom: 2px solid {UIStyle.BG_DIVIDER};
-                    font-weight: bold;
-                    font-size: 13px;
-                }}
-            """)
-        
-        self.update()
     
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 等待所有线程完成
-        if self.threads:
-            for thread in self.threads[:]:  # 复制列表避免迭代时修改
-                if thread.isRunning():
-                    thread.quit()
-                    thread.wait(3000)  # 等待最多3秒
-                    if thread.isRunning():
-                        thread.terminate()
-                        thread.wait(1000)
+        # 取消全部后台任务，等待工作线程退出（最多3秒）
+        self.scheduler.shutdown(3000)
+        AsyncRequestUtil.shutdown()
+        # 等待已拉取的结果写入本地结果库
+        ResultWarehouse.getInstance().flush(3)
         
         # 调用父类关闭事件
         super().closeEvent(event)
@@ -0,0 +1,124 @@
+"""
+任务队列对话框
+"""
+import time
+from typing import List
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QHeaderView, QDialogButtonBox
+)
+from PySide6.QtCore import Qt, QTimer, QItemSelectionModel
+
+from utils.task_scheduler import Task, TaskPriority, TaskScheduler
+
+
+class TaskDialog(QDialog):
+    """任务队列对话框（显示后台任务的状态，可取消等待中或运行中的任务）"""
+    
+    # 优先级显示名称
+    PRIORITY_NAMES = {
+        TaskPriority.QUERY: "查询",
+        TaskPriority.ENRICH: "补充数据",
+        TaskPriority.EXPORT: "导出",
+    }
+    
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.scheduler = TaskScheduler.getInstance()
+        self._tasks: List[Task] = []
+        
+        self.setWindowTitle("任务队列")
+        self.setMinimumSize(640, 360)
+        
+        layout = QVBoxLayout(self)
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+        
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["任务", "类型", "所属Tab", "状态", "耗时"])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        cancel_btn = button_box.addButton("取消任务", QDialogButtonBox.ButtonRole.ActionRole)
+        cancel_btn.clicked.connect(self.cancelSelected)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.scheduler.changed.connect(self.refresh)
+        # 定时刷新耗时
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+    
+    @staticmethod
+    def elapsed(task: Task) -> str:
+        """任务耗时（等待中的任务为空）"""
+        if task.started is None:
+            return ""
+        return f"{(task.ended or time.time()) - task.started:.1f}s"
+    
+    def refresh(self):
+        """刷新任务列表（保留选中的任务）"""
+        selected = set(id(task) for task in self.selectedTasks())
+        # 未结束的任务在前，同类按提交时间排序
+        self._tasks = sorted(
+            self.scheduler.tasks(),
+            key=lambda task: (not task.isRunning(), -task.priority, task.created)
+        )
+        
+        self.table.clearSelection()
+        self.table.setRowCount(len(self._tasks))
+        for row, task in enumerate(self._tasks):
+            values = [
+                task.title,
+                self.PRIORITY_NAMES.get(task.priority, str(task.priority)),
+                task.owner or "",
+                f"{task.state}: {task.error}" if task.error else task.state,
+                self.elapsed(task),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if task.error:
+                    item.setToolTip(f"任务执行失败: {task.error}")
+                self.table.setItem(row, column, item)
+            if id(task) in selected:
+                self.table.selectionModel().select(
+                    self.table.model().index(row, 0),
+                    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+                )
+        
+        self.summary.setText(
+            f"运行和等待中 {self.scheduler.activeCount()} 个任务，"
+            f"最多同时运行 {self.scheduler.pool.maxThreadCount()} 个长任务和 "
+            f"{self.scheduler.shortPool.maxThreadCount()} 个短任务"
+        )
+    
+    def selectedTasks(self) -> List[Task]:
+        """选中的任务"""
+        rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
+        return [self._tasks[row] for row in rows if row < len(self._tasks)]
+    
+    def cancelSelected(self):
+        """取消选中的任务"""
+        for task in self.selectedTasks():
+            if task.isRunning():
+                self.scheduler.cancel(task)
+    
+    def done(self, result: int):
+        """关闭时断开调度器信号"""
+        self.timer.stop()
+        self.scheduler.changed.disconnect(self.refresh)
+        super().done(result)
@@ -3,6 +3,7 @@ FOFA Viewer主应用程序
 """
 import sys
 from pathlib import Path
+from typing import List
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
@@ -10,9 +11,17 @@ from PySide6.QtGui import QIcon
 from controllers.main_controller import MainWindow
 
 
-def main():
-    """主函数"""
-    app = QApplication(sys.argv)
+def createApplication(argv: List[str]) -> QApplication:
+    """
+    创建并配置应用程序（字体、应用信息）
+    
+    Args:
+        argv: 命令行参数
+    
+    Returns:
+        QApplication实例
+    """
+    app = QApplication(argv)
     app.setStyle('Fusion')  # 使用Fusion样式
     
     # 设置应用程序字体，确保UTF-8中文正确显示
@@ -31,6 +40,12 @@ def main():
     app.setApplicationName("FOFA Viewer")
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("WgpSec")
+    return app
+
+
+def main():
+    """主函数"""
+    app = createApplication(sys.argv)
     
     # 创建主窗口
     window = MainWindow()
@@ -0,0 +1,347 @@
+"""
+FOFA命令行查询（不依赖Qt，可在无界面的服务器上运行）
+
+用法:
+    python -m main.cli 'app="nginx"' > result.jsonl
+    python -m main.cli -f queries.txt --format csv --fields icp,product -c 4 -o result.csv
+    python -m main.cli --local 'product="nginx" && icp="京ICP备xxx号"'
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, List, Optional
+
+from main.config import FofaConfig
+from models.table_bean import ExcelBean, PageBean, TabDataBean
+from utils.data_util import DataUtil
+from utils.export_util import DedupeWindow
+from utils.page_util import PaginationEngine
+from utils.request_util import RequestUtil
+from utils.shard_util import ShardPlanner, ShardRunner
+from utils.warehouse_util import ResultWarehouse
+
+
+# 可选的额外字段（与界面的复选框一致）
+ADDITIONAL_FIELDS = [
+    "fid", "os", "icp", "product", "certs_subject_cn", "certs_subject_org", "lastupdatetime"
+]
+
+# 基础输出字段
+BASE_FIELDS = ["host", "title", "ip", "domain", "port", "protocol", "server"]
+
+
+class JsonlWriter:
+    """每行一个JSON对象"""
+    
+    def __init__(self, stream: IO[str], columns: List[str]):
+        self.stream = stream
+        self.columns = columns
+    
+    def writeRows(self, query: str, rows: List[ExcelBean]):
+        lines = []
+        for data in rows:
+            record = {"query": query}
+            record.update((name, getattr(data, name)) for name in self.columns)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+
+
+class CsvWriter:
+    """CSV（首行为字段名）"""
+    
+    def __init__(self, stream: IO[str], columns: List[str]):
+        self.columns = columns
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["query"] + columns)
+    
+    def writeRows(self, query: str, rows: List[ExcelBean]):
+        self.writer.writerows([query] + [getattr(data, name) for name in self.columns] for data in rows)
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+class QueryRunner:
+    """
+    并发执行多个查询，结果按页去重后写入同一个输出流
+    
+    每个查询沿next游标翻页（或按分片拉取），复用界面使用的翻页引擎、
+    限流器、密钥池和缓存；不同查询的结果以页为单位交错输出。
+    """
+    
+    def __init__(self, args: argparse.Namespace, output: IO[str]):
+        """
+        Args:
+            args: 命令行参数
+            output: 输出流
+        """
+        self.args = args
+        self.config = FofaConfig.getInstance()
+        self.fields = args.fields
+        self.output = output
+        self.writer = WRITERS[args.format](output, BASE_FIELDS + self.fields)
+        self.cancelEvent = threading.Event()
+        self.failed: List[str] = []
+        self._lock = threading.Lock()
+        self._cancellers = []
+    
+    def cancel(self):
+        """取消全部查询"""
+        self.cancelEvent.set()
+        with self._lock:
+            for cancel in self._cancellers:
+                cancel()
+    
+    def _register(self, cancel) -> bool:
+        """登记取消函数，已取消时立即调用并返回False"""
+        with self._lock:
+            self._cancellers.append(cancel)
+        if self.cancelEvent.is_set():
+            cancel()
+            return False
+        return True
+    
+    def log(self, message: str):
+        """输出进度信息（stderr）"""
+        if not self.args.quiet:
+            with self._lock:
+                print(message, file=sys.stderr, flush=True)
+    
+    def buildQuery(self, query: str) -> str:
+        """处理排除干扰选项（与界面一致）"""
+        if self.args.exclude_honeypot:
+            return f"({query}) && (is_honeypot=false && is_fraud=false)"
+        return query
+    
+    def write(self, query: str, window: DedupeWindow, page: PageBean) -> int:
+        """
+        去重并写出一页（经过去重窗口，之后的页仍可替换窗口中的行）
+        
+        Returns:
+            写出的行数
+        """
+        with self._lock:
+            rows, _ = window.push(page.records)
+            self._writeRows(query, window, rows)
+        return len(rows)
+    
+    def finish(self, query: str, window: DedupeWindow):
+        """写出去重窗口中剩余的行"""
+        with self._lock:
+            self._writeRows(query, window, window.drain())
+        if window.lateReplaced:
+            self.log(f"[{query}] {window.lateReplaced} 条重复数据与已写出的行相距过远，未能替换")
+    
+    def _writeRows(self, query: str, window: DedupeWindow, rows: List[ExcelBean]):
+        self.writer.writeRows(query, rows)
+        self.output.flush()
+        window.bean.count += len(rows)
+    
+    @staticmethod
+    def progress(window: DedupeWindow) -> str:
+        """进度（已去重的行数/结果总数）"""
+        return f"{window.bean.count + len(window)}/{window.bean.total}"
+    
+    def runQuery(self, query: str):
+        """执行单个查询（阻塞直到结束）"""
+        if self.cancelEvent.is_set():
+            return
+        query_text = self.buildQuery(query)
+        window = DedupeWindow(TabDataBean(fields=list(self.fields)))
+        try:
+            if self.args.local:
+                self._runLocal(query, window)
+            elif self.args.shard:
+                self._runSharded(query, query_text, window)
+            else:
+                self._runPaged(query, query_text, window)
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            self.fail(query, str(e))
+    
+    def _runLocal(self, query: str, window: DedupeWindow):
+        """检索本地结果库（不请求FOFA）"""
+        records = ResultWarehouse.getInstance().search(query, self.args.limit)
+        window.bean.total = len(records)
+        self.write(query, window, PageBean(records=records))
+        self.finish(query, window)
+        self.log(f"[{query}] 本地结果库: {window.bean.count} 条")
+    
+    def _runPaged(self, query: str, query_text: str, window: DedupeWindow):
+        """沿next游标翻页"""
+        url = self.config.getParam(self.args.all, None, self.fields) + RequestUtil.getInstance().encode(query_text)
+        engine = PaginationEngine(url, self.args.limit)
+        if not self._register(engine.cancel):
+            return
+        for page in engine.pages():
+            if page.error:
+                if page.page == 1:
+                    self.fail(query, page.error)
+                    return
+                # 翻页引擎在出错的页停止
+                self.log(f"[{query}] 第{page.page}页加载失败: {page.error}，该页起的数据未拉取")
+                break
+            window.bean.total = page.total
+            self.write(query, window, page)
+            self.log(f"[{query}] {self.progress(window)}")
+        self.finish(query, window)
+        self.log(f"[{query}] 完成: {window.bean.count} 条")
+    
+    def _runSharded(self, query: str, query_text: str, window: DedupeWindow):
+        """规划分片后并发拉取"""
+        planner = ShardPlanner(query_text, self.fields, self.args.all)
+        if not self._register(planner.cancel):
+            return
+        shards = planner.plan()
+        window.bean.total = planner.total
+        note = planner.describeTruncated(shards)
+        self.log(f"[{query}] 共 {planner.total} 条结果，拆分为 {len(shards)} 个分片"
+                 + (f"，{note}" if note else ""))
+        
+        runner = ShardRunner(planner, shards, self.args.limit)
+        if not self._register(runner.cancel):
+            return
+        
+        def on_page(shard, page):
+            if page.error:
+                self.log(f"[{query}] 分片拉取失败 {shard.query}: {page.error}")
+                return
+            self.write(query, window, page)
+            self.log(f"[{query}] {self.progress(window)}")
+        
+        runner.run(on_page)
+        self.finish(query, window)
+        self.log(f"[{query}] 完成: {window.bean.count} 条")
+    
+    def fail(self, query: str, error: str):
+        """记录失败的查询"""
+        with self._lock:
+            self.failed.append(query)
+        self.log(f"[{query}] 查询失败: {error}")
+    
+    def run(self, queries: List[str]):
+        """并发执行全部查询（中断或输出管道关闭时取消其余查询）"""
+        executor = ThreadPoolExecutor(max_workers=max(1, self.args.concurrency))
+        futures = [executor.submit(self.runQuery, query) for query in queries]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            self.cancel()
+            # 未开始的查询直接取消（shutdown的cancel_futures需要Python 3.9）
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+
+def readQueries(args: argparse.Namespace) -> List[str]:
+    """合并命令行和文件中的查询语句（文件每行一条，#开头为注释，-表示标准输入）"""
+    queries = list(args.queries)
+    for file_name in args.file or []:
+        if file_name == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(file_name, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        queries.extend(line for line in lines if line.strip() and not line.lstrip().startswith("#"))
+    # 去掉重复的查询，保持顺序
+    return list(dict.fromkeys(query.strip() for query in queries if query.strip()))
+
+
+def parseFields(value: str) -> List[str]:
+    """解析--fields参数"""
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in ADDITIONAL_FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"不支持的字段: {','.join(unknown)}（可选: {','.join(ADDITIONAL_FIELDS)}）"
+        )
+    return fields
+
+
+def buildParser() -> argparse.ArgumentParser:
+    """命令行参数"""
+    parser = argparse.ArgumentParser(
+        prog="python -m main.cli",
+        description="FOFA命令行查询：翻页拉取结果并以JSONL/CSV输出到标准输出或文件",
+    )
+    parser.add_argument("queries", nargs="*", help="查询语句")
+    parser.add_argument("-f", "--file", action="append", help="查询语句文件（每行一条，-表示标准输入），可重复指定")
+    parser.add_argument("-o", "--output", help="输出文件，默认为标准输出")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl", help="输出格式（默认jsonl）")
+    parser.add_argument("--fields", type=parseFields, default=[],
+                        help=f"额外字段，逗号分隔（可选: {','.join(ADDITIONAL_FIELDS)}）")
+    parser.add_argument("-l", "--limit", type=int, default=None,
+                        help="每个查询最多拉取的条数，0表示不限制（默认使用配置中的fetch_limit）")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="同时执行的查询数（默认4）")
+    parser.add_argument("--all", action="store_true", help="查询全部数据（含一年前的数据）")
+    parser.add_argument("--exclude-honeypot", action="store_true", help="排除蜜罐和欺诈资产")
+    parser.add_argument("--shard", action="store_true", help="结果超过单次查询上限时拆分为分片并发拉取")
+    parser.add_argument("--key", help="FOFA API Key（默认读取config.properties）")
+    parser.add_argument("--no-cache", action="store_true", help="不读写查询缓存")
+    parser.add_argument("--no-warehouse", action="store_true", help="拉取的结果不写入本地结果库")
+    parser.add_argument("--local", action="store_true",
+                        help="检索本地结果库而不请求FOFA（条件如 product=\"nginx\" && icp=\"xxx\"，"
+                             f"字段: {','.join(ResultWarehouse.SEARCH_FIELDS)}）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度信息")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    
+    Returns:
+        退出码：0成功，1有查询失败或被中断，2参数错误
+    """
+    parser = buildParser()
+    args = parser.parse_args(argv)
+    
+    config = DataUtil.loadConfigure()
+    if args.key:
+        config.key = args.key
+    if args.no_cache:
+        config.cacheStatus = False
+    if args.no_warehouse:
+        config.warehouseStatus = False
+    if args.limit is None:
+        args.limit = config.fetchLimit
+    
+    try:
+        queries = readQueries(args)
+    except OSError as e:
+        parser.error(str(e))
+    if not queries:
+        parser.error("没有查询语句")
+    if not args.local and not config.key and not config.getKeys():
+        parser.error("未配置FOFA API Key（config.properties或--key）")
+    
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    runner = QueryRunner(args, output)
+    try:
+        runner.run(queries)
+    except KeyboardInterrupt:
+        runner.cancel()
+        return 1
+    except BrokenPipeError:
+        # 下游（如head）提前关闭了管道，丢弃剩余输出
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        # 等待拉取的结果写入本地结果库
+        ResultWarehouse.getInstance().flush()
+    return 1 if runner.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,15 +11,25 @@ class FofaConfig:
     
     def __init__(self):
         self.key = ""
+        self.keyPool: List[str] = []  # 额外的API密钥（多账号按剩余额度调度）
         self.max = 10000
         self.size = "1000"
         self.API = "https://fofa.info"
-        self.personalInfoAPI = "https://fofa.info/api/v1/info/my?key=%s"
         self.path = "/api/v1/search/next"
         self.TIP_API = "https://api.fofa.info/v1/search/tip?q="
         self.fields = ["host", "title", "ip", "domain", "port", "protocol", "server", "link"]
         self.additionalField: List[str] = []
         self.checkStatus = False
+        self.fetchLimit = 10000  # 翻页拉取条数上限，0表示拉取全部
+        self.cacheStatus = True  # 查询结果磁盘缓存
+        self.cacheTTL = 1440  # 缓存有效期（分钟），0表示永不过期
+        self.cacheMaxSize = 200  # 缓存容量上限（MB）
+        self.cacheOffline = False  # 离线回放模式，只读缓存不发请求
+        self.warehouseStatus = True  # 拉取的结果写入本地结果库
+        self.enrichConcurrency = 50  # 批量补充数据（favicon等）的并发上限
+        self.shardBudget = 100000  # 分片查询的总拉取条数上限，0表示不限制
+        self.apiRate = 2.0  # API每秒请求数，0表示不限流
+        self.apiBurst = 5  # API突发请求数
     
     @classmethod
     def getInstance(cls) -> 'FofaConfig':
@@ -28,23 +38,95 @@ class FofaConfig:
             cls._instance = cls()
         return cls._instance
     
+    @property
+    def personalInfoAPI(self) -> str:
+        """账号信息接口（跟随API地址，%s为key）"""
+        return f"{self.API}/api/v1/info/my?key=%s"
+    
     def setKey(self, key: str):
         """设置API密钥"""
         self.key = key
     
+    def setKeyPool(self, keys: str):
+        """设置额外的API密钥（逗号分隔）"""
+        self.keyPool = [key.strip() for key in keys.split(",") if key.strip()]
+    
+    def getKeys(self) -> List[str]:
+        """全部API密钥（主密钥在前，去重）"""
+        return list(dict.fromkeys(key for key in [self.key] + self.keyPool if key))
+    
     def setSize(self, size: str):
         """设置查询大小"""
         self.size = size
     
+    def setFetchLimit(self, limit: str):
+        """设置翻页拉取上限"""
+        try:
+            self.fetchLimit = max(0, int(limit))
+        except (ValueError, TypeError):
+            self.fetchLimit = 10000
+    
+    def setEnrichConcurrency(self, concurrency: str):
+        """设置批量补充数据的并发上限"""
+        try:
+            self.enrichConcurrency = max(1, int(concurrency))
+        except (ValueError, TypeError):
+            self.enrichConcurrency = 50
+    
+    def setShardBudget(self, budget: str):
+        """设置分片查询的总拉取条数上限"""
+        try:
+            self.shardBudget = max(0, int(budget))
+        except (ValueError, TypeError):
+            self.shardBudget = 100000
+    
+    def setApiRate(self, rate: str):
+        """设置API每秒请求数"""
+        try:
+            self.apiRate = max(0.0, float(rate))
+        except (ValueError, TypeError):
+            self.apiRate = 2.0
+    
+    def setApiBurst(self, burst: str):
+        """设置API突发请求数"""
+        try:
+            self.apiBurst = max(1, int(burst))
+        except (ValueError, TypeError):
+            self.apiBurst = 5
+    
+    def setCacheTTL(self, ttl: str):
+        """设置缓存有效期（分钟）"""
+        try:
+            self.cacheTTL = max(0, int(ttl))
+        except (ValueError, TypeError):
+            self.cacheTTL = 1440
+    
+    def setCacheMaxSize(self, size: str):
+        """设置缓存容量上限（MB）"""
+        try:
+            self.cacheMaxSize = max(1, int(size))
+        except (ValueError, TypeError):
+            self.cacheMaxSize = 200
+    
     def setAPI(self, api: str):
         """设置API地址"""
         self.API = api
     
-    def getParam(self, isAll: bool = False) -> str:
-        """获取查询参数URL"""
-        fields_str = ",".join(self.fields + self.additionalField)
+    def getParam(self, isAll: bool = False, size: Optional[str] = None,
+                 additionalField: Optional[List[str]] = None) -> str:
+        """
+        获取查询参数URL
+        
+        Args:
+            isAll: 是否查询全部数据（含一年前的数据）
+            size: 每页条数，默认使用配置
+            additionalField: 额外字段，默认使用当前选择
+        """
+        if additionalField is None:
+            additionalField = self.additionalField
+        fields_str = ",".join(self.fields + additionalField)
         full_param = "&full=true" if isAll else ""
-        return f"{self.API}{self.path}?key={self.key}{full_param}&size={self.size}&fields={fields_str}&qbase64="
+        return f"{self.API}{self.path}?key={self.key}{full_param}&size={size or self.size}&fields={fields_str}&qbase64="
 
 
 class ProxyConfig:
@@ -0,0 +1,282 @@
+"""
+查询结果表格模型
+"""
+from array import array
+from itertools import chain
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from models.result_store import ResultStore, ResultRow
+from utils.data_util import DataUtil
+from utils.project_util import ProjectTabLoader
+
+
+class ResultTableModel(QAbstractTableModel):
+    """结果表格模型（直接读取列式存储，视图只请求可见行；排序和过滤只调整显示顺序）"""
+    
+    # 基础列 (表头, 数据行字段)
+    BASE_COLUMNS = [
+        ("序号", "num"), ("HOST", "host"), ("标题", "title"), ("IP", "ip"),
+        ("端口", "port"), ("域名", "domain"), ("协议", "protocol"), ("Server", "server"),
+    ]
+    
+    # 额外字段 -> 数据行字段
+    EXTRA_COLUMNS = {
+        "fid": "fid",
+        "os": "os",
+        "icp": "icp",
+        "product": "product",
+        "certs_subject_cn": "certCN",
+        "certs_subject_org": "certOrg",
+        "lastupdatetime": "lastupdatetime",
+        "icon_hash": "iconHash",
+        "cert_serial": "certSerial",
+        "cert_sans": "certSans",
+        "status": "status",
+        "response_time": "responseTime",
+    }
+    
+    def __init__(self, store: ResultStore, additionalField: Optional[List[str]] = None, parent=None):
+        """
+        Args:
+            store: 数据行存储（与Tab数据共享，追加行后需调用appendRows）
+            additionalField: 额外字段（查询时选择的字段）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._store = store
+        # 显示顺序 -> 存储中的行号
+        self._order = array('I', range(len(store)))
+        # 已显示过的存储行数（过滤掉的行也计入）
+        self._loaded = len(store)
+        # 行过滤条件（参数为存储中的行号），None表示不过滤
+        self._filter: Optional[Callable[[int], bool]] = None
+        # 当前的列排序 (数据行字段, 是否降序)，后续追加的行按此合并到对应位置
+        self._sort: Optional[Tuple[str, bool]] = None
+        self._message = ""
+        # 项目文件中尚未加载的数据行（视图滚动到底部时按块加载）
+        self._loader: Optional[ProjectTabLoader] = None
+        self._columns = list(self.BASE_COLUMNS)
+        for field_name in ResultTableModel.EXTRA_COLUMNS:
+            if field_name in (additionalField or []):
+                self._columns.append((field_name, self.EXTRA_COLUMNS[field_name]))
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """行数"""
+        if parent.isValid():
+            return 0
+        if not self._order and self._message:
+            return 1
+        return len(self._order)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """列数"""
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        """单元格数据"""
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        column = index.column()
+        
+        # 提示信息行（正在查询/查询失败）
+        if not self._order:
+            if role == Qt.ItemDataRole.DisplayRole and column == 0:
+                return self._message
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._store.get(self._order[row], self._columns[column][1])
+            if isinstance(value, int):
+                return str(value) if value or column == 0 else ""
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 0:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+    
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """表头数据"""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self._columns):
+                return self._columns[section][0]
+            return None
+        return str(section + 1)
+    
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """按列排序（数字列和IP按数值排序）"""
+        if not 0 <= column < len(self._columns):
+            return
+        self.fetchAll()
+        self._sort = (self._columns[column][1], order == Qt.SortOrder.DescendingOrder)
+        if not self._order:
+            return
+        
+        self._setOrder(self._sorted(self._order))
+    
+    def _sorted(self, indexes: Iterable[int]) -> List[int]:
+        """按当前的列排序排列行号（排序稳定，已有序的部分只需线性合并）"""
+        attr, descending = self._sort
+        return sorted(indexes, key=self._store.sortKey(attr), reverse=descending)
+    
+    def sortByGroup(self, attr: str):
+        """
+        按字段值分组排序（数量多的分组在前，空值在最后）
+        
+        Args:
+            attr: 数据行字段
+        """
+        self.fetchAll()
+        # 分组顺序随数据变化，之后追加的行不再合并排序
+        self._sort = None
+        if not self._order:
+            return
+        
+        counts = dict(DataUtil.groupCount(self._store, attr))
+        
+        def key(index):
+            value = self._store.get(index, attr)
+            return (not value, -counts.get(value, 0), value)
+        
+        self._setOrder(sorted(self._order, key=key))
+    
+    def _setOrder(self, order: List[int]):
+        """更新显示顺序"""
+        self.layoutAboutToBeChanged.emit()
+        self._order = array('I', order)
+        self.layoutChanged.emit()
+    
+    def setMessage(self, message: str):
+        """设置无数据时显示的提示信息"""
+        self.beginResetModel()
+        self._message = message
+        self.endResetModel()
+    
+    def appendRows(self):
+        """显示存储中新追加的数据行（按列排序后合并到对应位置，否则追加在显示顺序末尾）"""
+        end = len(self._store)
+        if end <= self._loaded:
+            return
+        indexes = range(self._loaded, end)
+        self._loaded = end
+        if self._filter is not None:
+            indexes = [index for index in indexes if self._filter(index)]
+        if not indexes:
+            return
+        if not self._order and self._message:
+            self.setMessage("")
+        
+        if self._sort is not None:
+            indexes = self._sorted(indexes)
+            if self._order and not self._followsOrder(indexes[0]):
+                # 新行需要插入到已有行之间
+                self._setOrder(self._sorted(chain(self._order, indexes)))
+                return
+        
+        start = len(self._order)
+        self.beginInsertRows(QModelIndex(), start, start + len(indexes) - 1)
+        self._order.extend(indexes)
+        self.endInsertRows()
+    
+    def _followsOrder(self, index: int) -> bool:
+        """行是否可以直接排在当前显示顺序的末尾（如按序号排序时新翻页的行）"""
+        attr, descending = self._sort
+        key = self._store.sortKey(attr)
+        last = key(self._order[-1])
+        return key(index) <= last if descending else key(index) >= last
+    
+    def setLoader(self, loader: Optional[ProjectTabLoader]):
+        """设置按需加载数据行的加载器（打开项目时使用）"""
+        self._loader = loader
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        """是否还有未加载的数据行"""
+        if parent.isValid() or self._loader is None:
+            return False
+        return self._loader.hasMore()
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """加载下一块数据行"""
+        if self.canFetchMore(parent):
+            self._loader.loadNext()
+            self.appendRows()
+    
+    def fetchAll(self):
+        """加载全部剩余数据行（排序、导出、保存等需要完整数据时调用）"""
+        if self._loader is not None and self._loader.hasMore():
+            self._loader.loadAll()
+            self.appendRows()
+    
+    def setFilter(self, predicate: Optional[Callable[[int], bool]]):
+        """
+        设置行过滤条件（已显示的行保持当前顺序，重新符合条件的行追加在末尾；按列排序时重新排序）
+        
+        Args:
+            predicate: 过滤条件，参数为存储中的行号，返回False的行不显示；None表示不过滤
+        """
+        self._filter = predicate
+        shown = set(self._order)
+        order = [index for index in self._order if predicate is None or predicate(index)]
+        order.extend(
+            index for index in range(self._loaded)
+            if index not in shown and (predicate is None or predicate(index))
+        )
+        if self._sort is not None:
+            order = self._sorted(order)
+        self.beginResetModel()
+        self._order = array('I', order)
+        self.endResetModel()
+    
+    def isFiltered(self) -> bool:
+        """是否设置了过滤条件"""
+        return self._filter is not None
+    
+    def refresh(self):
+        """通知视图刷新已有行（去重时行数据会被原地替换）"""
+        if self._order:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(self._order) - 1, len(self._columns) - 1)
+            )
+    
+    def addColumn(self, field_name: str):
+        """
+        追加额外字段列（查询后补充的数据，如icon_hash）
+        
+        Args:
+            field_name: 额外字段名
+        """
+        attr = self.EXTRA_COLUMNS[field_name]
+        if self.columnOf(attr) >= 0:
+            return
+        column = len(self._columns)
+        self.beginInsertColumns(QModelIndex(), column, column)
+        self._columns.append((field_name, attr))
+        self.endInsertColumns()
+    
+    def columnOf(self, attr: str) -> int:
+        """获取数据行字段所在的列，不存在时为-1"""
+        for column, (_, column_attr) in enumerate(self._columns):
+            if column_attr == attr:
+                return column
+        return -1
+    
+    def rowAt(self, row: int) -> Optional[ResultRow]:
+        """获取指定行的数据"""
+        if 0 <= row < len(self._order):
+            return self._store.row(self._order[row])
+        return None
+    
+    def rows(self) -> List[ResultRow]:
+        """获取全部数据行（按显示顺序）"""
+        return [self._store.row(index) for index in self._order]
+    
+    def isEmpty(self) -> bool:
+        """是否没有数据行"""
+        return not self._order
@@ -0,0 +1,423 @@
+"""
+按列存储的查询结果
+"""
+import json
+import socket
+import threading
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+def _decodeArray(typecode: str, payload: bytes, count: int) -> array:
+    """原始字节还原为数组（长度必须与行数一致）"""
+    values = array(typecode)
+    if len(payload) != count * values.itemsize:
+        raise ValueError(f"列数据长度不符: {len(payload)}")
+    values.frombytes(payload)
+    return values
+
+
+def _decodeJson(payload: bytes, kind: type):
+    """UTF-8 JSON还原为指定类型的值"""
+    value = json.loads(payload.decode("utf-8"))
+    if not isinstance(value, kind):
+        raise ValueError("列数据格式错误")
+    return value
+
+
+class _IntColumn:
+    """整数列"""
+    __slots__ = ("values",)
+    
+    def __init__(self):
+        self.values = array('q')
+    
+    def append(self, value):
+        self.values.append(value or 0)
+    
+    def get(self, index: int) -> int:
+        return self.values[index]
+    
+    def set(self, index: int, value):
+        self.values[index] = value or 0
+    
+    def dump(self, start: int, end: int) -> bytes:
+        return self.values[start:end].tobytes()
+    
+    def decode(self, payload: Optional[bytes], count: int):
+        return _decodeArray('q', payload or b"", count)
+    
+    def load(self, decoded, count: int):
+        self.values.extend(decoded)
+
+
+class _IPColumn:
+    """IP列（IPv4存为整数，其他地址单独存放）"""
+    __slots__ = ("values", "others")
+    
+    def __init__(self):
+        self.values = array('q')
+        self.others: Dict[int, str] = {}
+    
+    @staticmethod
+    def pack(ip: str) -> int:
+        """IPv4转为整数，不是规范的IPv4地址时为-1"""
+        try:
+            packed = socket.inet_aton(ip)
+        except (OSError, TypeError):
+            return -1
+        # inet_aton接受"1.2.3"等简写，只保留能原样还原的地址
+        if socket.inet_ntoa(packed) != ip:
+            return -1
+        return int.from_bytes(packed, "big")
+    
+    def append(self, ip: str):
+        self.values.append(0)
+        self.set(len(self.values) - 1, ip)
+    
+    def get(self, index: int) -> str:
+        value = self.values[index]
+        if value < 0:
+            return self.others.get(index, "")
+        return socket.inet_ntoa(value.to_bytes(4, "big"))
+    
+    def set(self, index: int, ip: str):
+        value = self.pack(ip) if ip else -1
+        self.values[index] = value
+        if value < 0 and ip:
+            self.others[index] = ip
+        else:
+            self.others.pop(index, None)
+    
+    def sortKey(self, index: int) -> int:
+        """排序键（IPv4按数值，其他地址排在最前）"""
+        return self.values[index]
+    
+    def dump(self, start: int, end: int) -> bytes:
+        data = self.values[start:end].tobytes()
+        others = {str(index - start): ip for index, ip in self.others.items() if start <= index < end}
+        if others:
+            data += json.dumps(others, ensure_ascii=False).encode("utf-8")
+        return data
+    
+    def decode(self, payload: Optional[bytes], count: int):
+        payload = payload or b""
+        size = count * self.values.itemsize
+        values = _decodeArray('q', payload[:size], count)
+        others = _decodeJson(payload[size:], dict) if len(payload) > size else {}
+        return values, {int(index): str(ip) for index, ip in others.items()}
+    
+    def load(self, decoded, count: int):
+        values, others = decoded
+        offset = len(self.values)
+        self.values.extend(values)
+        for index, ip in others.items():
+            self.others[offset + index] = ip
+
+
+class _CategoryColumn:
+    """字典编码的字符串列（协议、Server等重复值多的字段，每个值只存一份）"""
+    __slots__ = ("codes", "lookup", "index")
+    
+    def __init__(self):
+        self.codes = array('I')
+        self.lookup: List[str] = [""]
+        self.index: Dict[str, int] = {"": 0}
+    
+    def _code(self, value: str) -> int:
+        value = value or ""
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.lookup)
+            self.lookup.append(value)
+            self.index[value] = code
+        return code
+    
+    def append(self, value: str):
+        self.codes.append(self._code(value))
+    
+    def get(self, index: int) -> str:
+        return self.lookup[self.codes[index]]
+    
+    def set(self, index: int, value: str):
+        self.codes[index] = self._code(value)
+    
+    def dump(self, start: int, end: int) -> bytes:
+        return self.codes[start:end].tobytes()
+    
+    def decode(self, payload: Optional[bytes], count: int):
+        codes = _decodeArray('I', payload or b"", count)
+        if codes and max(codes) >= len(self.lookup):
+            raise ValueError("编码超出字典范围")
+        return codes
+    
+    def load(self, decoded, count: int):
+        self.codes.extend(decoded)
+    
+    def setLookup(self, lookup: List[str]):
+        """恢复字典（加载编码前调用，已有的值必须是其前缀）"""
+        self.lookup = list(lookup)
+        self.index = {value: code for code, value in enumerate(self.lookup)}
+
+
+class _TextColumn:
+    """普通字符串列（全部为空时不分配存储）"""
+    __slots__ = ("values", "size")
+    
+    def __init__(self):
+        self.values: Optional[List[str]] = None
+        self.size = 0
+    
+    def append(self, value: str):
+        if self.values is not None:
+            self.values.append(value or "")
+        elif value:
+            self.values = [""] * self.size
+            self.values.append(value)
+        self.size += 1
+    
+    def get(self, index: int) -> str:
+        return self.values[index] if self.values is not None else ""
+    
+    def set(self, index: int, value: str):
+        if self.values is None:
+            if not value:
+                return
+            self.values = [""] * self.size
+        self.values[index] = value or ""
+    
+    def dump(self, start: int, end: int) -> Optional[bytes]:
+        if self.values is None:
+            return None
+        chunk = self.values[start:end]
+        return json.dumps(chunk, ensure_ascii=False).encode("utf-8") if any(chunk) else None
+    
+    def decode(self, payload: Optional[bytes], count: int):
+        if payload is None:
+            return None
+        values = _decodeJson(payload, list)
+        if len(values) != count:
+            raise ValueError(f"列数据行数不符: {len(values)}")
+        return [str(value) for value in values]
+    
+    def load(self, decoded, count: int):
+        if decoded is not None:
+            if self.values is None:
+                self.values = [""] * self.size
+            self.values.extend(decoded)
+        elif self.values is not None:
+            self.values.extend([""] * count)
+        self.size += count
+
+
+class ResultRow:
+    """
+    数据行句柄（只保存所在的存储和行号，属性读写直接访问列）
+    
+    字段与原先的表格数据行一致：num, host, title, ip, domain, port, protocol, server,
+    lastupdatetime, fid, os, icp, product, certCN, certOrg, status, link, iconHash,
+    certSerial, certSans, responseTime
+    """
+    __slots__ = ("store", "index")
+    
+    def __init__(self, store: 'ResultStore', index: int):
+        object.__setattr__(self, "store", store)
+        object.__setattr__(self, "index", index)
+    
+    def __getattr__(self, name: str):
+        try:
+            return self.store.get(self.index, name)
+        except KeyError:
+            raise AttributeError(name) from None
+    
+    def __setattr__(self, name: str, value):
+        try:
+            self.store.set(self.index, name, value)
+        except KeyError:
+            raise AttributeError(name) from None
+    
+    def __eq__(self, other):
+        return isinstance(other, ResultRow) and self.store is other.store and self.index == other.index
+    
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+    
+    def __repr__(self):
+        return f"ResultRow({self.index}, host={self.host!r}, ip={self.ip!r}, port={self.port})"
+
+
+class ResultStore:
+    """
+    Tab查询结果的列式存储
+    
+    每个字段一列：序号和端口为整数数组，IP按IPv4整数存放，
+    重复值多的字段字典编码，其余字段为字符串列表（全部为空的列不占用空间）。
+    数据行通过行号访问，row()返回轻量的行句柄。
+    
+    写入（追加、替换、修改单元格）由lock串行化，可以在后台线程进行；
+    读取不加锁，界面只读取已通知过的行。
+    """
+    
+    # 字段 -> 列类型
+    COLUMNS = {
+        "num": _IntColumn,
+        "host": _TextColumn,
+        "title": _TextColumn,
+        "ip": _IPColumn,
+        "domain": _TextColumn,
+        "port": _IntColumn,
+        "protocol": _CategoryColumn,
+        "server": _CategoryColumn,
+        "lastupdatetime": _TextColumn,
+        "fid": _TextColumn,
+        "os": _CategoryColumn,
+        "icp": _CategoryColumn,
+        "product": _CategoryColumn,
+        "certCN": _TextColumn,
+        "certOrg": _CategoryColumn,
+        "status": _CategoryColumn,
+        "link": _TextColumn,
+        "iconHash": _CategoryColumn,
+        "certSerial": _TextColumn,
+        "certSans": _TextColumn,
+        "responseTime": _IntColumn,
+    }
+    
+    # 行记录对应的字段（与DataUtil.RECORD_FIELDS一一对应）
+    RECORD_ATTRS = (
+        "host", "title", "ip", "domain", "port", "protocol", "server", "link",
+        "lastupdatetime", "fid", "os", "icp", "product", "certCN", "certOrg"
+    )
+    
+    def __init__(self):
+        self.columns = {name: column_cls() for name, column_cls in self.COLUMNS.items()}
+        self._recordColumns = [self.columns[name] for name in self.RECORD_ATTRS]
+        # 查询后才补充的字段（favicon、证书、状态等），追加时为空
+        self._laterColumns = [
+            column for name, column in self.columns.items()
+            if name not in self.RECORD_ATTRS and name != "num"
+        ]
+        self._size = 0
+        self.lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[ResultRow]:
+        for index in range(self._size):
+            yield ResultRow(self, index)
+    
+    def row(self, index: int) -> ResultRow:
+        """获取行句柄"""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return ResultRow(self, index)
+    
+    def get(self, index: int, attr: str):
+        """
+        读取单元格
+        
+        Raises:
+            KeyError: 字段不存在
+        """
+        return self.columns[attr].get(index)
+    
+    def set(self, index: int, attr: str, value):
+        """
+        写入单元格
+        
+        Raises:
+            KeyError: 字段不存在
+        """
+        with self.lock:
+            self.columns[attr].set(index, value)
+    
+    def appendRecord(self, record: tuple, num: int = 0) -> int:
+        """
+        追加一条行记录
+        
+        Args:
+            record: DataUtil.parseResults解析出的行记录
+            num: 序号
+        
+        Returns:
+            新行的行号
+        """
+        with self.lock:
+            for column, value in zip(self._recordColumns, record):
+                column.append(value)
+            for column in self._laterColumns:
+                column.append("")
+            self.columns["num"].append(num)
+            self._size += 1
+            return self._size - 1
+    
+    def replaceRecord(self, index: int, record: tuple):
+        """用新的行记录覆盖已有行（序号和查询后补充的字段保留）"""
+        with self.lock:
+            for column, value in zip(self._recordColumns, record):
+                column.set(index, value)
+    
+    def dumpChunk(self, start: int, end: int) -> Dict[str, bytes]:
+        """
+        导出一段数据行（按列编码为字节，数组均为本机字节序）
+        
+        - 整数列：int64数组
+        - 编码列：uint32数组（字典的下标）
+        - IP列：int64数组（非IPv4为-1），有非IPv4地址时其后接UTF-8 JSON对象{块内行号: 地址}
+        - 字符串列：UTF-8 JSON数组；全部为空时不导出
+        
+        Args:
+            start: 起始行号
+            end: 结束行号（不含）
+        
+        Returns:
+            {字段: 列数据}
+        """
+        with self.lock:
+            chunk = {name: column.dump(start, end) for name, column in self.columns.items()}
+        return {name: data for name, data in chunk.items() if data is not None}
+    
+    def loadChunk(self, chunk: Dict[str, bytes], count: int):
+        """
+        追加dumpChunk导出的数据行（编码列需先用lookups恢复字典；
+        先校验全部列，数据有误时存储不变）
+        
+        Args:
+            chunk: 列数据（缺少的字符串列视为全部为空）
+            count: 行数
+        
+        Raises:
+            ValueError: 列数据与行数不符或格式错误
+        """
+        with self.lock:
+            decoded = {name: column.decode(chunk.get(name), count) for name, column in self.columns.items()}
+            for name, column in self.columns.items():
+                column.load(decoded[name], count)
+            self._size += count
+    
+    def lookups(self) -> Dict[str, List[str]]:
+        """字典编码列的字典"""
+        with self.lock:
+            return {
+                name: list(column.lookup) for name, column in self.columns.items()
+                if isinstance(column, _CategoryColumn)
+            }
+    
+    def setLookups(self, lookups: Dict[str, List[str]]):
+        """恢复字典编码列的字典（只能在存储为空时调用）"""
+        with self.lock:
+            for name, lookup in lookups.items():
+                self.columns[name].setLookup(lookup)
+    
+    def sortKey(self, attr: str) -> Callable[[int], object]:
+        """
+        获取按字段排序的键函数（参数为行号）
+        
+        Raises:
+            KeyError: 字段不存在
+        """
+        column = self.columns[attr]
+        if isinstance(column, _IPColumn):
+            return column.sortKey
+        return column.get
@@ -4,53 +4,7 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
-
-@dataclass
-class TableBean:
-    """表格数据Bean"""
-    num: int = 0
-    host: str = ""
-    title: str = ""
-    ip: str = ""
-    domain: str = ""
-    port: int = 0
-    protocol: str = ""
-    server: str = ""
-    lastupdatetime: str = ""
-    fid: str = ""
-    os: str = ""
-    icp: str = ""
-    product: str = ""
-    certCN: str = ""
-    certOrg: str = ""
-    status: str = ""
-    
-    def __eq__(self, other):
-        """相等性比较（用于去重）"""
-        if not isinstance(other, TableBean):
-            return False
-        if self is other:
-            return True
-        
-        # 端口相同
-        port_match = self.port == other.port
-        
-        # Host匹配（考虑443和80端口的情况）
-        host_match = self.host == other.host
-        if port_match:
-            if self.port == 443 and (":443" in self.host or ":443" in other.host):
-                host_match = True
-            if self.port == 80 and (":80" in self.host or ":80" in other.host):
-                host_match = True
-        
-        # IP相同
-        ip_match = self.ip == other.ip
-        
-        return host_match and ip_match and port_match
-    
-    def __hash__(self):
-        """哈希值（用于去重）"""
-        return hash((self.ip, self.port))
+from models.result_store import ResultStore
 
 
 @dataclass
@@ -70,6 +24,11 @@ class ExcelBean:
     product: str = ""
     certs_subject_org: str = ""
     certs_subject_cn: str = ""
+    icon_hash: str = ""
+    cert_serial: str = ""
+    cert_sans: str = ""
+    status: str = ""
+    response_time: int = 0
     
     def __eq__(self, other):
         """相等性比较（用于去重）"""
@@ -101,8 +60,46 @@ class TabDataBean:
     """Tab页数据Bean"""
     count: int = 0
     total: int = 0
-    dataList: set = field(default_factory=set)
+    rows: ResultStore = field(default_factory=ResultStore)  # 列式存储的数据行（表格模型与导出共用）
+    fields: list = field(default_factory=list)  # 查询时选择的额外字段
+    columns: list = field(default_factory=list)  # 查询后补充的列（如icon_hash）
+    dedupeIndex: dict = field(default_factory=dict)  # 去重索引 {(ip, port, host): 行号}
     hasMoreData: bool = True
     page: int = 1
     next: Optional[str] = None
 
+
+@dataclass
+class CertBean:
+    """证书信息Bean"""
+    serial: str = ""
+    cn: str = ""
+    org: str = ""
+    sans: list = field(default_factory=list)
+
+
+@dataclass
+class ShardBean:
+    """查询分片Bean"""
+    query: str = ""
+    conditions: list = field(default_factory=list)  # 在原查询上追加的条件
+    dimension: int = 0  # 下一个拆分维度
+    window: Optional[tuple] = None  # 时间窗口 (after, before)，after为None表示不限起始时间
+    total: int = 0
+    truncated: bool = False  # 可能超过上限，只能拉取上限条数
+    probeLimited: bool = False  # 探测次数达到上限，未继续拆分
+    probeFailed: bool = False  # 探测失败，结果总数未知
+
+
+@dataclass
+class PageBean:
+    """翻页结果Bean"""
+    page: int = 1
+    cursor: Optional[str] = None
+    next: Optional[str] = None
+    obj: dict = field(default_factory=dict)
+    hasMore: bool = False
+    total: int = 0
+    error: str = ""
+    records: list = field(default_factory=list)  # 解析后的行记录（见DataUtil.parseResults）
+    added: int = 0  # 写入Tab数据存储后新增的行数
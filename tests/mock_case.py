@@ -0,0 +1,44 @@
+"""
+使用本地FOFA模拟服务的测试基类
+"""
+import unittest
+from typing import List, Optional
+
+from benchmarks.bench import isolateConfig
+from benchmarks.mock_fofa import MockFofaServer, MockOptions
+from main.config import FofaConfig
+from utils.key_pool import KeyPool
+from utils.request_util import RequestUtil
+
+
+class MockServerTestCase(unittest.TestCase):
+    """
+    每个测试启动一个模拟服务，配置指向该服务
+    
+    不读写查询缓存和本地结果库、不限流；子类可重写options调整服务行为。
+    """
+    
+    # 请求的额外字段
+    FIELDS: List[str] = ["lastupdatetime"]
+    
+    def options(self) -> MockOptions:
+        """模拟服务的行为参数"""
+        return MockOptions()
+    
+    def setUp(self):
+        isolateConfig()
+        self.config = FofaConfig.getInstance()
+        self._saved = (self.config.API, self.config.key, self.config.keyPool, self.config.size)
+        self.server = MockFofaServer(self.options()).start()
+        self.addCleanup(self.server.stop)
+        self.config.API = self.server.url
+        self.config.key = "test"
+        self.config.keyPool = []
+        KeyPool.getInstance().states.clear()
+    
+    def tearDown(self):
+        self.config.API, self.config.key, self.config.keyPool, self.config.size = self._saved
+    
+    def buildUrl(self, query: str, size: Optional[str] = None, isAll: bool = False) -> str:
+        """构建查询URL（不带next游标）"""
+        return self.config.getParam(isAll, size, list(self.FIELDS)) + RequestUtil.getInstance().encode(query)
@@ -0,0 +1,45 @@
+"""
+ResponseCache.canonicalKey测试
+"""
+import base64
+import unittest
+
+from utils.cache_util import ResponseCache
+from utils.data_util import DataUtil
+
+
+def queryUrl(query: str) -> str:
+    """按FofaConfig.getParam的格式拼接查询URL（qbase64不转义）"""
+    qbase64 = base64.b64encode(query.encode('utf-8')).decode('utf-8')
+    return f"https://fofa.info/api/v1/search/all?key=k&size=100&fields=host,ip&qbase64={qbase64}"
+
+
+class CanonicalKeyTest(unittest.TestCase):
+    
+    def testPlusInQbase64(self):
+        # a>>~ 编码为 YT4+fg==，parse_qs会把+解析为空格
+        self.assertIn("+", queryUrl("a>>~"))
+        self.assertEqual(
+            ResponseCache.canonicalKey(queryUrl("a>>~")),
+            ResponseCache.canonicalKey(queryUrl("a>>~  "))
+        )
+    
+    def testWhitespaceNormalized(self):
+        self.assertEqual(
+            ResponseCache.canonicalKey(queryUrl('app="nginx"')),
+            ResponseCache.canonicalKey(queryUrl(' app="nginx" '))
+        )
+    
+    def testDifferentQueries(self):
+        self.assertNotEqual(
+            ResponseCache.canonicalKey(queryUrl("a>>~")),
+            ResponseCache.canonicalKey(queryUrl("a>>}"))
+        )
+    
+    def testDecodeQuery(self):
+        self.assertEqual(DataUtil.decodeQuery("YT4 fg=="), "a>>~")
+        self.assertIsNone(DataUtil.decodeQuery("not base64!"))
+
+
+if __name__ == "__main__":
+    unittest.main()
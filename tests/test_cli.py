@@ -0,0 +1,87 @@
+"""
+命令行查询测试（使用本地FOFA模拟服务）
+"""
+import contextlib
+import csv
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import main.cli as cli
+from benchmarks.mock_fofa import MockOptions
+from tests.mock_case import MockServerTestCase
+from utils.data_util import DataUtil
+
+
+class CliTest(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        return MockOptions(duplicateRate=0.05)
+    
+    def setUp(self):
+        super().setUp()
+        # 不读取本机的config.properties
+        patcher = mock.patch.object(DataUtil, "loadConfigure", return_value=self.config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempDir.cleanup)
+    
+    def run_cli(self, *argv: str):
+        """执行命令行，返回(退出码, 标准输出, 标准错误)"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = cli.main(["--no-cache", "--no-warehouse", *argv])
+        return code, stdout.getvalue(), stderr.getvalue()
+    
+    def testJsonlToStdout(self):
+        code, out, err = self.run_cli('mock_total="1500"', "--limit", "0", "--fields", "icp,product")
+        self.assertEqual(code, 0, err)
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertTrue(records)
+        self.assertLessEqual(len(records), 1500)
+        self.assertEqual(set(records[0]), {"query", *cli.BASE_FIELDS, "icp", "product"})
+        keys = {(r["ip"], r["port"], r["host"]) for r in records}
+        self.assertEqual(len(keys), len(records))
+        self.assertIn("完成", err)
+    
+    def testMultipleQueriesCsv(self):
+        output = Path(self.tempDir.name) / "out.csv"
+        code, out, err = self.run_cli(
+            'mock_total="300"', 'mock_total="200"', "--format", "csv", "-o", str(output), "-q", "--limit", "0"
+        )
+        self.assertEqual(code, 0, err)
+        self.assertEqual(out, "")
+        with open(output, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][0], "query")
+        counts = {}
+        for row in rows[1:]:
+            counts[row[0]] = counts.get(row[0], 0) + 1
+        self.assertEqual(set(counts), {'mock_total="300"', 'mock_total="200"'})
+    
+    def testLimit(self):
+        code, out, err = self.run_cli('mock_total="1500"', "--limit", "250", "-q")
+        self.assertEqual(code, 0, err)
+        self.assertLessEqual(len(out.splitlines()), 250)
+    
+    def testSharded(self):
+        code, out, err = self.run_cli('mock_total="3000"', "--shard", "--all", "--limit", "0")
+        self.assertEqual(code, 0, err)
+        self.assertIn("分片", err)
+        keys = {(r["ip"], r["port"], r["host"]) for r in map(json.loads, out.splitlines())}
+        _, paged, _ = self.run_cli('mock_total="3000"', "--all", "--limit", "0", "-q")
+        expected = {(r["ip"], r["port"], r["host"]) for r in map(json.loads, paged.splitlines())}
+        self.assertEqual(keys, expected)
+    
+    def testInvalidKey(self):
+        code, out, err = self.run_cli('mock_total="100"', "--key", "invalid", "-q")
+        self.assertEqual(code, 1)
+        self.assertEqual(out, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
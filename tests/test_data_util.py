@@ -0,0 +1,167 @@
+"""
+去重规则测试（与原loadJsonData的列表去重比较）
+"""
+import unittest
+from typing import List, Set, Tuple
+
+from models.table_bean import ExcelBean, TabDataBean
+from utils.data_util import DataUtil
+
+
+class LegacyRow:
+    """原TableBean的去重字段和__eq__"""
+    
+    def __init__(self, host: str, title: str, ip: str, port: int):
+        self.num = 0
+        self.host = host
+        self.title = title
+        self.ip = ip
+        self.port = port
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        port_match = self.port == other.port
+        host_match = self.host == other.host
+        if port_match:
+            if self.port == 443 and (":443" in self.host or ":443" in other.host):
+                host_match = True
+            if self.port == 80 and (":80" in self.host or ":80" in other.host):
+                host_match = True
+        return host_match and self.ip == other.ip and port_match
+
+
+def legacyDedupe(rows: List[tuple]) -> Set[Tuple[int, str, str]]:
+    """原loadJsonData表格模式的去重，返回{(序号, host, title)}"""
+    list_data = []
+    count = 0
+    for host, title, ip, port in rows:
+        data = LegacyRow(host, title, ip, port)
+        if data in list_data:
+            existing = list_data[list_data.index(data)]
+            if port in [443, 80]:
+                if ":443" in existing.host or ":80" in existing.host:
+                    data.num = existing.num
+                    list_data.remove(existing)
+                elif ":443" in data.host or ":80" in data.host:
+                    continue
+            if existing.host == data.host:
+                if existing.title:
+                    continue
+                data.num = existing.num
+                list_data.remove(existing)
+        if data.num == 0:
+            count += 1
+            data.num = count
+        list_data.append(data)
+    return {(data.num, data.host, data.title) for data in list_data}
+
+
+def record(host: str, title: str, ip: str, port: int) -> tuple:
+    """构造一条行记录（字段顺序见DataUtil.RECORD_FIELDS）"""
+    return (host, title, ip, "", port, "http", "", "", "", "", "", "", "", "", "")
+
+
+def tableRows(bean: TabDataBean) -> Set[Tuple[int, str, str]]:
+    store = bean.rows
+    return {(store.get(row, "num"), store.get(row, "host"), store.get(row, "title")) for row in range(len(store))}
+
+
+# (说明, [(host, title, ip, port)])
+CASES = [
+    ("同host，已有行无标题，新行有标题",
+     [("a.com:8080", "", "1.1.1.1", 8080), ("a.com:8080", "Title", "1.1.1.1", 8080)]),
+    ("同host，已有行有标题",
+     [("a.com:8080", "Title", "1.1.1.1", 8080), ("a.com:8080", "", "1.1.1.1", 8080)]),
+    ("同host，都有标题",
+     [("a.com:8080", "First", "1.1.1.1", 8080), ("a.com:8080", "Second", "1.1.1.1", 8080)]),
+    ("已有行带:443",
+     [("a.com:443", "", "1.1.1.1", 443), ("a.com", "", "1.1.1.1", 443)]),
+    ("新行带:443",
+     [("a.com", "", "1.1.1.1", 443), ("a.com:443", "Title", "1.1.1.1", 443)]),
+    ("已有行带:80",
+     [("a.com:80", "Title", "1.1.1.1", 80), ("a.com", "", "1.1.1.1", 80)]),
+    ("新行带:80",
+     [("a.com", "", "1.1.1.1", 80), ("a.com:80", "", "1.1.1.1", 80)]),
+    ("https://前缀带:443",
+     [("https://a.com:443", "", "1.1.1.1", 443), ("a.com", "Title", "1.1.1.1", 443)]),
+    ("https://前缀与无前缀",
+     [("https://a.com", "", "1.1.1.1", 443), ("a.com", "", "1.1.1.1", 443)]),
+    ("不同IP",
+     [("a.com", "", "1.1.1.1", 80), ("a.com", "", "2.2.2.2", 80)]),
+    ("不同端口",
+     [("a.com:8080", "", "1.1.1.1", 8080), ("a.com:8081", "", "1.1.1.1", 8081)]),
+    ("替换后再次重复",
+     [("a.com:80", "", "1.1.1.1", 80), ("a.com", "", "1.1.1.1", 80), ("a.com", "Title", "1.1.1.1", 80),
+      ("b.com", "", "1.1.1.1", 80), ("a.com", "Other", "1.1.1.1", 80)]),
+]
+
+
+class DedupeKeyTest(unittest.TestCase):
+    
+    def testDefaultPortNormalised(self):
+        for port, host, expected in [
+            (443, "https://a.com:443", "a.com"),
+            (443, "a.com:443", "a.com"),
+            (80, "http://a.com:80", "a.com"),
+            (80, "a.com", "a.com"),
+            (8443, "a.com:443", "a.com:443"),
+            (443, "a.com:80", "a.com:80"),
+        ]:
+            with self.subTest(port=port, host=host):
+                self.assertEqual(DataUtil.dedupeKey("1.1.1.1", port, host), ("1.1.1.1", port, expected))
+
+
+class DedupeRulesTest(unittest.TestCase):
+    
+    def testTableMatchesLegacy(self):
+        for name, rows in CASES:
+            with self.subTest(name):
+                bean = TabDataBean()
+                DataUtil.loadRecords(bean, [record(*row) for row in rows], None, None)
+                self.assertEqual(tableRows(bean), legacyDedupe(rows))
+                self.assertEqual(bean.count, len(legacyDedupe(rows)))
+    
+    def testExportMatchesTable(self):
+        for name, rows in CASES:
+            with self.subTest(name):
+                excel_data: List[ExcelBean] = []
+                DataUtil.loadRecords(TabDataBean(), [record(*row) for row in rows], excel_data, set(), True)
+                expected = sorted((host, title) for _, host, title in legacyDedupe(rows))
+                self.assertEqual(sorted((data.host, data.title) for data in excel_data), expected)
+    
+    def testSameSuffixedHostKept(self):
+        # 原逻辑会先删掉已有行再因标题丢弃新行，两条都丢失；现在保留有标题的已有行
+        bean = TabDataBean()
+        rows = [("a.com:443", "Title", "1.1.1.1", 443), ("a.com:443", "", "1.1.1.1", 443)]
+        DataUtil.loadRecords(bean, [record(*row) for row in rows], None, None)
+        self.assertEqual(tableRows(bean), {(1, "a.com:443", "Title")})
+    
+    def testCollisionAcrossPagesKeepsNum(self):
+        bean = TabDataBean()
+        pages = [
+            [record("a.com:8080", "", "1.1.1.1", 8080), record("b.com", "", "2.2.2.2", 80)],
+            [record("c.com", "", "3.3.3.3", 80), record("a.com:8080", "Title", "1.1.1.1", 8080)],
+            [record("b.com:80", "", "2.2.2.2", 80), record("d.com", "", "4.4.4.4", 80)],
+        ]
+        added = [len(DataUtil.loadRecords(bean, page, None, None)) for page in pages]
+        self.assertEqual(added, [2, 1, 1])
+        self.assertEqual(tableRows(bean), {
+            (1, "a.com:8080", "Title"), (2, "b.com", ""), (3, "c.com", ""), (4, "d.com", ""),
+        })
+        # 替换是原地进行的，行号和序号不变
+        self.assertEqual(bean.rows.get(0, "num"), 1)
+        self.assertEqual(bean.rows.get(0, "title"), "Title")
+        self.assertEqual(bean.count, 4)
+    
+    def testExportIndexAcrossPages(self):
+        bean = TabDataBean()
+        excel_data: List[ExcelBean] = []
+        for page in ([record("a.com", "", "1.1.1.1", 443)], [record("a.com:443", "T", "1.1.1.1", 443)],
+                     [record("a.com", "Title", "1.1.1.1", 443)]):
+            DataUtil.loadRecords(bean, page, excel_data, set(), True)
+        self.assertEqual([(data.host, data.title) for data in excel_data], [("a.com", "Title")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+DedupeWindow和PullExportJob测试
+"""
+import csv
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.mock_fofa import MockOptions
+from models.table_bean import TabDataBean
+from tests.mock_case import MockServerTestCase
+from utils.data_util import DataUtil
+from utils.export_util import DedupeWindow, PullExportJob
+from utils.page_util import PaginationEngine
+
+
+def record(host: str, title: str = "", ip: str = "1.1.1.1", port: int = 80) -> tuple:
+    """构造一条行记录（字段顺序见DataUtil.RECORD_FIELDS）"""
+    return (host, title, ip, "", port, "http", "", "", "", "", "", "", "", "", "")
+
+
+class DedupeWindowTest(unittest.TestCase):
+    
+    def testReplaceInsideWindow(self):
+        window = DedupeWindow(TabDataBean(), size=10)
+        ready, _ = window.push([record("a.com")])
+        self.assertEqual(ready, [])
+        window.push([record("a.com", "Title")])
+        rows = window.drain()
+        self.assertEqual([(data.host, data.title) for data in rows], [("a.com", "Title")])
+        self.assertEqual(window.lateReplaced, 0)
+    
+    def testReplaceAfterWritten(self):
+        window = DedupeWindow(TabDataBean(), size=1)
+        written = []
+        for page in ([record("a.com")], [record("b.com", ip="2.2.2.2")], [record("a.com", "Title")]):
+            ready, _ = window.push(page)
+            written.extend(ready)
+        written.extend(window.drain())
+        # 已写出的a.com不能再替换，新数据被丢弃并计数
+        self.assertEqual([(data.host, data.title) for data in written], [("a.com", ""), ("b.com", "")])
+        self.assertEqual(window.lateReplaced, 1)
+    
+    def testDropDuplicateAfterWritten(self):
+        window = DedupeWindow(TabDataBean(), size=1)
+        written = []
+        for page in ([record("a.com", "Title")], [record("b.com", ip="2.2.2.2")], [record("a.com", "Other")]):
+            written.extend(window.push(page)[0])
+        written.extend(window.drain())
+        self.assertEqual(len(written), 2)
+        self.assertEqual(window.lateReplaced, 0)
+
+
+class PullExportTest(MockServerTestCase):
+    
+    FIELDS = ["lastupdatetime", "product"]
+    
+    def options(self) -> MockOptions:
+        return MockOptions(duplicateRate=0.1)
+    
+    def setUp(self):
+        super().setUp()
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempDir.cleanup)
+    
+    def export(self, query: str, **kwargs):
+        file_name = str(Path(self.tempDir.name) / "export.csv")
+        job = PullExportJob(self.buildUrl(query, "100"), "csv", file_name, self.FIELDS, **kwargs)
+        ok, message = job.run()
+        rows = []
+        if Path(file_name).exists():
+            with open(file_name, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.reader(f))[1:]
+        return ok, message, rows
+    
+    def testMatchesTabDedupe(self):
+        ok, message, rows = self.export('mock_total="2500"')
+        self.assertTrue(ok, message)
+        
+        bean = TabDataBean(fields=list(self.FIELDS))
+        for page in PaginationEngine(self.buildUrl('mock_total="2500"', "100")).pages():
+            DataUtil.ingestPage(bean, page)
+        self.assertLess(len(bean.rows), 2500)
+        self.assertEqual(len(rows), len(bean.rows))
+        self.assertIn(f"共 {len(rows)} 条", message)
+    
+    def testLimit(self):
+        ok, message, rows = self.export('mock_total="2500"', limit=300)
+        self.assertTrue(ok, message)
+        self.assertLessEqual(len(rows), 300)
+
+
+class PullExportErrorTest(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        # 400不重试，翻页引擎在出错的页停止
+        return MockOptions(errorRate=0.3, errorStatus=400)
+    
+    def testStopsAtFailedPage(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        file_name = str(Path(temp_dir.name) / "export.csv")
+        job = PullExportJob(self.buildUrl('mock_total="5000"', "100"), "csv", file_name, self.FIELDS)
+        ok, message = job.run()
+        match = re.search(r"第(\d+)页", message)
+        self.assertIsNotNone(match, message)
+        page = int(match.group(1))
+        if page == 1:
+            self.assertFalse(ok)
+            self.assertFalse(Path(file_name).exists())
+        else:
+            self.assertTrue(ok)
+            self.assertIn("该页起的数据未导出", message)
+            self.assertIn(f"共 {(page - 1) * 100} 条", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+PaginationEngine测试（使用本地FOFA模拟服务）
+"""
+import time
+import unittest
+
+from benchmarks.mock_fofa import MockOptions
+from tests.mock_case import MockServerTestCase
+from utils.page_util import PaginationEngine
+
+
+class PaginationTest(MockServerTestCase):
+    
+    def collect(self, engine: PaginationEngine):
+        pages = list(engine.pages())
+        for page in pages:
+            self.assertFalse(page.error, page.error)
+        return pages
+    
+    def testCursorChain(self):
+        pages = self.collect(PaginationEngine(self.buildUrl('mock_total="1050"', "100")))
+        self.assertEqual([page.page for page in pages], list(range(1, 12)))
+        self.assertEqual([page.cursor for page in pages[1:]], [page.next for page in pages[:-1]])
+        self.assertTrue(all(page.hasMore for page in pages[:-1]))
+        self.assertFalse(pages[-1].hasMore)
+        hosts = [record[0] for page in pages for record in page.records]
+        self.assertEqual(len(hosts), 1050)
+        self.assertEqual(len(set(hosts)), 1050)
+        self.assertTrue(all(page.total == 1050 for page in pages))
+    
+    def testLimit(self):
+        engine = PaginationEngine(self.buildUrl('mock_total="1050"', "100"), limit=250)
+        pages = self.collect(engine)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(engine.fetched, 250)
+        self.assertEqual(len(pages[-1].records), 50)
+        self.assertFalse(pages[-1].hasMore)
+    
+    def testLimitSmallerThanPage(self):
+        pages = self.collect(PaginationEngine(self.buildUrl('mock_total="1050"', "1000"), limit=250))
+        self.assertEqual([len(page.records) for page in pages], [250])
+    
+    def testResumeFromCursor(self):
+        url = self.buildUrl('mock_total="500"', "100")
+        first = self.collect(PaginationEngine(url))
+        resumed = self.collect(PaginationEngine(url, cursor=first[2].cursor))
+        self.assertEqual([page.records for page in resumed], [page.records for page in first[2:]])
+
+
+class Shrink502Test(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        # 单页超过200条时返回502
+        return MockOptions(maxSize=200)
+    
+    def testShrinkPageSize(self):
+        engine = PaginationEngine(self.buildUrl('mock_total="1000"', "500"))
+        pages = list(engine.pages())
+        self.assertFalse(any(page.error for page in pages))
+        self.assertLessEqual(engine.pageSize, 200)
+        self.assertEqual(sum(len(page.records) for page in pages), 1000)
+        self.assertGreater(self.server.requests, len(pages))
+
+
+class RetryAfterTest(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        return MockOptions(errorRate=0.3, errorStatus=429, retryAfter=1)
+    
+    def testRetryAfter(self):
+        start = time.monotonic()
+        engine = PaginationEngine(self.buildUrl('mock_total="600"', "100"))
+        pages = list(engine.pages())
+        self.assertFalse(any(page.error for page in pages))
+        self.assertEqual(sum(len(page.records) for page in pages), 600)
+        # 每次429都按Retry-After暂停后重试同一页
+        self.assertGreater(self.server.errors, 0)
+        self.assertGreaterEqual(time.monotonic() - start, self.server.errors * 0.9)
+
+
+class PagesCleanupTest(MockServerTestCase):
+    
+    def assertStopped(self, engine: PaginationEngine):
+        engine._thread.join(3)
+        self.assertFalse(engine._thread.is_alive(), "翻页线程没有退出")
+    
+    def testConsumerRaises(self):
+        engine = PaginationEngine(self.buildUrl('mock_total="100000"', "100"), prefetch=2)
+        with self.assertRaises(RuntimeError):
+            for _ in engine.pages():
+                raise RuntimeError("写入失败")
+        self.assertTrue(engine.isCancelled())
+        self.assertStopped(engine)
+    
+    def testConsumerBreaks(self):
+        engine = PaginationEngine(self.buildUrl('mock_total="100000"', "100"), prefetch=2)
+        for page in engine.pages():
+            self.assertFalse(page.error)
+            break
+        self.assertStopped(engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+项目文件读写测试（列编码往返、损坏文件）
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+from models.result_store import ResultStore
+from models.table_bean import TabDataBean
+from utils.project_util import ProjectUtil
+
+
+def record(index: int) -> tuple:
+    """按ResultStore.RECORD_ATTRS的顺序生成行记录"""
+    ip = f"2001:db8::{index:x}" if index % 7 == 0 else f"10.0.{index // 256}.{index % 256}"
+    return (
+        f"host{index}.example.com", f"标题{index}" if index % 3 else "", ip, "", 80 + index % 3,
+        ["http", "https", "ssh"][index % 3], f"nginx/{index % 5}", "",
+        "2024-01-01 00:00:00", "", "", "", "", "", "",
+    )
+
+
+class ProjectRoundTripTest(unittest.TestCase):
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".fofa")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.bean = TabDataBean(fields=["host", "ip", "port"], count=25, total=25, page=3, next="cursor")
+        for index in range(25):
+            self.bean.rows.appendRecord(record(index), index + 1)
+        self.bean.rows.set(4, "certSans", "a.example.com,b.example.com")
+        self.bean.rows.set(5, "responseTime", 123)
+    
+    def save(self):
+        # 小块，覆盖多块和块内偏移
+        with mock.patch("utils.project_util.CHUNK_SIZE", 10):
+            self.assertEqual(ProjectUtil.save(self.path, [("q", self.bean)]), "")
+    
+    def testRoundTrip(self):
+        self.save()
+        tabs = ProjectUtil.open(self.path)
+        self.assertEqual(len(tabs), 1)
+        tab = tabs[0]
+        self.assertEqual((tab.title, tab.bean.page, tab.bean.next), ("q", 3, "cursor"))
+        self.assertEqual(tab.loader.loadNext(), 10)
+        self.assertEqual(tab.loader.loadAll(), 15)
+        loaded = tab.bean.rows
+        self.assertEqual(len(loaded), 25)
+        for name in ResultStore.COLUMNS:
+            for index in range(25):
+                self.assertEqual(loaded.get(index, name), self.bean.rows.get(index, name), (name, index))
+        self.assertEqual(len(tab.bean.dedupeIndex), 25)
+    
+    def testNoPythonSerialization(self):
+        self.save()
+        conn = sqlite3.connect(self.path)
+        try:
+            columns = dict(conn.execute("SELECT name, data FROM chunk_columns WHERE tab_id = 0 AND chunk = 1"))
+        finally:
+            conn.close()
+        self.assertEqual(len(zlib.decompress(columns["port"])), 10 * 8)
+        self.assertEqual(len(zlib.decompress(columns["protocol"])), 10 * 4)
+        self.assertTrue(zlib.decompress(columns["title"]).startswith(b'["'))
+        # 全部为空的字符串列不保存
+        self.assertNotIn("domain", columns)
+    
+    def testCorruptChunkStopsLoading(self):
+        self.save()
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute(
+                "UPDATE chunk_columns SET data = ? WHERE tab_id = 0 AND chunk = 1 AND name = 'port'",
+                (zlib.compress(b"\0" * 12),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        tab = ProjectUtil.open(self.path)[0]
+        self.assertEqual(tab.loader.loadAll(), 10)
+        self.assertFalse(tab.loader.hasMore())
+        # 损坏的块没有写入任何列
+        self.assertEqual(len(tab.bean.rows.columns["port"].values), 10)
+    
+    def testCorruptLookups(self):
+        self.save()
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("UPDATE tabs SET lookups = ?", (b"not zlib",))
+            conn.commit()
+        finally:
+            conn.close()
+        with self.assertRaisesRegex(ValueError, "项目文件已损坏"):
+            ProjectUtil.open(self.path)
+    
+    def testOldVersion(self):
+        self.save()
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("UPDATE meta SET value = '2' WHERE key = 'version'")
+            conn.commit()
+        finally:
+            conn.close()
+        with self.assertRaisesRegex(ValueError, "不支持的项目文件版本"):
+            ProjectUtil.open(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
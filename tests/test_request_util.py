@@ -0,0 +1,37 @@
+"""
+RequestUtil.getAPI重试测试（使用本地FOFA模拟服务）
+"""
+import unittest
+from unittest import mock
+
+from benchmarks.mock_fofa import MockOptions
+from tests.mock_case import MockServerTestCase
+from utils.request_util import RequestUtil
+
+
+class RetryExhaustedTest(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        return MockOptions(errorRate=1.0, errorStatus=500)
+    
+    def testReturnsLastResponse(self):
+        with mock.patch.object(RequestUtil, "API_RETRY_BACKOFF", 0):
+            result = RequestUtil.getInstance().getAPI(self.buildUrl('mock_total="100"', "10"))
+        # 重试次数用完后返回最后一次的响应
+        self.assertEqual(result["code"], "500")
+        self.assertEqual(self.server.requests, RequestUtil.API_RETRY_TOTAL + 1)
+
+
+class NoRetryTest(MockServerTestCase):
+    
+    def options(self) -> MockOptions:
+        return MockOptions(errorRate=1.0, errorStatus=502)
+    
+    def testBadGatewayNotRetried(self):
+        result = RequestUtil.getInstance().getAPI(self.buildUrl('mock_total="100"', "10"))
+        self.assertEqual(result["code"], "502")
+        self.assertEqual(self.server.requests, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+ShardPlanner测试
+"""
+import re
+import unittest
+from datetime import date, timedelta
+
+from models.table_bean import ShardBean, TabDataBean
+from tests.mock_case import MockServerTestCase
+from utils.data_util import DataUtil
+from utils.page_util import PaginationEngine
+from utils.shard_util import ShardPlanner, ShardRunner
+
+
+class WindowPlanner(ShardPlanner):
+    """不请求接口的规划器：只按时间拆分，超过30天的窗口都超过上限"""
+    
+    DIMENSIONS = []
+    
+    def probe(self, shard: ShardBean):
+        with self._lock:
+            self.probes += 1
+        if shard.window is None:
+            shard.total = self.cap + 1
+        elif shard.window[0] is None:
+            shard.total = 1
+        else:
+            shard.total = self.cap + 1 if (shard.window[1] - shard.window[0]).days > 30 else 1
+        return None
+
+
+class TimeWindowTest(unittest.TestCase):
+    
+    DATE_PATTERN = re.compile(r'(after|before)="(\d{4}-\d{2}-\d{2})"')
+    
+    def bounds(self, query: str):
+        values = {name: date.fromisoformat(value) for name, value in self.DATE_PATTERN.findall(query)}
+        return values.get("after"), values.get("before")
+    
+    def testWindowsCoverEveryDay(self):
+        planner = WindowPlanner("x", [], cap=100, maxProbes=100000)
+        shards = planner.plan()
+        self.assertFalse(any(shard.truncated for shard in shards))
+        windows = [self.bounds(shard.query) for shard in shards]
+        
+        day = date(2010, 1, 1)
+        tomorrow = date.today() + timedelta(days=1)
+        while day < tomorrow:
+            # after和before都不包含当天时（最严格的语义）每一天仍然至少落在一个分片中
+            covered = any(
+                (after is None or day > after) and day < before
+                for after, before in windows
+            )
+            self.assertTrue(covered, f"{day} 不在任何分片中")
+            day += timedelta(days=1)
+
+
+class MockShardTest(MockServerTestCase):
+    """对模拟服务规划并拉取分片，与不分片的结果比较"""
+    
+    def fetchAll(self, query: str) -> set:
+        bean = TabDataBean(fields=list(self.FIELDS))
+        for page in PaginationEngine(self.buildUrl(query, "1000", isAll=True)).pages():
+            self.assertFalse(page.error, page.error)
+            DataUtil.ingestPage(bean, page)
+        return set(bean.dedupeIndex)
+    
+    def fetchShards(self, planner: ShardPlanner, shards) -> set:
+        bean = TabDataBean(fields=list(self.FIELDS))
+        errors = []
+        
+        def on_page(shard, page):
+            if page.error:
+                errors.append(page.error)
+            else:
+                DataUtil.ingestPage(bean, page)
+        
+        ShardRunner(planner, shards).run(on_page)
+        self.assertEqual(errors, [])
+        return set(bean.dedupeIndex)
+    
+    def testDimensions(self):
+        query = 'mock_total="6000"'
+        planner = ShardPlanner(query, self.FIELDS, isAll=True, cap=800)
+        shards = planner.plan()
+        self.assertEqual(planner.total, 6000)
+        self.assertEqual(planner.errors, [])
+        self.assertGreater(len(shards), 1)
+        self.assertTrue(all(shard.total <= planner.cap and not shard.truncated for shard in shards))
+        # 枚举维度的分片互不重叠
+        self.assertEqual(sum(shard.total for shard in shards), 6000)
+        self.assertEqual(self.fetchShards(planner, shards), self.fetchAll(query))
+    
+    def testTimeWindows(self):
+        # 已限定全部枚举维度，只能按时间拆分（包括2015年之前的数据）
+        query = 'mock_total="20000" && country="CN" && protocol="http" && port="80"'
+        planner = ShardPlanner(query, self.FIELDS, isAll=True, cap=200)
+        shards = planner.plan()
+        self.assertTrue(all(shard.window is not None for shard in shards))
+        self.assertTrue(any(shard.window[0] is None and shard.total for shard in shards))
+        self.assertFalse(any(shard.truncated for shard in shards))
+        expected = self.fetchAll(query)
+        self.assertGreater(len(expected), planner.cap)
+        self.assertEqual(self.fetchShards(planner, shards), expected)
+    
+    def testProbeLimit(self):
+        planner = ShardPlanner('mock_total="6000"', self.FIELDS, isAll=True, cap=100, maxProbes=10)
+        shards = planner.plan()
+        self.assertLessEqual(planner.probes, 10)
+        self.assertTrue(all(shard.probeLimited for shard in shards if shard.truncated))
+        self.assertIn("探测次数达到上限", planner.describeTruncated(shards))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+TaskScheduler测试（任务结束状态和失败信号）
+"""
+import time
+import unittest
+
+from PySide6.QtCore import QCoreApplication
+
+from utils.task_scheduler import Task, TaskScheduler, TaskState
+
+
+class FuncTask(Task):
+    """在工作线程中调用函数"""
+    
+    def __init__(self, func):
+        super().__init__("test")
+        self.func = func
+    
+    def run(self):
+        self.func()
+
+
+class TaskSchedulerTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+    
+    def setUp(self):
+        self.scheduler = TaskScheduler(maxWorkers=2, shortWorkers=1)
+        self.failures = []
+        self.scheduler.failed.connect(lambda task, error: self.failures.append((task, error)))
+    
+    def tearDown(self):
+        self.scheduler.shutdown()
+    
+    def wait(self, task: Task):
+        """等待任务结束并处理排队的信号"""
+        deadline = time.monotonic() + 5
+        while task.isRunning() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.scheduler.pool.waitForDone(1000)
+        self.app.processEvents()
+    
+    def testFinished(self):
+        task = self.scheduler.submit(FuncTask(lambda: None))
+        self.wait(task)
+        self.assertEqual(task.state, TaskState.FINISHED)
+        self.assertEqual(task.error, "")
+        self.assertEqual(self.failures, [])
+    
+    def testFailed(self):
+        def fail():
+            raise RuntimeError("boom")
+        
+        task = self.scheduler.submit(FuncTask(fail))
+        self.wait(task)
+        self.assertEqual(task.state, TaskState.FAILED)
+        self.assertEqual(task.error, "boom")
+        self.assertFalse(task.isRunning())
+        self.assertEqual(self.failures, [(task, "boom")])
+    
+    def testFailedAfterCancel(self):
+        # 取消后仍抛出异常的任务记为失败，不掩盖错误
+        task = FuncTask(lambda: None)
+        
+        def fail():
+            task.cancel()
+            raise ValueError()
+        
+        task.func = fail
+        self.scheduler.submit(task)
+        self.wait(task)
+        self.assertEqual(task.state, TaskState.FAILED)
+        self.assertEqual(task.error, "ValueError")
+    
+    def testRunRequired(self):
+        class MissingRun(Task):
+            pass
+        
+        with self.assertRaises(TypeError):
+            MissingRun("test")
+
+
+if __name__ == '__main__':
+    unittest.main()
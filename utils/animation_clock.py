@@ -0,0 +1,143 @@
+"""
+全局动画时钟
+"""
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtWidgets import QWidget
+
+
+def smoothstep(t: float) -> float:
+    """缓动函数（两端平滑）"""
+    return t * t * (3.0 - 2.0 * t)
+
+
+class Animation:
+    """一个数值动画（按经过的时间插值，掉帧时不会拖慢动画）"""
+    
+    def __init__(self, widget: QWidget, start: float, end: float, duration: float,
+                 setter: Callable[[float], None], easing: Callable[[float], float] = smoothstep):
+        """
+        Args:
+            widget: 动画所属的组件（每帧统一重绘一次）
+            start: 起始值
+            end: 结束值
+            duration: 时长（秒）
+            setter: 设置当前值的函数
+            easing: 缓动函数
+        """
+        self.widget = widget
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.setter = setter
+        self.easing = easing
+        self.began = time.monotonic()
+    
+    def step(self, now: float) -> bool:
+        """
+        按当前时间更新数值
+        
+        Returns:
+            动画是否已结束
+        """
+        t = (now - self.began) / self.duration if self.duration > 0 else 1.0
+        if t >= 1.0:
+            self.setter(self.end)
+            return True
+        self.setter(self.start + (self.end - self.start) * self.easing(t))
+        return False
+
+
+class AnimationClock(QObject):
+    """
+    全局动画时钟
+    
+    所有组件的动画共用一个定时器：只在有动画时运行，每帧推进全部动画后
+    每个组件只重绘一次，没有动画时立即停止，空闲窗口不产生定时唤醒。
+    """
+    
+    _instance: Optional['AnimationClock'] = None
+    
+    # 帧间隔（毫秒）
+    FRAME_INTERVAL = 16
+    
+    def __init__(self):
+        super().__init__()
+        self._animations: Dict[Tuple[int, str], Animation] = {}
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self._tick)
+    
+    @classmethod
+    def getInstance(cls) -> 'AnimationClock':
+        """单例模式获取动画时钟（需在主线程调用）"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def animate(self, widget: QWidget, name: str, start: float, end: float, duration: float,
+                setter: Callable[[float], None], easing: Callable[[float], float] = smoothstep):
+        """
+        开始动画（同一组件的同名动画会被替换）
+        
+        Args:
+            widget: 动画所属的组件
+            name: 动画名称（如"glow"、"scale"）
+            start: 起始值（通常为当前值）
+            end: 结束值
+            duration: 时长（秒）
+            setter: 设置当前值的函数
+            easing: 缓动函数
+        """
+        key = (id(widget), name)
+        if start == end or not widget.isVisible():
+            # 不可见的组件直接跳到结束值，不占用时钟
+            self._animations.pop(key, None)
+            setter(end)
+            widget.update()
+            self._stopIfIdle()
+            return
+        self._animations[key] = Animation(widget, start, end, duration, setter, easing)
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def stop(self, widget: QWidget, name: Optional[str] = None):
+        """停止组件的动画（name为None时停止该组件的全部动画），数值停在当前位置"""
+        widget_id = id(widget)
+        for key in [key for key in self._animations if key[0] == widget_id and (name is None or key[1] == name)]:
+            del self._animations[key]
+        self._stopIfIdle()
+    
+    def isActive(self) -> bool:
+        """是否有正在进行的动画"""
+        return bool(self._animations)
+    
+    def _stopIfIdle(self):
+        if not self._animations and self._timer.isActive():
+            self._timer.stop()
+    
+    def _tick(self):
+        """推进一帧"""
+        now = time.monotonic()
+        dirty = {}
+        for key, animation in list(self._animations.items()):
+            try:
+                finished = animation.step(now)
+            except RuntimeError:
+                # 组件已销毁
+                del self._animations[key]
+                continue
+            dirty[id(animation.widget)] = animation.widget
+            if finished:
+                del self._animations[key]
+        
+        # 每个组件每帧只重绘一次
+        for widget in dirty.values():
+            try:
+                widget.update()
+            except RuntimeError:
+                pass
+        self._stopIfIdle()
@@ -0,0 +1,330 @@
+"""
+异步HTTP请求工具类
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+import random
+import threading
+from typing import AsyncIterator, Coroutine, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from main.config import ProxyConfig
+from utils.lazy_module import LazyModule
+from utils.request_util import RequestUtil
+
+# httpx在创建客户端时才导入；未安装时为None
+httpx = LazyModule.optional("httpx")
+
+# httpx的HTTP/2支持依赖h2
+HTTP2_AVAILABLE = httpx is not None and LazyModule.isAvailable("h2")
+
+
+class AsyncRequestUtil:
+    """
+    异步请求工具类
+    
+    所有请求在同一个事件循环线程中执行，按主机限制并发连接数，
+    连接保持复用（安装h2时使用HTTP/2）。其他线程通过submit/run提交协程。
+    
+    未安装httpx时退化为在有界线程池中执行RequestUtil的同步方法，
+    接口保持不变。
+    """
+    _instance: Optional['AsyncRequestUtil'] = None
+    _lock = threading.Lock()
+    
+    # 连接池上限
+    MAX_CONNECTIONS = 100
+    # 每个主机的并发上限
+    MAX_PER_HOST = 6
+    # 空闲连接保持时间（秒）
+    KEEPALIVE_EXPIRY = 30
+    
+    # 重试次数和退避基数（秒），与RequestUtil的重试策略一致
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF = 1
+    
+    def __init__(self, maxConnections: int = MAX_CONNECTIONS, maxPerHost: int = MAX_PER_HOST):
+        """
+        Args:
+            maxConnections: 连接池上限
+            maxPerHost: 每个主机的并发上限
+        """
+        self.maxConnections = maxConnections
+        self.maxPerHost = maxPerHost
+        self.request_util = RequestUtil.getInstance()
+        self.proxy_config = ProxyConfig.getInstance()
+        
+        self._client = None
+        self._clientProxy: Optional[str] = None
+        # 在事件循环线程中首次使用时创建（Python 3.9之前asyncio.Lock会绑定创建时线程的事件循环）
+        self._clientLock: Optional[asyncio.Lock] = None
+        # 主机 -> [并发信号量, 等待或进行中的请求数]，请求数归零时删除
+        self._hostLimits: Dict[str, List] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # 已提交到线程池、尚未完成的同步请求（关闭时取消未开始的请求）
+        self._pending: Set[concurrent.futures.Future] = set()
+        if httpx is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=maxConnections, thread_name_prefix="AsyncRequest"
+            )
+        
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._runLoop, name="AsyncRequestLoop", daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def getInstance(cls) -> 'AsyncRequestUtil':
+        """单例模式获取异步请求工具实例（首次调用时启动事件循环线程）"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    @classmethod
+    def shutdown(cls):
+        """关闭已创建的实例（程序退出时调用）"""
+        instance = cls._instance
+        if instance is not None:
+            instance.close()
+    
+    def _runLoop(self):
+        """事件循环线程"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        从任意线程提交协程到事件循环
+        
+        Args:
+            coro: 协程对象
+        
+        Returns:
+            concurrent.futures.Future，可调用cancel()取消
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro: Coroutine, timeout: Optional[float] = None):
+        """提交协程并阻塞等待结果（不能在事件循环线程中调用）"""
+        return self.submit(coro).result(timeout)
+    
+    def close(self):
+        """关闭连接池并停止事件循环"""
+        if not self.loop.is_running():
+            return
+        try:
+            self.run(self._closeClient(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._executor:
+            # shutdown的cancel_futures需要Python 3.9，逐个取消未开始的请求
+            for future in list(self._pending):
+                future.cancel()
+            self._executor.shutdown(wait=False)
+        with AsyncRequestUtil._lock:
+            if AsyncRequestUtil._instance is self:
+                AsyncRequestUtil._instance = None
+    
+    async def _closeClient(self):
+        """关闭httpx客户端"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+    
+    def _getProxyUrl(self) -> Optional[str]:
+        """获取代理地址"""
+        proxies = self.proxy_config.getProxyDict()
+        return proxies["https"] if proxies else None
+    
+    async def _getClient(self):
+        """获取httpx客户端（代理配置变化时关闭旧客户端并重建）"""
+        proxy = self._getProxyUrl()
+        if self._client is not None and proxy == self._clientProxy:
+            return self._client
+        
+        if self._clientLock is None:
+            self._clientLock = asyncio.Lock()
+        async with self._clientLock:
+            # 等待锁期间其他协程可能已经重建
+            if self._client is not None and proxy == self._clientProxy:
+                return self._client
+            await self._closeClient()
+            limits = httpx.Limits(
+                max_connections=self.maxConnections,
+                max_keepalive_connections=self.maxConnections,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY,
+            )
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                verify=False,  # 与RequestUtil一致，忽略SSL证书验证
+                limits=limits,
+                proxy=proxy,
+                follow_redirects=True,
+            )
+            self._clientProxy = proxy
+            return self._client
+    
+    @contextlib.asynccontextmanager
+    async def _hostLimit(self, url: str) -> AsyncIterator[None]:
+        """按主机限制并发（该主机没有等待或进行中的请求时删除其信号量）"""
+        host = urlparse(url).netloc.lower()
+        entry = self._hostLimits.get(host)
+        if entry is None:
+            entry = self._hostLimits[host] = [asyncio.Semaphore(self.maxPerHost), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._hostLimits[host]
+    
+    async def _fetch(self, url: str, timeout, maxSize: Optional[int] = None) -> Tuple[int, bytes, str]:
+        """
+        发起GET请求（按主机限流，429/5xx按指数退避重试）
+        
+        Args:
+            url: 请求URL
+            timeout: httpx.Timeout
+            maxSize: 响应内容大小上限，超过时抛出ValueError
+        
+        Returns:
+            (状态码, 响应内容, 编码)
+        """
+        client = await self._getClient()
+        headers = {"User-Agent": random.choice(RequestUtil.USER_AGENTS)}
+        
+        async with self._hostLimit(url):
+            attempt = 0
+            while True:
+                async with client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    if response.status_code not in RequestUtil.RETRY_STATUS or attempt >= self.RETRY_TOTAL:
+                        content = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            content += chunk
+                            if maxSize and len(content) > maxSize:
+                                raise ValueError("文件过大")
+                        return response.status_code, bytes(content), response.encoding or "utf-8"
+                await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                attempt += 1
+    
+    async def _runSync(self, func, *args):
+        """在线程池中执行同步请求（未安装httpx时使用）"""
+        async with self._hostLimit(args[0]):
+            future = self._executor.submit(func, *args)
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+            return await asyncio.wrap_future(future)
+    
+    async def getHTML(self, url: str, connectTimeout: int = 120000, readTimeout: int = 120000) -> Dict[str, str]:
+        """
+        异步发起HTTP请求获取响应内容
+        
+        Args:
+            url: 请求URL
+            connectTimeout: 连接超时时间（毫秒）
+            readTimeout: 读取超时时间（毫秒）
+        
+        Returns:
+            {"code": "200/error/其他状态码", "msg": "响应内容或错误信息"}
+        """
+        if httpx is None:
+            return await self._runSync(self.request_util.getHTML, url, connectTimeout, readTimeout)
+        
+        try:
+            timeout = httpx.Timeout(readTimeout / 1000, connect=connectTimeout / 1000)
+            status, content, encoding = await self._fetch(url, timeout)
+            return RequestUtil.buildResult(status, content.decode(encoding, errors='replace'))
+        except httpx.TimeoutException:
+            return {"code": "error", "msg": "请求超时"}
+        except Exception as e:
+            return {"code": "error", "msg": str(e)}
+    
+    async def getStatus(self, url: str, timeout: float = 5) -> Dict[str, str]:
+        """
+        异步检测网站存活（HEAD请求，不支持时改用GET只读取响应头；不跟随跳转、不重试）
+        
+        Args:
+            url: 网站URL
+            timeout: 连接和读取的超时时间（秒），不包括等待连接池的时间
+        
+        Returns:
+            {"code": "状态码/error", "msg": "错误信息"}
+        """
+        error = RequestUtil.checkUrl(url)
+        if error:
+            return {"code": "error", "msg": error}
+        if httpx is None:
+            return await self._runSync(self.request_util.getStatus, url, timeout)
+        
+        try:
+            client = await self._getClient()
+            options = dict(
+                headers={"User-Agent": random.choice(RequestUtil.USER_AGENTS)},
+                timeout=httpx.Timeout(timeout, pool=None),
+                follow_redirects=False,
+            )
+            async with self._hostLimit(url):
+                response = await client.head(url, **options)
+                if response.status_code in RequestUtil.HEAD_UNSUPPORTED:
+                    async with client.stream("GET", url, **options) as response:
+                        pass
+            return {"code": str(response.status_code), "msg": ""}
+        except httpx.TimeoutException:
+            return {"code": "error", "msg": RequestUtil.TIMEOUT_MESSAGE}
+        except Exception as e:
+            return {"code": "error", "msg": str(e) or type(e).__name__}
+    
+    async def getImageFavicon(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        异步提取网站favicon并计算hash
+        
+        Args:
+            url: favicon URL
+        
+        Returns:
+            {"code": "200/error", "msg": "icon_hash=\"xxx\"" 或错误信息}
+        """
+        error = RequestUtil.checkUrl(url)
+        if error:
+            return {"code": "error", "msg": error}
+        if httpx is None:
+            return await self._runSync(self.request_util.getImageFavicon, url)
+        
+        try:
+            status, content, _ = await self._fetch(url, httpx.Timeout(10), RequestUtil.MAX_FAVICON_SIZE)
+            if status != 200:
+                return {"code": "error", "msg": f"HTTP {status}"}
+            return self.request_util.buildFaviconResult(content)
+        except httpx.TimeoutException:
+            return {"code": "error", "msg": "请求超时"}
+        except Exception as e:
+            return {"code": "error", "msg": str(e)}
+    
+    async def getLinkIcon(self, url: str) -> Optional[str]:
+        """
+        异步从HTML中提取favicon链接
+        
+        Args:
+            url: 网页URL
+        
+        Returns:
+            favicon链接或None
+        """
+        if RequestUtil.checkUrl(url):
+            return None
+        if httpx is None:
+            return await self._runSync(self.request_util.getLinkIcon, url)
+        
+        try:
+            status, content, _ = await self._fetch(url, httpx.Timeout(10), RequestUtil.MAX_HTML_SIZE)
+            if status != 200:
+                return None
+            # HTML解析较慢，放到线程池中避免阻塞事件循环
+            html = content.decode('utf-8', errors='ignore')
+            return await self.loop.run_in_executor(None, RequestUtil.parseLinkIcon, html, url)
+        except Exception:
+            return None
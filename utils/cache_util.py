@@ -0,0 +1,210 @@
+"""
+FOFA查询结果磁盘缓存
+"""
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+from main.config import FofaConfig
+from utils.data_util import DataUtil
+
+
+class ResponseCache:
+    """
+    FOFA查询响应缓存（SQLite存储，按最近访问时间LRU淘汰）
+    
+    缓存键为规范化的(API地址, 查询语句, fields, full, size, next游标)，
+    不包含key，更换账号不影响命中。
+    """
+    _instance: Optional['ResponseCache'] = None
+    
+    # 淘汰后保留的容量比例
+    EVICT_RATIO = 0.9
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: 数据库路径，默认在项目目录的cache下
+        """
+        if path is None:
+            path = Path(__file__).parent.parent / "cache" / "fofa_cache.db"
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @classmethod
+    def getInstance(cls) -> 'ResponseCache':
+        """单例模式获取缓存实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库（首次使用时创建）"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+            self._conn.commit()
+        return self._conn
+    
+    @staticmethod
+    def canonicalKey(url: str) -> str:
+        """
+        计算查询URL的规范化缓存键
+        
+        Args:
+            url: 查询URL
+        
+        Returns:
+            缓存键（sha1）
+        """
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        
+        def first(name: str) -> str:
+            return params.get(name, [""])[0]
+        
+        query = DataUtil.decodeQuery(first("qbase64"))
+        if query is None:
+            query = first("qbase64")
+        
+        fields = ",".join(field.strip() for field in first("fields").split(",") if field.strip())
+        canonical = [
+            f"{parsed.scheme}://{parsed.netloc}{parsed.path}",
+            query.strip(),
+            fields,
+            first("full") == "true",
+            first("size"),
+            first("next"),
+        ]
+        return hashlib.sha1(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def isEnabled(self) -> bool:
+        """是否启用缓存"""
+        return FofaConfig.getInstance().cacheStatus
+    
+    def isOffline(self) -> bool:
+        """是否为离线回放模式（只读缓存，不发起请求）"""
+        return FofaConfig.getInstance().cacheOffline
+    
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        读取缓存
+        
+        Args:
+            url: 查询URL
+        
+        Returns:
+            响应内容（UTF-8字节），未命中或已过期时为None
+        """
+        if not self.isEnabled() and not self.isOffline():
+            return None
+        
+        config = FofaConfig.getInstance()
+        key = self.canonicalKey(url)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT body, created FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                
+                body, created = row
+                # 离线模式下忽略TTL
+                if not self.isOffline() and config.cacheTTL and now - created > config.cacheTTL * 60:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.commit()
+                    self.misses += 1
+                    return None
+                
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+                self.hits += 1
+            return zlib.decompress(body)
+        except (sqlite3.Error, zlib.error) as e:
+            print(f"读取缓存失败: {e}", file=sys.stderr)
+            return None
+    
+    def put(self, url: str, body):
+        """
+        写入缓存并按容量淘汰
+        
+        Args:
+            url: 查询URL
+            body: 响应内容（bytes或str）
+        """
+        if not self.isEnabled():
+            return
+        
+        key = self.canonicalKey(url)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        body = zlib.compress(body)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, body, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, body, len(body), now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"写入缓存失败: {e}", file=sys.stderr)
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """超过容量上限时按最近访问时间淘汰"""
+        max_bytes = FofaConfig.getInstance().cacheMaxSize * 1024 * 1024
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= max_bytes:
+            return
+        
+        target = total - int(max_bytes * self.EVICT_RATIO)
+        freed = 0
+        expired = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            expired.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", expired)
+    
+    def clear(self):
+        """清空缓存"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+                conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            print(f"清空缓存失败: {e}", file=sys.stderr)
+    
+    def stats(self) -> dict:
+        """获取缓存统计（条数、占用字节、命中次数）"""
+        try:
+            with self._lock:
+                count, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        except sqlite3.Error:
+            count, size = 0, 0
+        return {"count": count, "size": size, "hits": self.hits, "misses": self.misses}
@@ -1,16 +1,25 @@
 """
 数据处理工具类
 """
+import base64
+import binascii
 import json
 import re
-from typing import List, Dict, Set, Optional
+import sys
+from dataclasses import fields as dataclass_fields
+import threading
+from collections import Counter
+from typing import List, Dict, Set, Optional, Iterable, Iterator, Callable, Tuple
 from pathlib import Path
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
 
 from main.config import FofaConfig, ProxyConfig
-from models.table_bean import TableBean, ExcelBean, TabDataBean
+from models.table_bean import ExcelBean, TabDataBean, PageBean
+from models.result_store import ResultRow
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class DataUtil:
@@ -20,6 +29,15 @@ class DataUtil:
     PORT_PATTERN_443 = re.compile(r":443$")
     PORT_PATTERN_80 = re.compile(r":80$")
     
+    # 导出进度回调间隔（行）
+    PROGRESS_STEP = 500
+    
+    # 紧凑行记录的字段顺序（前8个为基础字段，其余为可选的额外字段）
+    RECORD_FIELDS = (
+        "host", "title", "ip", "domain", "port", "protocol", "server", "link",
+        "lastupdatetime", "fid", "os", "icp", "product", "certs_subject_cn", "certs_subject_org"
+    )
+    
     @staticmethod
     def getValueFromIP(ip: str) -> float:
         """
@@ -27,7 +45,7 @@ class DataUtil:
         
         Args:
             ip: IP地址
-            
+        
         Returns:
             浮点数值
         """
@@ -49,7 +67,7 @@ class DataUtil:
         
         Args:
             tabTitle: Tab标题
-            
+        
         Returns:
             处理后的查询字符串
         """
@@ -58,6 +76,77 @@ class DataUtil:
             return f"({tabTitle}) && (is_honeypot=false && is_fraud=false)"
         return tabTitle
     
+    @staticmethod
+    def loadsJson(data):
+        """
+        解析JSON（安装orjson时直接解析字节，省去解码和复制）
+        
+        Args:
+            data: 响应内容（bytes或str）
+        
+        Raises:
+            ValueError: 不是合法的JSON
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    @staticmethod
+    def decodeQuery(qbase64: str) -> Optional[str]:
+        """
+        解码URL中的qbase64参数
+        
+        查询URL中的qbase64未转义，parse_qs会把其中的+解析为空格，解码前先还原。
+        
+        Args:
+            qbase64: parse_qs解析出的qbase64参数
+        
+        Returns:
+            查询语句，无法解码时为None
+        """
+        try:
+            return base64.b64decode(qbase64.replace(" ", "+"), validate=True).decode('utf-8')
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+    
+    @staticmethod
+    def parseResults(results: List[list], fieldNames: List[str]) -> List[tuple]:
+        """
+        将API返回的results解析为紧凑行记录（在翻页线程中调用）
+        
+        Args:
+            results: API返回的results数组
+            fieldNames: 请求的fields参数（与results的列顺序一致）
+        
+        Returns:
+            行记录列表，字段顺序见RECORD_FIELDS；非标准端口的http/https已过滤
+        """
+        positions = {name: i for i, name in enumerate(fieldNames)}
+        # 未请求的字段位置为-1，取空字符串
+        indexes = [positions.get(name, -1) for name in DataUtil.RECORD_FIELDS]
+        records = []
+        
+        for result_item in results:
+            size = len(result_item)
+            if size < 8:
+                continue
+            values = [(result_item[i] or "") if 0 <= i < size else "" for i in indexes]
+            
+            try:
+                port = int(values[4]) if values[4] else 0
+            except (ValueError, TypeError):
+                port = 0
+            values[4] = port
+            
+            # 过滤非标准端口的http/https
+            if port not in (443, 80) and values[5] in ("http", "https"):
+                if not values[0].endswith(f":{port}"):
+                    continue
+            
+            records.append(tuple(values))
+        
+        return records
+    
     @staticmethod
     def loadJsonData(
         bean: Optional[TabDataBean],
@@ -75,222 +164,447 @@ class DataUtil:
             excelData: Excel数据列表（导出时使用）
             urlList: URL列表（导出时使用）
             isExport: 是否为导出模式
-            
+        
+        Returns:
+            表格模式为新增行在Tab数据存储中的行号（range），导出模式见loadRecords
+        
+        Raises:
+            ValueError: 表格模式没有传入Tab数据Bean
+        """
+        # 额外字段以Tab查询时的选择为准（翻页期间全局配置可能已被新查询修改）
+        config = FofaConfig.getInstance()
+        fields = bean.fields if bean is not None else config.additionalField
+        records = DataUtil.parseResults(obj.get("results", []), config.fields + fields)
+        return DataUtil.loadRecords(bean, records, excelData, urlList, isExport)
+    
+    @staticmethod
+    def loadRecords(
+        bean: Optional[TabDataBean],
+        records: List[tuple],
+        excelData: Optional[List[ExcelBean]],
+        urlList: Optional[Set[str]],
+        isExport: bool = False
+    ) -> List:
+        """
+        加载parseResults解析出的行记录（去重并生成数据行）
+        
+        Args:
+            bean: Tab数据Bean
+            records: 行记录列表
+            excelData: Excel数据列表（导出时使用）
+            urlList: URL列表（导出时使用）
+            isExport: 是否为导出模式
+        
         Returns:
-            数据列表
+            表格模式为新增行的行号；导出模式为本应替换已写出的数据、因无法替换而丢弃的新数据
+            （已写出的数据在去重索引中标记written，见DedupeWindow），通常为空列表
+        
+        Raises:
+            ValueError: 表格模式没有传入Tab数据Bean
         """
-        results = obj.get("results", [])
-        if not results:
+        if not isExport and bean is None:
+            # 表格模式的数据行保存在Tab的列式存储中
+            raise ValueError("表格模式需要传入Tab数据Bean")
+        if not records:
             return []
+        if not isExport:
+            return DataUtil._loadIntoStore(bean, records)
         
-        config = FofaConfig.getInstance()
-        fields = config.additionalField
-        list_data = []
+        # 去重索引：有Tab数据时跨页保留，否则仅在本次调用内有效
+        if bean is not None:
+            dedupe_index = bean.dedupeIndex
+        else:
+            dedupe_index = {}
+            for existing in excelData or []:
+                dedupe_index[DataUtil.dedupeKey(existing.ip, existing.port, existing.host)] = existing
         
-        for index, result_item in enumerate(results):
-            if len(result_item) < 8:
-                continue
-            
-            host = result_item[0] or ""
-            title = result_item[1] or ""
-            ip = result_item[2] or ""
-            domain = result_item[3] or ""
-            try:
-                port = int(result_item[4]) if result_item[4] else 0
-            except (ValueError, TypeError):
-                port = 0
-            protocol = result_item[5] or ""
+        late = []
+        for (host, title, ip, domain, port, protocol, server, link, lastupdatetime,
+             fid, os_name, icp, product, cert_cn, cert_org) in records:
+            data = ExcelBean(
+                host=host, title=title, ip=ip, domain=domain,
+                port=port, protocol=protocol, server=server
+            )
+            data.lastupdatetime = lastupdatetime
+            data.fid = fid
+            data.os = os_name
+            data.product = product
+            data.icp = icp
+            data.certs_subject_cn = cert_cn
+            data.certs_subject_org = cert_org
             
-            # 过滤非标准端口的http/https
-            if port not in [443, 80] and protocol in ["http", "https"]:
-                if not host.endswith(f":{port}"):
-                    continue
-            
-            server = result_item[6] or ""
-            link = result_item[7] or ""
-            
-            # 获取额外字段
-            extra_fields = {
-                "fid": "", "os": "", "icp": "", "product": "",
-                "certs_subject_cn": "", "certs_subject_org": "", "lastupdatetime": ""
-            }
-            
-            for i, field_name in enumerate(fields):
-                if 8 + i < len(result_item):
-                    if field_name in extra_fields:
-                        extra_fields[field_name] = result_item[8 + i] or ""
+            # 去重处理（哈希索引，替换时原地更新）
+            kept = DataUtil._dedupe(dedupe_index, data, late)
+            if kept is None:
+                continue
             
-            if isExport:
-                # 导出模式
-                data = ExcelBean(
-                    host=host, title=title, ip=ip, domain=domain,
-                    port=port, protocol=protocol, server=server
-                )
-                data.lastupdatetime = extra_fields["lastupdatetime"]
-                data.fid = extra_fields["fid"]
-                data.os = extra_fields["os"]
-                data.product = extra_fields["product"]
-                data.icp = extra_fields["icp"]
-                data.certs_subject_cn = extra_fields["certs_subject_cn"]
-                data.certs_subject_org = extra_fields["certs_subject_org"]
-                
-                # 去重处理（修复逻辑错误）
-                if data in excelData:
-                    try:
-                        existing = excelData[excelData.index(data)]
-                        if port in [443, 80]:
-                            if ":443" in existing.host or ":80" in existing.host:
-                                excelData.remove(existing)
-                            elif ":443" in data.host or ":80" in data.host:
-                                continue
-                        if existing.host == data.host:
-                            if existing.title:
-                                continue
-                            else:
-                                excelData.remove(existing)
-                    except (ValueError, IndexError):
-                        # 如果找不到或已删除，继续添加
-                        pass
-                
+            if link:
+                urlList.add(link)
+            if kept is data:
                 excelData.append(data)
-                if link:
-                    urlList.add(link)
-            else:
-                # 表格显示模式
-                data = TableBean(
-                    num=0, host=host, title=title, ip=ip, domain=domain,
-                    port=port, protocol=protocol, server=server
-                )
-                data.fid = extra_fields["fid"]
-                data.icp = extra_fields["icp"]
-                data.os = extra_fields["os"]
-                data.certCN = extra_fields["certs_subject_cn"]
-                data.product = extra_fields["product"]
-                data.certOrg = extra_fields["certs_subject_org"]
-                data.lastupdatetime = extra_fields["lastupdatetime"]
-                
-                # 去重处理（修复逻辑错误）
-                if data in list_data:
-                    try:
-                        existing = list_data[list_data.index(data)]
-                        if port in [443, 80]:
-                            if ":443" in existing.host or ":80" in existing.host:
-                                data.num = existing.num
-                                list_data.remove(existing)
-                            elif ":443" in data.host or ":80" in data.host:
-                                continue
-                        if existing.host == data.host:
-                            if existing.title:
-                                continue
-                            else:
-                                data.num = existing.num
-                                list_data.remove(existing)
-                    except (ValueError, IndexError):
-                        # 如果找不到或已删除，继续添加
-                        pass
-                
-                if bean and data.num == 0:
-                    bean.count += 1
-                    data.num = bean.count
-                
-                if link and bean:
-                    bean.dataList.add(link)
+        
+        return late
+    
+    @staticmethod
+    def _loadIntoStore(bean: TabDataBean, records: List[tuple]) -> range:
+        """
+        将行记录去重后追加到Tab的列式存储（去重索引保存行号）
+        
+        Returns:
+            新增行的行号
+        """
+        store = bean.rows
+        index = bean.dedupeIndex
+        
+        # 多个线程（如分片查询）可能同时写入同一个Tab
+        with store.lock:
+            start = len(store)
+            for record in records:
+                host = record[0]
+                port = record[4]
+                key = DataUtil.dedupeKey(record[2], port, host)
+                existing = index.get(key)
+                if existing is not None:
+                    action = DataUtil._dedupeAction(
+                        store.get(existing, "host"), store.get(existing, "title"), host, port
+                    )
+                    if action == DataUtil._DROP:
+                        continue
+                    if action == DataUtil._REPLACE:
+                        # 原地替换，保留序号和查询后补充的字段
+                        store.replaceRecord(existing, record)
+                        continue
                 
-                list_data.append(data)
+                bean.count += 1
+                index[key] = store.appendRecord(record, bean.count)
+            
+            return range(start, len(store))
+    
+    @staticmethod
+    def ingestPage(bean: TabDataBean, page: PageBean) -> PageBean:
+        """
+        将一页结果写入Tab数据（在查询线程中调用，界面只接收新增行数）
+        
+        Args:
+            bean: Tab数据Bean
+            page: 翻页结果
+        
+        Returns:
+            同一个PageBean，records已清空，added为新增行数
+        """
+        if not page.error:
+            page.added = len(DataUtil.loadRecords(bean, page.records, None, None, False))
+        page.records = []
+        return page
+    
+    @staticmethod
+    def dedupeKey(ip: str, port: int, host: str) -> tuple:
+        """
+        计算去重键（ip, port, 去掉协议头和默认端口的host）
+        
+        Args:
+            ip: IP地址
+            port: 端口
+            host: HOST
+        
+        Returns:
+            去重键
+        """
+        if host.startswith("https://"):
+            host = host[8:]
+        elif host.startswith("http://"):
+            host = host[7:]
+        if port == 443 and host.endswith(":443"):
+            host = host[:-4]
+        elif port == 80 and host.endswith(":80"):
+            host = host[:-3]
+        return (ip, port, host)
+    
+    # 去重结果：新增、丢弃新数据、替换已有数据
+    _ADD, _DROP, _REPLACE = range(3)
+    
+    @staticmethod
+    def _dedupeAction(existingHost: str, existingTitle: str, host: str, port: int) -> int:
+        """
+        判断去重键相同的两条数据如何处理
+        
+        规则与原有逻辑一致：
+        - host完全相同时保留有标题的一条
+        - 80/443端口下，优先保留host不带:80/:443的一条
+        - 其他情况为同一资产的不同写法，两条都保留
+        """
+        if existingHost == host:
+            return DataUtil._DROP if existingTitle else DataUtil._REPLACE
+        
+        if port in [443, 80]:
+            if ":443" in existingHost or ":80" in existingHost:
+                return DataUtil._REPLACE
+            elif ":443" in host or ":80" in host:
+                return DataUtil._DROP
+        
+        return DataUtil._ADD
+    
+    @staticmethod
+    def _dedupe(index: Dict, data, late: Optional[list] = None):
+        """
+        基于哈希索引去重（导出数据）
+        
+        Args:
+            index: 去重索引 {去重键: 数据}
+            data: 新数据
+            late: 已有数据标记为written（已写出文件）时无法替换，本应替换的新数据追加到这里
+        
+        Returns:
+            None表示丢弃新数据；返回data表示新增；返回已有数据表示已被原地替换
+        """
+        key = DataUtil.dedupeKey(data.ip, data.port, data.host)
+        existing = index.get(key)
+        if existing is not None:
+            action = DataUtil._dedupeAction(existing.host, existing.title, data.host, data.port)
+            if action == DataUtil._DROP:
+                return None
+            if action == DataUtil._REPLACE:
+                if getattr(existing, "written", False):
+                    if late is not None:
+                        late.append(data)
+                    return None
+                for f in dataclass_fields(data):
+                    setattr(existing, f.name, getattr(data, f.name))
+                return existing
+        
+        index[key] = data
+        return data
+    
+    @staticmethod
+    def getUrl(host: str, protocol: str, port: int = 0) -> str:
+        """
+        根据host和协议拼接URL
+        
+        Args:
+            host: HOST
+            protocol: 协议
+            port: 端口
+        
+        Returns:
+            URL
+        """
+        if host.startswith("http"):
+            return host
+        if protocol.lower() == "https" or port == 443:
+            return f"https://{host}"
+        return f"http://{host}"
+    
+    @staticmethod
+    def groupCount(rows: Iterable[ResultRow], attr: str) -> List[Tuple[str, int]]:
+        """
+        按字段值分组计数（忽略空值）
+        
+        Args:
+            rows: 数据行
+            attr: 字段名
         
-        return list_data
+        Returns:
+            [(字段值, 数量)]，按数量降序
+        """
+        return Counter(getattr(data, attr) for data in rows if getattr(data, attr)).most_common()
+    
+    @staticmethod
+    def toExcelBean(data: ResultRow) -> ExcelBean:
+        """将表格数据转换为导出数据（保留全部额外字段）"""
+        return ExcelBean(
+            host=data.host, title=data.title, domain=data.domain, ip=data.ip,
+            port=data.port, protocol=data.protocol, server=data.server,
+            lastupdatetime=data.lastupdatetime, fid=data.fid, os=data.os,
+            icp=data.icp, product=data.product,
+            certs_subject_org=data.certOrg, certs_subject_cn=data.certCN,
+            icon_hash=data.iconHash, cert_serial=data.certSerial, cert_sans=data.certSans,
+            status=data.status, response_time=data.responseTime
+        )
+    
+    @staticmethod
+    def iterExcelBeans(rows: Iterable[ResultRow]) -> Iterator[ExcelBean]:
+        """逐行生成导出数据"""
+        for data in rows:
+            yield DataUtil.toExcelBean(data)
+    
+    @staticmethod
+    def iterUrls(rows: Iterable[ResultRow]) -> Iterator[str]:
+        """逐行生成URL（优先使用FOFA返回的link）"""
+        for data in rows:
+            yield data.link or DataUtil.getUrl(data.host, data.protocol, data.port)
+    
+    @staticmethod
+    def exportToTxt(
+        fileName: str,
+        urls: Iterable[str],
+        progress: Optional[Callable[[int], None]] = None,
+        cancelEvent: Optional[threading.Event] = None
+    ):
+        """
+        导出URL到TXT（逐行写入）
+        
+        Args:
+            fileName: 文件名
+            urls: URL（可以是迭代器）
+            progress: 进度回调，参数为已写入行数
+            cancelEvent: 取消事件，置位后停止导出并删除未完成的文件
+        """
+        count = 0
+        try:
+            with open(fileName, 'w', encoding='utf-8') as f:
+                for url in urls:
+                    if cancelEvent and cancelEvent.is_set():
+                        break
+                    f.write(url + '\n')
+                    count += 1
+                    if progress and count % DataUtil.PROGRESS_STEP == 0:
+                        progress(count)
+            
+            if cancelEvent and cancelEvent.is_set():
+                Path(fileName).unlink(missing_ok=True)
+                return False, "导出已取消"
+            if progress:
+                progress(count)
+            return True, f"导出成功！文件保存在 {fileName}"
+        except Exception as e:
+            return False, f"导出失败：{str(e)}"
+    
+    @staticmethod
+    def getExcelHeaders(additionalField: Optional[List[str]] = None) -> List[str]:
+        """
+        获取Excel表头
+        
+        Args:
+            additionalField: 额外字段，默认使用当前配置
+        
+        Returns:
+            表头列表
+        """
+        if additionalField is None:
+            additionalField = FofaConfig.getInstance().additionalField
+        
+        headers = ["HOST", "标题", "域名", "IP", "端口", "协议", "server指纹"]
+        if "lastupdatetime" in additionalField:
+            headers.append("最近更新时间")
+        if "os" in additionalField:
+            headers.append("操作系统")
+        if "icp" in additionalField:
+            headers.append("ICP")
+        if "product" in additionalField:
+            headers.append("产品指纹")
+        if "fid" in additionalField:
+            headers.append("fid")
+        if "certs_subject_cn" in additionalField:
+            headers.append("证书域名")
+        if "certs_subject_org" in additionalField:
+            headers.append("证书持有者组织")
+        if "icon_hash" in additionalField:
+            headers.append("icon_hash")
+        if "cert_serial" in additionalField:
+            headers.append("证书序列号")
+        if "cert_sans" in additionalField:
+            headers.append("证书SAN")
+        if "status" in additionalField:
+            headers.append("状态码")
+        if "response_time" in additionalField:
+            headers.append("响应时间(ms)")
+        return headers
+    
+    @staticmethod
+    def getExcelRow(data: ExcelBean, additionalField: List[str]) -> List:
+        """
+        获取一行Excel数据（与getExcelHeaders的列顺序一致）
+        
+        Args:
+            data: Excel数据Bean
+            additionalField: 额外字段
+        
+        Returns:
+            行数据
+        """
+        row = [
+            data.host, data.title, data.domain, data.ip, data.port,
+            data.protocol, data.server
+        ]
+        if "lastupdatetime" in additionalField:
+            row.append(data.lastupdatetime)
+        if "os" in additionalField:
+            row.append(data.os)
+        if "icp" in additionalField:
+            row.append(data.icp)
+        if "product" in additionalField:
+            row.append(data.product)
+        if "fid" in additionalField:
+            row.append(data.fid)
+        if "certs_subject_cn" in additionalField:
+            row.append(data.certs_subject_cn)
+        if "certs_subject_org" in additionalField:
+            row.append(data.certs_subject_org)
+        if "icon_hash" in additionalField:
+            row.append(data.icon_hash)
+        if "cert_serial" in additionalField:
+            row.append(data.cert_serial)
+        if "cert_sans" in additionalField:
+            row.append(data.cert_sans)
+        if "status" in additionalField:
+            row.append(data.status)
+        if "response_time" in additionalField:
+            row.append(data.response_time or "")
+        return row
     
     @staticmethod
     def exportToExcel(
         fileName: str,
         tabTitle: str,
-        totalData: List[ExcelBean],
-        urls: List[List[str]],
-        errorPage: str
+        totalData: Iterable[ExcelBean],
+        urls: Iterable[List[str]],
+        errorPage: str,
+        additionalField: Optional[List[str]] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        cancelEvent: Optional[threading.Event] = None
     ):
         """
-        导出数据到Excel
+        导出数据到Excel（只写模式流式写入，内存占用与行数无关）
         
         Args:
             fileName: 文件名
             tabTitle: Tab标题
-            totalData: 总数据列表
-            urls: URL列表
+            totalData: 总数据（可以是迭代器）
+            urls: URL列表（可以是迭代器）
             errorPage: 错误页面信息
+            additionalField: 额外字段，默认使用当前配置
+            progress: 进度回调，参数为已写入行数
+            cancelEvent: 取消事件，置位后停止导出（不生成文件）
         """
+        from utils.export_util import ExcelStreamWriter
+        
+        if additionalField is None:
+            additionalField = FofaConfig.getInstance().additionalField
+        
+        writer = None
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "查询结果"
-            
-            # 设置表头
-            headers = ["HOST", "标题", "域名", "IP", "端口", "协议", "server指纹"]
-            config = FofaConfig.getInstance()
-            
-            if "lastupdatetime" in config.additionalField:
-                headers.append("最近更新时间")
-            if "os" in config.additionalField:
-                headers.append("操作系统")
-            if "icp" in config.additionalField:
-                headers.append("ICP")
-            if "product" in config.additionalField:
-                headers.append("产品指纹")
-            if "fid" in config.additionalField:
-                headers.append("fid")
-            if "certs_subject_cn" in config.additionalField:
-                headers.append("证书域名")
-            if "certs_subject_org" in config.additionalField:
-                headers.append("证书持有者组织")
-            
-            # 写入表头
-            ws.append(headers)
-            
-            # 设置表头样式
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, size=14, color="FFFFFF")
-            
-            for col in range(1, len(headers) + 1):
-                cell = ws.cell(row=1, column=col)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+            writer = ExcelStreamWriter(fileName, DataUtil.getExcelHeaders(additionalField))
             
             # 写入数据
             for data in totalData:
-                row = [
-                    data.host, data.title, data.domain, data.ip, data.port,
-                    data.protocol, data.server
-                ]
-                if "lastupdatetime" in config.additionalField:
-                    row.append(data.lastupdatetime)
-                if "os" in config.additionalField:
-                    row.append(data.os)
-                if "icp" in config.additionalField:
-                    row.append(data.icp)
-                if "product" in config.additionalField:
-                    row.append(data.product)
-                if "fid" in config.additionalField:
-                    row.append(data.fid)
-                if "certs_subject_cn" in config.additionalField:
-                    row.append(data.certs_subject_cn)
-                if "certs_subject_org" in config.additionalField:
-                    row.append(data.certs_subject_org)
-                ws.append(row)
-            
-            # 设置列宽
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['B'].width = 38
-            ws.column_dimensions['C'].width = 20
-            ws.column_dimensions['D'].width = 15
+                if cancelEvent and cancelEvent.is_set():
+                    writer.close(save=False)
+                    return False, "导出已取消"
+                writer.writeRow(DataUtil.getExcelRow(data, additionalField))
+                if progress and writer.rowCount % DataUtil.PROGRESS_STEP == 0:
+                    progress(writer.rowCount)
             
-            # 创建URLs工作表
-            ws2 = wb.create_sheet("urls")
+            # 写入URLs工作表
             for url in urls:
-                ws2.append(url)
-            ws2.column_dimensions['A'].width = 40
+                if cancelEvent and cancelEvent.is_set():
+                    writer.close(save=False)
+                    return False, "导出已取消"
+                writer.writeUrl(url)
             
             # 保存文件
-            wb.save(fileName)
+            writer.close()
+            if progress:
+                progress(writer.rowCount)
             
             message = f"导出成功！文件保存在 {fileName}"
             if errorPage:
@@ -337,8 +651,30 @@ class DataUtil:
                             config.API = value
                         elif key == 'key':
                             config.setKey(value)
+                        elif key == 'key_pool' or key == 'keyPool':
+                            config.setKeyPool(value)
                         elif key == 'max_size' or key == 'maxSize':
                             config.setSize(value)
+                        elif key == 'fetch_limit' or key == 'fetchLimit':
+                            config.setFetchLimit(value)
+                        elif key == 'api_rate' or key == 'apiRate':
+                            config.setApiRate(value)
+                        elif key == 'api_burst' or key == 'apiBurst':
+                            config.setApiBurst(value)
+                        elif key == 'shard_budget' or key == 'shardBudget':
+                            config.setShardBudget(value)
+                        elif key == 'enrich_concurrency' or key == 'enrichConcurrency':
+                            config.setEnrichConcurrency(value)
+                        elif key == 'cache_status' or key == 'cacheStatus':
+                            config.cacheStatus = value.lower() == 'on'
+                        elif key == 'cache_ttl' or key == 'cacheTTL':
+                            config.setCacheTTL(value)
+                        elif key == 'cache_max_size' or key == 'cacheMaxSize':
+                            config.setCacheMaxSize(value)
+                        elif key == 'cache_offline' or key == 'cacheOffline':
+                            config.cacheOffline = value.lower() == 'on'
+                        elif key == 'warehouse_status' or key == 'warehouseStatus':
+                            config.warehouseStatus = value.lower() == 'on'
                         elif key == 'check_status' or key == 'checkStatus':
                             config.checkStatus = value.lower() == 'on'
                         elif key == 'proxy_status' or key == 'proxyStatus':
@@ -353,11 +689,11 @@ class DataUtil:
                             proxyConfig.proxy_user = value
                         elif key == 'proxy_password' or key == 'proxyPassword':
                             proxyConfig.proxy_password = value
-            
+        
         except FileNotFoundError:
-            print(f"配置文件不存在: {config_path}")
+            print(f"配置文件不存在: {config_path}", file=sys.stderr)
         except Exception as e:
-            print(f"加载配置失败: {e}")
+            print(f"加载配置失败: {e}", file=sys.stderr)
         
         return config
 
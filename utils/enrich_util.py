@@ -0,0 +1,363 @@
+"""
+批量补充数据工具类（favicon hash、证书等）
+"""
+import asyncio
+import concurrent.futures
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from main.config import FofaConfig
+from models.table_bean import CertBean
+from models.result_store import ResultRow
+from utils.async_request_util import AsyncRequestUtil
+from utils.data_util import DataUtil
+from utils.request_util import RequestUtil
+
+
+class BatchJob(ABC):
+    """
+    批量补充数据任务基类
+    
+    数据行按目标（URL、host:port等）归并，每个目标只处理一次；
+    全部目标在异步请求工具的事件循环中并发执行，并发数不超过concurrency。
+    子类实现targetOf、process和applyResult。
+    streaming为True时每个结果到达即写入数据行，界面在进度回调中刷新即可看到。
+    """
+    
+    # 结果是否在到达时立即写入数据行
+    streaming = False
+    
+    # 网站协议（其他协议的服务没有网页，不发起http请求）
+    WEB_PROTOCOLS = ("http", "https")
+    
+    def __init__(self, rows: Iterable[ResultRow], concurrency: int = 50):
+        """
+        Args:
+            rows: 需要处理的数据行
+            concurrency: 并发上限
+        """
+        self.targets: Dict[Hashable, List[ResultRow]] = {}
+        for data in rows:
+            target = self.targetOf(data)
+            if target is not None:
+                self.targets.setdefault(target, []).append(data)
+        self.concurrency = max(1, concurrency)
+        self.results: Dict[Hashable, object] = {}
+        self.client = AsyncRequestUtil.getInstance()
+        self._future: Optional[concurrent.futures.Future] = None
+        self._cancelled = False
+    
+    @abstractmethod
+    def targetOf(self, data: ResultRow) -> Optional[Hashable]:
+        """数据行对应的目标，不需要处理时返回None"""
+    
+    @abstractmethod
+    async def process(self, target: Hashable):
+        """处理单个目标，失败时返回None"""
+    
+    @abstractmethod
+    def applyResult(self, data: ResultRow, result):
+        """将单个目标的结果写入数据行"""
+    
+    @classmethod
+    def webUrlOf(cls, data: ResultRow) -> Optional[str]:
+        """
+        数据行的http(s)网站URL
+        
+        Args:
+            data: 数据行
+        
+        Returns:
+            URL，没有host或不是http(s)服务（ssh、mysql等）时为None；
+            未请求protocol字段时按host拼接
+        """
+        if not data.host:
+            return None
+        if data.link:
+            return data.link if data.link.startswith(("http://", "https://")) else None
+        protocol = data.protocol.lower()
+        if protocol and protocol not in cls.WEB_PROTOCOLS:
+            return None
+        return DataUtil.getUrl(data.host, protocol, data.port)
+    
+    def cancel(self):
+        """取消（已完成的结果保留）"""
+        self._cancelled = True
+        if self._future:
+            self._future.cancel()
+    
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        执行任务（阻塞直到全部完成或取消）
+        
+        Args:
+            progress: 进度回调，参数为(已完成目标数, 目标总数)
+        
+        Returns:
+            {目标: 结果}，失败的目标不在结果中
+        """
+        if self._cancelled or not self.targets:
+            return self.results
+        self._future = self.client.submit(self._runAll(progress))
+        try:
+            self._future.result()
+        except concurrent.futures.CancelledError:
+            pass
+        return dict(self.results)
+    
+    def apply(self, results: Dict) -> int:
+        """
+        将结果写入数据行（在主线程调用）
+        
+        Returns:
+            写入的行数
+        """
+        count = 0
+        for target, result in results.items():
+            count += self.applyTarget(target, result)
+        return count
+    
+    def applyTarget(self, target: Hashable, result) -> int:
+        """
+        将单个目标的结果写入对应的全部数据行
+        
+        Returns:
+            写入的行数
+        """
+        rows = self.targets.get(target, [])
+        for data in rows:
+            self.applyResult(data, result)
+        return len(rows)
+    
+    async def _runAll(self, progress):
+        """并发执行全部目标"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        total = len(self.targets)
+        done = 0
+        
+        async def worker(target):
+            async with semaphore:
+                result = await self.process(target)
+            if result is not None:
+                self.results[target] = result
+                if self.streaming:
+                    self.applyTarget(target, result)
+        
+        tasks = [asyncio.ensure_future(worker(target)) for target in self.targets]
+        try:
+            for task in asyncio.as_completed(tasks):
+                await task
+                done += 1
+                if progress:
+                    progress(done, total)
+        finally:
+            # 取消时停止尚未完成的请求
+            for task in tasks:
+                task.cancel()
+
+
+class FaviconHashJob(BatchJob):
+    """
+    批量计算favicon hash
+    
+    每个URL依次执行：从首页提取favicon链接 -> 下载favicon -> 计算mmh3。
+    """
+    
+    # 从getImageFavicon的结果中提取hash
+    HASH_PATTERN = re.compile(r'icon_hash="(-?\d+)"')
+    
+    def targetOf(self, data: ResultRow) -> Optional[str]:
+        """目标为http(s)网站URL，其他协议返回None"""
+        url = self.webUrlOf(data)
+        return url.rstrip("/") if url else None
+    
+    async def process(self, url: str) -> Optional[str]:
+        """获取单个网站的favicon hash"""
+        link = await self.client.getLinkIcon(url)
+        res = await self.client.getImageFavicon(link or f"{url}/favicon.ico")
+        if not res or res.get("code") != "200":
+            return None
+        match = self.HASH_PATTERN.search(res.get("msg", ""))
+        return match.group(1) if match else None
+    
+    def applyResult(self, data: ResultRow, icon_hash: str):
+        """写入icon_hash"""
+        data.iconHash = icon_hash
+
+
+class CertHarvestJob(BatchJob):
+    """
+    批量获取TLS证书
+    
+    每个host:port只做一次TLS握手，一次提取序列号、主题CN/O和SAN；
+    结果按host:port缓存，有效期与查询缓存相同（cacheTTL）。
+    """
+    
+    # 使用TLS的协议
+    TLS_PROTOCOLS = {"https", "imaps", "pop3s", "smtps", "ldaps", "ftps"}
+    
+    # 握手超时（秒）
+    HANDSHAKE_TIMEOUT = 5
+    
+    # 证书缓存 {(hostname, port): (获取时间, 证书信息)}
+    _cache: Dict[Tuple[str, int], Tuple[float, CertBean]] = {}
+    _cacheLock = threading.Lock()
+    
+    def __init__(self, rows: Iterable[ResultRow], concurrency: int = 50):
+        """
+        Args:
+            rows: 需要处理的数据行
+            concurrency: 并发上限
+        """
+        super().__init__(rows, concurrency)
+        # 所有握手共用一个SSL上下文
+        self.sslContext = RequestUtil.createSSLContext()
+    
+    def targetOf(self, data: ResultRow) -> Optional[Tuple[str, int, str]]:
+        """目标为(hostname, port, 连接地址)，非TLS服务返回None"""
+        if not (data.protocol.lower() in self.TLS_PROTOCOLS
+                or data.host.startswith("https://") or data.port == 443):
+            return None
+        target = RequestUtil.parseHostPort(data.host or data.ip, data.port or 443)
+        if not target:
+            return None
+        hostname, port = target
+        # 有IP时直接连接IP（省去DNS解析），hostname只用于SNI
+        return hostname, port, data.ip or hostname
+    
+    @classmethod
+    def getCached(cls, hostname: str, port: int) -> Optional[CertBean]:
+        """读取未过期的证书缓存"""
+        ttl = FofaConfig.getInstance().cacheTTL * 60
+        with cls._cacheLock:
+            entry = cls._cache.get((hostname, port))
+            if entry is None:
+                return None
+            fetched, cert = entry
+            if ttl and time.time() - fetched > ttl:
+                del cls._cache[(hostname, port)]
+                return None
+            return cert
+    
+    @classmethod
+    def putCached(cls, hostname: str, port: int, cert: CertBean):
+        """写入证书缓存"""
+        with cls._cacheLock:
+            cls._cache[(hostname, port)] = (time.time(), cert)
+    
+    async def process(self, target: Tuple[str, int, str]) -> Optional[CertBean]:
+        """获取单个host:port的证书"""
+        hostname, port, address = target
+        cert = self.getCached(hostname, port)
+        if cert is not None:
+            return cert
+        
+        writer = None
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    address, port,
+                    ssl=self.sslContext,
+                    server_hostname=hostname
+                ),
+                self.HANDSHAKE_TIMEOUT
+            )
+            cert_der = writer.get_extra_info("ssl_object").getpeercert(True)
+            if not cert_der:
+                return None
+            cert = RequestUtil.parseCertificate(cert_der)
+        except (OSError, asyncio.TimeoutError, ValueError):
+            return None
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        self.putCached(hostname, port, cert)
+        return cert
+    
+    def applyResult(self, data: ResultRow, cert: CertBean):
+        """写入证书字段"""
+        data.certSerial = cert.serial
+        data.certSans = ",".join(cert.sans)
+        data.certCN = cert.cn or data.certCN
+        data.certOrg = cert.org or data.certOrg
+
+
+class StatusCheckJob(BatchJob):
+    """
+    批量检测http(s)资产存活
+    
+    每个URL先发HEAD请求（服务端不支持时改用GET，只读取响应头），不跟随跳转，
+    记录状态码和响应时间；连接在同一主机的请求之间复用。
+    超时时间根据已完成请求的耗时自适应：取最近耗时的90分位的3倍，
+    限制在TIMEOUT_MIN和TIMEOUT_MAX之间；按短超时失败的目标再用TIMEOUT_MAX重试一次。
+    """
+    streaming = True
+    
+    # 超时范围（秒）
+    TIMEOUT_MIN = 1.0
+    TIMEOUT_MAX = 5.0
+    
+    # 自适应超时：耗时分位数、倍数、样本数
+    TIMEOUT_QUANTILE = 0.9
+    TIMEOUT_FACTOR = 3
+    TIMEOUT_SAMPLES = 200
+    
+    # 样本不足时使用TIMEOUT_MAX
+    MIN_SAMPLES = 20
+    
+    # 无响应时写入状态列的值
+    TIMEOUT = "超时"
+    FAILED = "无响应"
+    DEAD = (TIMEOUT, FAILED)
+    
+    def __init__(self, rows: Iterable[ResultRow], concurrency: int = 50):
+        """
+        Args:
+            rows: 需要处理的数据行
+            concurrency: 并发上限
+        """
+        super().__init__(rows, concurrency)
+        self.samples: Deque[float] = deque(maxlen=self.TIMEOUT_SAMPLES)
+    
+    def targetOf(self, data: ResultRow) -> Optional[str]:
+        """目标为http(s)网站URL，其他协议返回None"""
+        return self.webUrlOf(data)
+    
+    def timeout(self) -> float:
+        """当前的超时时间（秒）"""
+        if len(self.samples) < self.MIN_SAMPLES:
+            return self.TIMEOUT_MAX
+        ordered = sorted(self.samples)
+        quantile = ordered[int(len(ordered) * self.TIMEOUT_QUANTILE)]
+        return min(self.TIMEOUT_MAX, max(self.TIMEOUT_MIN, quantile * self.TIMEOUT_FACTOR))
+    
+    async def process(self, url: str) -> Tuple[str, int]:
+        """检测单个URL，返回(状态码或无响应原因, 响应时间毫秒)"""
+        timeout = self.timeout()
+        while True:
+            start = time.monotonic()
+            res = await self.client.getStatus(url, timeout)
+            elapsed = time.monotonic() - start
+            if res["code"] != "error":
+                self.samples.append(elapsed)
+                return res["code"], max(1, round(elapsed * 1000))
+            timed_out = res["msg"] == RequestUtil.TIMEOUT_MESSAGE
+            if timed_out and timeout < self.TIMEOUT_MAX:
+                # 短超时可能误判慢速资产，用最长超时再试一次
+                timeout = self.TIMEOUT_MAX
+                continue
+            return (self.TIMEOUT if timed_out else self.FAILED), 0
+    
+    def applyResult(self, data: ResultRow, result: Tuple[str, int]):
+        """写入状态码和响应时间"""
+        data.status, data.responseTime = result
+    
+    @classmethod
+    def isDead(cls, status: str) -> bool:
+        """检测结果是否为无响应"""
+        return status in cls.DEAD
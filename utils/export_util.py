@@ -0,0 +1,351 @@
+"""
+流式导出工具类
+"""
+import csv
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from models.table_bean import ExcelBean, TabDataBean
+from utils.data_util import DataUtil
+from utils.page_util import PaginationEngine
+
+
+class ExcelStreamWriter:
+    """
+    基于openpyxl只写模式的Excel写入器
+    
+    每行写入后即序列化到临时文件，内存占用与行数无关；
+    "查询结果"和"urls"两个工作表可以交替写入。
+    """
+    
+    # 表头颜色
+    HEADER_BACKGROUND = "366092"
+    HEADER_COLOR = "FFFFFF"
+    
+    # 列宽
+    COLUMN_WIDTHS = {"A": 30, "B": 38, "C": 20, "D": 15}
+    URL_COLUMN_WIDTH = 40
+    
+    def __init__(self, fileName: str, headers: List[str]):
+        """
+        Args:
+            fileName: 文件名
+            headers: 查询结果表头
+        """
+        # openpyxl导入较慢，导出时才导入
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
+        self.fileName = fileName
+        self.rowCount = 0
+        self.urlCount = 0
+        
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("查询结果")
+        self._urlWs = self._wb.create_sheet("urls")
+        
+        # 只写模式下列宽必须在写入第一行之前设置
+        for column, width in self.COLUMN_WIDTHS.items():
+            self._ws.column_dimensions[column].width = width
+        self._urlWs.column_dimensions["A"].width = self.URL_COLUMN_WIDTH
+        
+        header_fill = PatternFill(start_color=self.HEADER_BACKGROUND, end_color=self.HEADER_BACKGROUND, fill_type="solid")
+        header_font = Font(bold=True, size=14, color=self.HEADER_COLOR)
+        header_alignment = Alignment(horizontal="center", vertical="center")
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(self._ws, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+            header_cells.append(cell)
+        self._ws.append(header_cells)
+    
+    def writeRow(self, row: List):
+        """写入一行查询结果"""
+        self._ws.append(row)
+        self.rowCount += 1
+    
+    def writeUrl(self, url: List[str]):
+        """写入一行URL"""
+        self._urlWs.append(url)
+        self.urlCount += 1
+    
+    def save(self):
+        """保存文件（只写模式的工作簿只能保存一次）"""
+        self._wb.save(self.fileName)
+    
+    def close(self, save: bool = True) -> Optional[str]:
+        """
+        结束写入
+        
+        Args:
+            save: 是否保存文件（取消导出时传False）
+        
+        Returns:
+            文件名，未保存时为None
+        """
+        if save:
+            self.save()
+            return self.fileName
+        
+        # 不保存时正常结束各工作表并删除临时文件
+        for ws in (self._ws, self._urlWs):
+            ws.close()
+            if ws._writer is not None:
+                ws._writer.cleanup()
+        return None
+
+
+class CsvStreamWriter:
+    """CSV写入器（逐行写入文件，URL不单独保存）"""
+    
+    def __init__(self, fileName: str, headers: List[str]):
+        """
+        Args:
+            fileName: 文件名
+            headers: 表头
+        """
+        self.fileName = fileName
+        self.rowCount = 0
+        self.urlCount = 0
+        # utf-8-sig使Excel直接打开时中文不乱码
+        self._file = open(fileName, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(headers)
+    
+    def writeRow(self, row: List):
+        """写入一行查询结果"""
+        self._writer.writerow(row)
+        self.rowCount += 1
+    
+    def writeUrl(self, url: List[str]):
+        """CSV只保存查询结果"""
+        self.urlCount += 1
+    
+    def close(self, save: bool = True) -> Optional[str]:
+        """结束写入，不保存时删除文件"""
+        self._file.close()
+        if save:
+            return self.fileName
+        Path(self.fileName).unlink(missing_ok=True)
+        return None
+
+
+class TxtStreamWriter:
+    """TXT写入器（每行一个URL）"""
+    
+    def __init__(self, fileName: str, headers: Optional[List[str]] = None):
+        """
+        Args:
+            fileName: 文件名
+            headers: 未使用，与其他写入器保持一致
+        """
+        self.fileName = fileName
+        self.rowCount = 0
+        self.urlCount = 0
+        self._file = open(fileName, 'w', encoding='utf-8')
+    
+    def writeRow(self, row: List):
+        """TXT只保存URL"""
+        self.rowCount += 1
+    
+    def writeUrl(self, url: List[str]):
+        """写入一行URL"""
+        self._file.write(url[0] + '\n')
+        self.urlCount += 1
+    
+    def close(self, save: bool = True) -> Optional[str]:
+        """结束写入，不保存时删除文件"""
+        self._file.close()
+        if save:
+            return self.fileName
+        Path(self.fileName).unlink(missing_ok=True)
+        return None
+
+
+# 导出格式 -> (写入器, 文件后缀)
+STREAM_WRITERS = {
+    "excel": (ExcelStreamWriter, "xlsx"),
+    "csv": (CsvStreamWriter, "csv"),
+    "txt": (TxtStreamWriter, "txt"),
+}
+
+
+class _WrittenRow:
+    """已写出的数据（只保留去重判断需要的字段）"""
+    __slots__ = ("host", "title")
+    
+    # 去重时不再原地替换（见DataUtil._dedupe）
+    written = True
+    
+    def __init__(self, host: str, title: str):
+        self.host = host
+        self.title = title
+
+
+class DedupeWindow:
+    """
+    跨页去重窗口
+    
+    去重后的数据先在窗口中暂存，超出窗口大小后才交给调用方写出：
+    窗口内的数据仍可被之后的页原地替换，结果与同一查询在Tab中的去重一致。
+    已写出的数据在去重索引中只保留判断所需的host/title并标记为已写出，
+    与已写出的行相距超过窗口的替换无法生效（计入lateReplaced）。
+    
+    窗口只限制完整数据的行数；去重索引在整个拉取期间为每个不同的去重键保留一项，
+    内存随去重后的结果数增长（每项为去重键和host/title）。
+    """
+    
+    # 窗口大小（行数）
+    WINDOW_ROWS = 10000
+    
+    def __init__(self, bean: TabDataBean, size: int = WINDOW_ROWS):
+        """
+        Args:
+            bean: 去重用的Tab数据Bean（去重索引跨页保存在其中）
+            size: 窗口大小
+        """
+        self.bean = bean
+        self.size = size
+        self.lateReplaced = 0
+        self._pending: deque = deque()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def push(self, records: List[tuple]) -> Tuple[List[ExcelBean], Set[str]]:
+        """
+        对一页行记录去重并放入窗口
+        
+        Args:
+            records: PaginationEngine解析出的行记录
+        
+        Returns:
+            (移出窗口、需要立即写出的数据, 本页的URL集合)
+        """
+        excel_data = []
+        url_list = set()
+        late = DataUtil.loadRecords(self.bean, records, excel_data, url_list, True)
+        self.lateReplaced += len(late)
+        self._pending.extend(excel_data)
+        ready = []
+        while len(self._pending) > self.size:
+            ready.append(self._release(self._pending.popleft()))
+        return ready, url_list
+    
+    def drain(self) -> List[ExcelBean]:
+        """移出窗口中剩余的全部数据（拉取结束时调用）"""
+        ready = [self._release(data) for data in self._pending]
+        self._pending.clear()
+        return ready
+    
+    def _release(self, data: ExcelBean) -> ExcelBean:
+        """数据写出后，去重索引中只保留host/title"""
+        key = DataUtil.dedupeKey(data.ip, data.port, data.host)
+        if self.bean.dedupeIndex.get(key) is data:
+            self.bean.dedupeIndex[key] = _WrittenRow(data.host, data.title)
+        return data
+
+
+class PullExportJob:
+    """
+    翻页拉取并直接流式导出
+    
+    每页去重后经过去重窗口写入文件，数据不显示到表格；写出的数据不在内存中保留，
+    跨页去重只为每个去重键保留判断所需的host/title（随结果数增长）。
+    """
+    
+    def __init__(self, baseUrl: str, exportFormat: str, fileName: str,
+                 additionalField: List[str], limit: int = 0):
+        """
+        Args:
+            baseUrl: 不带next参数的查询URL
+            exportFormat: 导出格式（excel/csv/txt）
+            fileName: 文件名
+            additionalField: 查询的额外字段
+            limit: 最多拉取条数，0表示拉取全部
+        """
+        self.baseUrl = baseUrl
+        self.exportFormat = exportFormat
+        self.fileName = fileName
+        self.additionalField = list(additionalField)
+        self.limit = limit
+        self.cancelEvent = threading.Event()
+        self._engine: Optional[PaginationEngine] = None
+    
+    def cancel(self):
+        """取消导出"""
+        self.cancelEvent.set()
+        if self._engine:
+            self._engine.cancel()
+    
+    def run(self, progress: Optional[Callable[[int, int], None]] = None):
+        """
+        执行拉取和导出
+        
+        Args:
+            progress: 进度回调，参数为(已写入行数, 查询结果总数)
+        
+        Returns:
+            (是否成功, 提示信息)
+        """
+        writer_cls, _ = STREAM_WRITERS[self.exportFormat]
+        window = DedupeWindow(TabDataBean(fields=self.additionalField))
+        total = 0
+        error_page = None
+        writer = None
+        
+        def write_rows(rows: List[ExcelBean]):
+            for data in rows:
+                writer.writeRow(DataUtil.getExcelRow(data, self.additionalField))
+        
+        try:
+            writer = writer_cls(self.fileName, DataUtil.getExcelHeaders(self.additionalField))
+            self._engine = PaginationEngine(self.baseUrl, self.limit)
+            
+            for page in self._engine.pages():
+                if self.cancelEvent.is_set():
+                    break
+                if page.error:
+                    # 翻页引擎在出错的页停止，之后的页都不会拉取
+                    error_page = page
+                    break
+                
+                excel_data, url_list = window.push(page.records)
+                write_rows(excel_data)
+                for url in url_list:
+                    writer.writeUrl([url])
+                
+                total = page.obj.get("size", 0)
+                if progress:
+                    progress(writer.rowCount + len(window), total)
+            
+            if self.cancelEvent.is_set():
+                writer.close(save=False)
+                return False, "导出已取消"
+            
+            write_rows(window.drain())
+            if writer.rowCount == 0 and error_page is not None:
+                writer.close(save=False)
+                return False, f"导出失败！第{error_page.page}页加载失败: {error_page.error}"
+            
+            writer.close()
+            message = f"导出成功！共 {writer.rowCount} 条，文件保存在 {self.fileName}"
+            if error_page is not None:
+                message = (f"部分数据导出成功，共 {writer.rowCount} 条；第{error_page.page}页加载失败"
+                           f"（{error_page.error}），该页起的数据未导出，文件保存在 {self.fileName}")
+            if window.lateReplaced:
+                message += (f"\n有 {window.lateReplaced} 条重复数据与已写出的行相距超过"
+                            f"{window.size}条，未能像表格中那样替换已写出的行")
+            return True, message
+        except Exception as e:
+            if writer:
+                try:
+                    writer.close(save=False)
+                except Exception:
+                    pass
+            return False, f"导出失败！{str(e)}"
@@ -0,0 +1,237 @@
+"""
+FOFA多账号密钥池
+"""
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from main.config import FofaConfig
+from utils.request_util import RequestUtil
+
+
+class KeyState:
+    """单个密钥的额度与延迟统计"""
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.remainQuery: Optional[int] = None  # 剩余查询次数，None表示未知
+        self.remainData: Optional[int] = None  # 剩余数据条数
+        self.latency = 1.0  # 最近请求耗时的指数移动平均（秒）
+        self.inflight = 0  # 正在进行的请求数
+        self.refreshed = 0.0  # 上次查询额度的时间
+        self.error = ""  # 最近一次的错误信息
+    
+    @property
+    def exhausted(self) -> bool:
+        """额度是否已用完"""
+        return self.remainQuery == 0 or self.remainData == 0
+    
+    def describe(self) -> str:
+        """额度摘要（key只显示首尾）"""
+        name = f"{self.key[:4]}****{self.key[-4:]}" if len(self.key) > 8 else self.key
+        if self.remainQuery is None:
+            return f"{name}  {self.error or '未查询'}"
+        return f"{name}  剩余查询量: {self.remainQuery}  剩余数据量: {self.remainData}"
+    
+    def score(self, pageSize: int = 1) -> float:
+        """
+        调度分数：剩余额度越多、延迟越低、并发越少分数越高
+        
+        Args:
+            pageSize: 每页条数，剩余数据量按可拉取的页数折算为剩余额度
+        """
+        remain = self.remainQuery if self.remainQuery is not None else 1
+        if self.remainData is not None:
+            remain = min(remain, self.remainData / pageSize)
+        return remain / (max(self.latency, 0.05) * (self.inflight + 1))
+
+
+class KeyPool:
+    """
+    FOFA密钥池
+    
+    通过info/my接口跟踪每个密钥的remain_api_query和remain_api_data，
+    每次API请求分配给剩余额度最多、最近延迟最低的密钥；
+    每个密钥使用独立的限流器，多个账号并发拉取时互不影响。
+    """
+    _instance: Optional['KeyPool'] = None
+    _instanceLock = threading.Lock()
+    
+    # 额度刷新间隔（秒）
+    REFRESH_INTERVAL = 300
+    
+    # 延迟移动平均的权重
+    LATENCY_ALPHA = 0.3
+    
+    # 表示账号额度不足或密钥无效的错误码
+    QUOTA_ERRORS = ("820031", "-700", "820000", "-702")
+    
+    def __init__(self):
+        self.config = FofaConfig.getInstance()
+        self.request_util = RequestUtil.getInstance()
+        self.states: Dict[str, KeyState] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def getInstance(cls) -> 'KeyPool':
+        """单例模式获取密钥池实例"""
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    @staticmethod
+    def limiterName(key: str) -> str:
+        """密钥对应的限流器名称"""
+        return f"fofa:{key}"
+    
+    @classmethod
+    def isQuotaError(cls, msg: str) -> bool:
+        """错误信息是否表示额度不足或密钥无效"""
+        return any(f"[{code}]" in msg for code in cls.QUOTA_ERRORS)
+    
+    def _sync(self) -> List[KeyState]:
+        """与配置中的密钥列表同步（调用方持有锁）"""
+        keys = self.config.getKeys()
+        for key in keys:
+            if key not in self.states:
+                self.states[key] = KeyState(key)
+        for key in list(self.states):
+            if key not in keys:
+                del self.states[key]
+        return [self.states[key] for key in keys]
+    
+    def refresh(self, key: str) -> KeyState:
+        """
+        查询单个密钥的剩余额度
+        
+        Returns:
+            更新后的状态，失败时error字段为错误信息
+        """
+        with self._lock:
+            state = self.states.get(key) or KeyState(key)
+            state.refreshed = time.time()
+        
+        result = self.request_util.getAPI(
+            self.config.personalInfoAPI % key, 10000, 10000,
+            limiterName=self.limiterName(key)
+        )
+        try:
+            if result.get("code") != "200":
+                raise ValueError(result.get("msg", "查询额度失败"))
+            obj = json.loads(result["msg"])
+            if obj.get("error"):
+                raise ValueError(obj.get("errmsg", "查询额度失败"))
+            with self._lock:
+                state.remainQuery = int(obj.get("remain_api_query", 0))
+                state.remainData = int(obj.get("remain_api_data", 0))
+                state.error = ""
+        except (ValueError, TypeError) as e:
+            with self._lock:
+                state.error = str(e)
+                # 密钥无效时不再分配请求
+                if self.isQuotaError(state.error):
+                    state.remainQuery = 0
+        return state
+    
+    def acquire(self) -> Optional[str]:
+        """
+        分配一个密钥（额度过期的密钥先刷新）
+        
+        Returns:
+            密钥，没有配置密钥时为None；全部耗尽时仍返回主密钥，由接口返回错误
+        """
+        with self._lock:
+            states = self._sync()
+            if not states:
+                return None
+            # 只有一个密钥时不需要调度，也不额外消耗info/my请求
+            stale = [] if len(states) == 1 else [
+                state.key for state in states
+                if time.time() - state.refreshed > self.REFRESH_INTERVAL
+            ]
+            for key in stale:
+                self.states[key].refreshed = time.time()
+        for key in stale:
+            self.refresh(key)
+        
+        with self._lock:
+            states = self._sync()
+            candidates = [state for state in states if not state.exhausted] or states[:1]
+            page_size = max(1, int(self.config.size))
+            best = max(candidates, key=lambda state: state.score(page_size))
+            best.inflight += 1
+            return best.key
+    
+    def release(self, key: str, elapsed: float, result: Dict[str, str]):
+        """
+        归还密钥并记录本次请求的耗时和额度消耗
+        
+        Args:
+            key: acquire返回的密钥
+            elapsed: 请求耗时（秒）
+            result: getAPI的返回值
+        """
+        with self._lock:
+            state = self.states.get(key)
+            if state is None:
+                return
+            state.inflight = max(0, state.inflight - 1)
+            state.latency += self.LATENCY_ALPHA * (elapsed - state.latency)
+            
+            msg = result.get("msg", "")
+            if result.get("code") != "200":
+                state.error = msg
+                return
+            head = msg[:200]
+            if isinstance(head, bytes):
+                head = head.decode("utf-8", errors="ignore")
+            if self.isQuotaError(head):
+                state.error = head
+                state.remainQuery = 0
+                return
+            if state.remainQuery:
+                state.remainQuery -= 1
+    
+    def consumeData(self, key: Optional[str], rows: int):
+        """
+        从密钥的剩余数据量中扣除一次请求返回的条数
+        
+        Args:
+            key: getAPI返回结果中的key，未使用密钥池时为None
+            rows: 返回的数据条数
+        """
+        if not key or not rows:
+            return
+        with self._lock:
+            state = self.states.get(key)
+            if state is not None and state.remainData:
+                state.remainData = max(0, state.remainData - rows)
+    
+    def getAPI(self, url: str, connectTimeout: int = 120000, readTimeout: int = 120000,
+               cancelEvent: Optional[threading.Event] = None, raw: bool = False) -> Dict[str, str]:
+        """
+        使用密钥池中的密钥请求FOFA API（替换URL中的key参数）
+        
+        Args:
+            raw: 成功时msg是否为响应字节（见RequestUtil.getAPI）
+        
+        Returns:
+            {"code": "200/error/其他状态码", "msg": "响应内容或错误信息", "key": "使用的密钥"}；
+            解析出数据条数后调用consumeData扣除剩余数据量
+        """
+        key = self.acquire()
+        if key is None:
+            return self.request_util.getAPI(url, connectTimeout, readTimeout, cancelEvent, raw=raw)
+        
+        url = self.request_util.replaceParam(url, "key", key)
+        start = time.monotonic()
+        result = {"code": "error", "msg": "请求失败"}
+        try:
+            result = self.request_util.getAPI(url, connectTimeout, readTimeout, cancelEvent,
+                                              limiterName=self.limiterName(key), raw=raw)
+        finally:
+            self.release(key, time.monotonic() - start, result)
+        result["key"] = key
+        return result
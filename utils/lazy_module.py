@@ -0,0 +1,51 @@
+"""
+延迟导入工具
+"""
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    延迟导入的模块
+    
+    首次访问属性时才真正导入，用于启动时不需要的重量级依赖
+    （requests、httpx等），使主窗口不必等待它们加载完成。
+    导入由Python的模块锁保证线程安全。
+    """
+    
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 模块名
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+    
+    @staticmethod
+    def isAvailable(name: str) -> bool:
+        """模块是否已安装（只查找，不导入）"""
+        try:
+            return importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    @classmethod
+    def optional(cls, name: str) -> Optional['LazyModule']:
+        """可选依赖：已安装时返回延迟导入的模块，否则返回None"""
+        return cls(name) if cls.isAvailable(name) else None
+    
+    def load(self) -> ModuleType:
+        """导入并返回真正的模块"""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
@@ -0,0 +1,229 @@
+"""
+FOFA游标翻页引擎（/api/v1/search/next）
+"""
+import queue
+import re
+import threading
+from typing import Iterator, Optional
+from urllib.parse import urlparse, parse_qs
+
+from main.config import FofaConfig
+from models.table_bean import PageBean
+from utils.cache_util import ResponseCache
+from utils.data_util import DataUtil
+from utils.key_pool import KeyPool
+from utils.warehouse_util import ResultWarehouse
+
+
+class PaginationEngine:
+    """
+    沿next游标翻页直到结束或达到数量上限
+    
+    后台线程负责请求和JSON解码，调用方处理第N页的同时，
+    第N+1页已经在请求中（预取深度由prefetch控制）。
+    """
+    
+    # 队列结束标记
+    _DONE = object()
+    
+    # URL中的每页条数参数
+    SIZE_PATTERN = re.compile(r"(?<=[?&])size=(\d+)")
+    
+    # 502时每页条数的下限和重试次数
+    MIN_PAGE_SIZE = 10
+    MAX_502_RETRIES = 6
+    
+    def __init__(
+        self,
+        baseUrl: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        prefetch: int = 1,
+        key_pool: Optional[KeyPool] = None
+    ):
+        """
+        Args:
+            baseUrl: 不带next参数的查询URL（getParam + qbase64）
+            limit: 最多拉取的条数，None或0表示不限制
+            cursor: 起始游标（用于继续上次的翻页）
+            prefetch: 预取页数
+            key_pool: 密钥池实例
+        """
+        self.baseUrl = baseUrl
+        self.limit = limit or 0
+        self.cursor = cursor
+        self.prefetch = max(1, prefetch)
+        self.key_pool = key_pool or KeyPool.getInstance()
+        self.cache = ResponseCache.getInstance()
+        self.fetched = 0
+        self.pageSize: Optional[int] = None  # 502后缩小的每页条数
+        # 请求的字段（results的列顺序）
+        query = parse_qs(urlparse(baseUrl).query)
+        self.fieldNames = query.get("fields", [""])[0].split(",")
+        # 查询语句（写入本地结果库）
+        self.query = DataUtil.decodeQuery(query.get("qbase64", [""])[0]) or ""
+        self.warehouse = ResultWarehouse.getInstance()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def cancel(self):
+        """取消翻页（正在进行的请求结束后生效）"""
+        self._cancel.set()
+    
+    def isCancelled(self) -> bool:
+        """是否已取消"""
+        return self._cancel.is_set()
+    
+    def buildUrl(self, cursor: Optional[str]) -> str:
+        """构建指定游标的请求URL"""
+        url = self.baseUrl
+        if self.pageSize:
+            url = self.SIZE_PATTERN.sub(f"size={self.pageSize}", url, count=1)
+        if cursor:
+            return f"{url}&next={cursor}"
+        return url
+    
+    def _shrinkPageSize(self, failures: int) -> bool:
+        """
+        连续502时缩小每页条数（第一次原样重试，之后每次减半）
+        
+        Returns:
+            是否需要重试
+        """
+        if failures >= self.MAX_502_RETRIES:
+            return False
+        if failures == 0:
+            return True
+        match = self.SIZE_PATTERN.search(self.baseUrl)
+        if not match:
+            return False
+        current = self.pageSize or int(match.group(1))
+        if current <= self.MIN_PAGE_SIZE:
+            return False
+        self.pageSize = max(self.MIN_PAGE_SIZE, current // 2)
+        return True
+    
+    def pages(self) -> Iterator[PageBean]:
+        """
+        逐页返回结果（调用方所在线程消费，请求在后台线程进行）
+        
+        Returns:
+            PageBean迭代器，出错的页以error字段标记，之后迭代结束
+        """
+        pipe: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        self._thread = threading.Thread(target=self._fetchLoop, args=(pipe,), daemon=True)
+        self._thread.start()
+        
+        try:
+            while True:
+                try:
+                    item = pipe.get(timeout=0.5)
+                except queue.Empty:
+                    if self._cancel.is_set() and not self._thread.is_alive():
+                        return
+                    continue
+                if item is self._DONE:
+                    return
+                yield item
+                if self._cancel.is_set():
+                    return
+        finally:
+            # 调用方提前结束迭代或抛出异常时停止后台请求线程
+            self.cancel()
+    
+    def _put(self, pipe: queue.Queue, item) -> bool:
+        """放入队列，取消时放弃"""
+        while not self._cancel.is_set():
+            try:
+                pipe.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _request(self, url: str):
+        """
+        请求一页（优先读取缓存）
+        
+        Returns:
+            (请求结果, 是否来自缓存)
+        """
+        body = self.cache.get(url)
+        if body is not None:
+            return {"code": "200", "msg": body}, True
+        if self.cache.isOffline():
+            return {"code": "error", "msg": "离线模式：缓存中没有该页数据"}, False
+        # 直接取响应字节，跳过编码检测和解码
+        return self.key_pool.getAPI(url, 120000, 120000, self._cancel, raw=True), False
+    
+    def fetchPage(self, cursor: Optional[str] = None, page: int = 1) -> PageBean:
+        """
+        同步请求并解析一页
+        
+        Args:
+            cursor: 游标
+            page: 页码
+        
+        Returns:
+            PageBean，失败时error字段为错误信息
+        """
+        failures = 0
+        while True:
+            url = self.buildUrl(cursor)
+            result, cached = self._request(url)
+            if result.get("code") != "502" or self._cancel.is_set() or not self._shrinkPageSize(failures):
+                break
+            # 502通常是单页条数超过账号限制，缩小条数后重试同一游标
+            failures += 1
+        
+        if result.get("code") != "200":
+            return PageBean(page=page, cursor=cursor, error=result.get("msg", "查询失败"))
+        
+        try:
+            obj = DataUtil.loadsJson(result["msg"])
+        except ValueError as e:
+            return PageBean(page=page, cursor=cursor, error=f"解析数据失败: {str(e)}")
+        if obj.get("error"):
+            return PageBean(page=page, cursor=cursor, error=obj.get("errmsg", "查询失败"))
+        if not cached:
+            self.cache.put(url, result["msg"])
+        
+        # 在翻页线程中解析为紧凑行记录，原始results不再保留
+        results = obj.pop("results", None) or []
+        if self.limit:
+            # 每页条数大于剩余条数时只保留到上限
+            results = results[:max(0, self.limit - self.fetched)]
+        records = DataUtil.parseResults(results, self.fieldNames)
+        self.fetched += len(results)
+        self.key_pool.consumeData(result.get("key"), len(results))
+        # 缓存中的结果已在首次拉取时写入结果库
+        if not cached:
+            self.warehouse.add(self.query, records)
+        nextCursor = obj.get("next") or None
+        
+        # 是否还有下一页（以本次请求的size参数为准）
+        pageSize = int(parse_qs(urlparse(url).query).get("size", [FofaConfig.getInstance().size])[0])
+        hasMore = bool(nextCursor) and len(results) >= pageSize
+        if self.limit and self.fetched >= self.limit:
+            hasMore = False
+        
+        return PageBean(page=page, cursor=cursor, next=nextCursor, obj=obj, hasMore=hasMore,
+                        total=obj.get("size", 0), records=records)
+    
+    def _fetchLoop(self, pipe: queue.Queue):
+        """后台请求循环"""
+        page = 1
+        cursor = self.cursor
+        try:
+            while not self._cancel.is_set():
+                item = self.fetchPage(cursor, page)
+                if not self._put(pipe, item):
+                    return
+                if item.error or not item.hasMore:
+                    return
+                
+                cursor = item.next
+                self.cursor = cursor
+                page += 1
+        finally:
+            self._put(pipe, self._DONE)
@@ -0,0 +1,283 @@
+"""
+项目文件（保存和打开查询Tab）
+"""
+import json
+import os
+import sqlite3
+import sys
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from models.table_bean import TabDataBean
+from utils.data_util import DataUtil
+
+
+# 项目文件后缀
+PROJECT_SUFFIX = ".fofa"
+
+# 项目文件格式版本（列的存储方式变化时递增）
+PROJECT_VERSION = 3
+
+# 每个数据块的行数
+CHUNK_SIZE = 10000
+
+
+class ProjectTabLoader:
+    """
+    按需加载Tab数据行（每次加载一个数据块）
+    
+    加载的行追加到Tab的列式存储，并同步重建这些行的去重索引。
+    只能在创建它的线程（主线程）中使用。
+    """
+    
+    def __init__(self, path: str, tabId: int, bean: TabDataBean, rowCount: int):
+        """
+        Args:
+            path: 项目文件路径
+            tabId: Tab在项目文件中的ID
+            bean: Tab数据Bean
+            rowCount: 项目文件中的行数
+        """
+        self.path = path
+        self.tabId = tabId
+        self.bean = bean
+        self.rowCount = rowCount
+        self._chunk = 0
+        self._loaded = 0
+        self._conn = None
+    
+    def hasMore(self) -> bool:
+        """是否还有未加载的数据行"""
+        return self._loaded < self.rowCount
+    
+    def loadNext(self) -> int:
+        """
+        加载下一个数据块
+        
+        Returns:
+            新加载的行数
+        
+        Raises:
+            sqlite3.Error: 项目文件读取失败
+        """
+        if not self.hasMore():
+            return 0
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+        row = self._conn.execute(
+            "SELECT rows FROM chunks WHERE tab_id = ? AND chunk = ?",
+            (self.tabId, self._chunk)
+        ).fetchone()
+        store = self.bean.rows
+        start = len(store)
+        try:
+            if row is None:
+                raise ValueError("数据块不存在")
+            count = row[0]
+            chunk = {
+                name: zlib.decompress(data) for name, data in self._conn.execute(
+                    "SELECT name, data FROM chunk_columns WHERE tab_id = ? AND chunk = ?",
+                    (self.tabId, self._chunk)
+                )
+            }
+            store.loadChunk(chunk, count)
+        except (ValueError, zlib.error):
+            # 项目文件不完整或已损坏，剩余行无法加载
+            self.rowCount = self._loaded
+            self.close()
+            return 0
+        self._indexRows(start, len(store))
+        
+        self._chunk += 1
+        self._loaded += count
+        if not self.hasMore():
+            self.close()
+        return count
+    
+    def loadAll(self) -> int:
+        """
+        加载全部剩余数据行
+        
+        Returns:
+            新加载的行数
+        """
+        total = 0
+        while self.hasMore():
+            count = self.loadNext()
+            if not count:
+                break
+            total += count
+        return total
+    
+    def close(self):
+        """关闭项目文件"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _indexRows(self, start: int, end: int):
+        """重建新加载行的去重索引（后加载的行覆盖同键的旧行，与查询时一致）"""
+        columns = self.bean.rows.columns
+        ip, port, host = columns["ip"], columns["port"], columns["host"]
+        index = self.bean.dedupeIndex
+        for row in range(start, end):
+            index[DataUtil.dedupeKey(ip.get(row), port.get(row), host.get(row))] = row
+
+
+@dataclass
+class ProjectTab:
+    """项目文件中的Tab"""
+    title: str
+    bean: TabDataBean
+    loader: ProjectTabLoader
+
+
+class ProjectUtil:
+    """
+    项目文件读写
+    
+    项目文件为SQLite数据库：
+    
+    - meta表：格式版本和写入平台的字节序（列数据中的数组为本机字节序）
+    - tabs表：每个Tab的查询语句（标题）、字段、游标和翻页状态，
+      lookups为编码列的字典（UTF-8 JSON对象{字段: 值列表}，zlib压缩）
+    - chunks表：数据行按CHUNK_SIZE分块，记录每块的行数
+    - chunk_columns表：每块每列一条，data为ResultStore.dumpChunk的列编码（zlib压缩），
+      全部为空的字符串列不保存
+    
+    列数据只由数组字节、UTF-8 JSON和zlib组成，与Python版本无关。
+    打开时只读取Tab信息和编码列的字典，数据行由ProjectTabLoader按需加载。
+    """
+    
+    SCHEMA = (
+        "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "CREATE TABLE tabs ("
+        "id INTEGER PRIMARY KEY, title TEXT NOT NULL, fields TEXT NOT NULL, columns TEXT NOT NULL, "
+        "count INTEGER NOT NULL, total INTEGER NOT NULL, has_more INTEGER NOT NULL, "
+        "page INTEGER NOT NULL, next TEXT, row_count INTEGER NOT NULL, lookups BLOB NOT NULL)",
+        "CREATE TABLE chunks ("
+        "tab_id INTEGER NOT NULL, chunk INTEGER NOT NULL, rows INTEGER NOT NULL, "
+        "PRIMARY KEY (tab_id, chunk))",
+        "CREATE TABLE chunk_columns ("
+        "tab_id INTEGER NOT NULL, chunk INTEGER NOT NULL, name TEXT NOT NULL, data BLOB NOT NULL, "
+        "PRIMARY KEY (tab_id, chunk, name))",
+    )
+    
+    @staticmethod
+    def save(path: str, tabs: List[Tuple[str, TabDataBean]]) -> str:
+        """
+        保存项目（先写入临时文件，完成后替换，失败时不影响原文件）
+        
+        Args:
+            path: 项目文件路径
+            tabs: [(Tab标题, Tab数据Bean)]，数据行需已全部加载
+        
+        Returns:
+            错误信息，成功时为空字符串
+        """
+        temp_path = f"{path}.tmp"
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            conn = sqlite3.connect(temp_path)
+            try:
+                conn.execute("PRAGMA journal_mode = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                for statement in ProjectUtil.SCHEMA:
+                    conn.execute(statement)
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("version", str(PROJECT_VERSION)),
+                    ("byteorder", sys.byteorder),
+                ])
+                for tab_id, (title, bean) in enumerate(tabs):
+                    ProjectUtil._saveTab(conn, tab_id, title, bean)
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(temp_path, path)
+        except (sqlite3.Error, OSError) as e:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return str(e)
+        return ""
+    
+    @staticmethod
+    def _saveTab(conn: sqlite3.Connection, tabId: int, title: str, bean: TabDataBean):
+        """保存一个Tab（数据行按块写入，每块只在序列化时持有存储的锁）"""
+        store = bean.rows
+        row_count = len(store)
+        conn.execute(
+            "INSERT INTO tabs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (tabId, title, json.dumps(bean.fields), json.dumps(bean.columns),
+             bean.count, bean.total, int(bean.hasMoreData), bean.page, bean.next, row_count, b"")
+        )
+        for chunk, start in enumerate(range(0, row_count, CHUNK_SIZE)):
+            end = min(start + CHUNK_SIZE, row_count)
+            columns = store.dumpChunk(start, end)
+            conn.execute("INSERT INTO chunks VALUES (?, ?, ?)", (tabId, chunk, end - start))
+            conn.executemany(
+                "INSERT INTO chunk_columns VALUES (?, ?, ?, ?)",
+                [(tabId, chunk, name, zlib.compress(data, 1)) for name, data in columns.items()]
+            )
+        # 字典只会追加，最后再取，保存期间写入的编码也能解码
+        lookups = json.dumps(store.lookups(), ensure_ascii=False).encode("utf-8")
+        conn.execute("UPDATE tabs SET lookups = ? WHERE id = ?", (zlib.compress(lookups), tabId))
+    
+    @staticmethod
+    def open(path: str) -> List[ProjectTab]:
+        """
+        打开项目（只读取Tab信息，数据行由返回的加载器按需加载）
+        
+        Args:
+            path: 项目文件路径
+        
+        Returns:
+            Tab列表（按保存时的顺序）
+        
+        Raises:
+            ValueError: 不是有效的项目文件
+            sqlite3.Error: 项目文件读取失败
+        """
+        if not Path(path).is_file():
+            raise ValueError("项目文件不存在")
+        conn = sqlite3.connect(path)
+        try:
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            except sqlite3.DatabaseError:
+                raise ValueError("不是有效的项目文件") from None
+            if meta.get("version") != str(PROJECT_VERSION):
+                raise ValueError(f"不支持的项目文件版本: {meta.get('version')}")
+            if meta.get("byteorder") != sys.byteorder:
+                raise ValueError("项目文件来自字节序不同的平台")
+            
+            tabs = []
+            for (tab_id, title, fields, columns, count, total, has_more,
+                 page, next_cursor, row_count, lookups) in conn.execute("SELECT * FROM tabs ORDER BY id"):
+                bean = TabDataBean(
+                    count=count, total=total, fields=json.loads(fields), columns=json.loads(columns),
+                    hasMoreData=bool(has_more), page=page, next=next_cursor
+                )
+                try:
+                    bean.rows.setLookups(ProjectUtil._decodeLookups(lookups))
+                except (ValueError, KeyError, AttributeError, zlib.error) as e:
+                    raise ValueError(f"项目文件已损坏: {e}") from None
+                tabs.append(ProjectTab(title, bean, ProjectTabLoader(path, tab_id, bean, row_count)))
+            return tabs
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _decodeLookups(data: bytes) -> Dict[str, List[str]]:
+        """解码编码列的字典"""
+        lookups = json.loads(zlib.decompress(data).decode("utf-8"))
+        if not isinstance(lookups, dict) or not all(
+            isinstance(lookup, list) and all(isinstance(value, str) for value in lookup)
+            for lookup in lookups.values()
+        ):
+            raise ValueError("字典格式错误")
+        return lookups
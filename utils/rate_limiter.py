@@ -0,0 +1,130 @@
+"""
+API请求限流工具类
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from main.config import FofaConfig
+
+
+class RateLimiter:
+    """
+    令牌桶限流器
+    
+    所有线程共用同一个桶：每秒补充rate个令牌，最多积累burst个。
+    收到429/503时调用penalize，在Retry-After期间所有请求都会等待。
+    rate和burst未指定时读取FofaConfig的apiRate和apiBurst。
+    """
+    _instances: Dict[str, 'RateLimiter'] = {}
+    _instancesLock = threading.Lock()
+    
+    # 单次等待的最长时间（秒），便于及时响应取消
+    WAIT_STEP = 0.5
+    
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        """
+        Args:
+            rate: 每秒请求数，0表示不限流
+            burst: 突发请求数
+        """
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blockedUntil = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def getInstance(cls, name: str = "fofa") -> 'RateLimiter':
+        """
+        获取指定名称的共享限流器
+        
+        Args:
+            name: 限流器名称（如不同的API或key）
+        """
+        with cls._instancesLock:
+            limiter = cls._instances.get(name)
+            if limiter is None:
+                limiter = cls()
+                cls._instances[name] = limiter
+            return limiter
+    
+    @property
+    def rate(self) -> float:
+        """每秒请求数"""
+        return self._rate if self._rate is not None else FofaConfig.getInstance().apiRate
+    
+    @property
+    def burst(self) -> int:
+        """突发请求数"""
+        return max(1, self._burst if self._burst is not None else FofaConfig.getInstance().apiBurst)
+    
+    def _refill(self, now: float):
+        """按经过的时间补充令牌"""
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, cancelEvent: Optional[threading.Event] = None) -> bool:
+        """
+        获取一个令牌（阻塞直到可以发起请求）
+        
+        Args:
+            cancelEvent: 取消事件，设置后立即返回
+        
+        Returns:
+            是否获取成功，取消时为False
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._blockedUntil - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return True
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+            
+            wait = min(wait, self.WAIT_STEP)
+            if cancelEvent is not None:
+                if cancelEvent.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+    
+    def penalize(self, seconds: float):
+        """
+        暂停所有请求（服务端要求等待时调用）
+        
+        Args:
+            seconds: 等待秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blockedUntil = max(self._blockedUntil, now + seconds)
+            self._tokens = 0.0
+            self._updated = max(self._updated, self._blockedUntil)
+    
+    @staticmethod
+    def parseRetryAfter(value: Optional[str]) -> Optional[float]:
+        """
+        解析Retry-After响应头（秒数或HTTP日期）
+        
+        Returns:
+            等待秒数，无法解析时为None
+        """
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError):
+            return None
@@ -6,22 +6,19 @@ import re
 import ssl
 import time
 import random
+import threading
 import urllib.parse
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
-import requests
-from requests.adapters import HTTPAdapter
-try:
-    from requests.packages.urllib3.util.retry import Retry
-except ImportError:
-    from urllib3.util.retry import Retry
-import mmh3  # murmurhash3 for icon hash
-from bs4 import BeautifulSoup
-from cryptography import x509
-from cryptography.hazmat.backends import default_backend
 import socket
 
 from main.config import FofaConfig, ProxyConfig
+from models.table_bean import CertBean
+from utils.lazy_module import LazyModule
+from utils.rate_limiter import RateLimiter
+
+# requests、bs4、cryptography、mmh3在首次使用时才导入，不拖慢启动
+requests = LazyModule("requests")
 
 
 class RequestUtil:
@@ -39,9 +36,56 @@ class RequestUtil:
     CN_PATTERN = re.compile(r"CommonName:\s([-|*|\w|\.|\s]+)\n\nSubject Public")
     SN_PATTERN = re.compile(r"Serial Number:\s(\d+)\n")
     
+    # 重试的状态码
+    RETRY_STATUS = [429, 500, 502, 503, 504]
+    
+    # FOFA API重试次数和退避基数（秒）
+    API_RETRY_TOTAL = 3
+    API_RETRY_BACKOFF = 1
+    # API请求重试的状态码（502由调用方缩小每页条数后重试）
+    API_RETRY_STATUS = (429, 500, 503, 504)
+    
+    # 不支持HEAD请求时返回的状态码（改用GET）
+    HEAD_UNSUPPORTED = (405, 501)
+    
+    # 请求超时的错误信息
+    TIMEOUT_MESSAGE = "请求超时"
+    
+    # favicon和网页的大小上限
+    MAX_FAVICON_SIZE = 5 * 1024 * 1024  # 5MB
+    MAX_HTML_SIZE = 10 * 1024 * 1024  # 10MB
+    
     def __init__(self):
         self.config = ProxyConfig.getInstance()
-        self.session = self._create_session()
+        # requests.Session不是线程安全的，每个线程使用各自的session
+        self._local = threading.local()
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """当前线程的session"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+        return session
+    
+    @property
+    def apiSession(self) -> 'requests.Session':
+        """当前线程请求FOFA API的session（状态码重试由getAPI处理）"""
+        session = getattr(self._local, "apiSession", None)
+        if session is None:
+            session = self._create_session([])
+            self._local.apiSession = session
+        return session
+    
+    @property
+    def statusSession(self) -> 'requests.Session':
+        """当前线程检测存活的session（不重试，失败即视为无响应）"""
+        session = getattr(self._local, "statusSession", None)
+        if session is None:
+            session = requests.Session()
+            self._local.statusSession = session
+        return session
     
     @classmethod
     def getInstance(cls) -> 'RequestUtil':
@@ -50,13 +94,21 @@ class RequestUtil:
             cls._instance = cls()
         return cls._instance
     
-    def _create_session(self) -> requests.Session:
-        """创建带重试机制的session"""
+    def _create_session(self, status_forcelist: Optional[list] = None) -> 'requests.Session':
+        """
+        创建带重试机制的session
+        
+        Args:
+            status_forcelist: 需要重试的状态码，默认为RETRY_STATUS
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         session = requests.Session()
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=self.RETRY_STATUS if status_forcelist is None else status_forcelist,
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
@@ -94,18 +146,7 @@ class RequestUtil:
                 verify=False  # 忽略SSL证书验证（与Java版本保持一致）
             )
             
-            result = {"code": str(response.status_code)}
-            
-            if response.status_code == 200:
-                result["msg"] = response.text
-            elif response.status_code == 401:
-                result["msg"] = "请求错误状态码401，可能是没有在config中配置有效的key，或者您的账号权限不足无法使用api进行查询。"
-            elif response.status_code == 502:
-                result["msg"] = "请求错误状态码502，可能是账号限制了每次请求的最大数量，建议尝试修改config中的max_size为100"
-            else:
-                result["msg"] = f"请求响应错误,状态码{response.status_code}"
-            
-            return result
+            return self.buildResult(response.status_code, response.text)
         except requests.exceptions.Timeout:
             return {"code": "error", "msg": "请求超时"}
         except requests.exceptions.RequestException as e:
@@ -113,26 +154,188 @@ class RequestUtil:
         except Exception as e:
             return {"code": "error", "msg": str(e)}
     
+    def getAPI(self, url: str, connectTimeout: int = 120000, readTimeout: int = 120000,
+               cancelEvent: Optional[threading.Event] = None, limiterName: str = "fofa",
+               raw: bool = False) -> Dict[str, str]:
+        """
+        请求FOFA API（同名限流器在所有线程间共享）
+        
+        429/503按Retry-After暂停全部API请求后重试，500/504指数退避后重试；
+        502直接返回，由调用方缩小每页条数后重试。
+        
+        Args:
+            url: 请求URL
+            connectTimeout: 连接超时时间（毫秒）
+            readTimeout: 读取超时时间（毫秒）
+            cancelEvent: 取消事件
+            limiterName: 限流器名称（多账号时每个key单独限流）
+            raw: 成功时msg为响应字节（跳过编码检测，供JSON解析器直接使用）
+        
+        Returns:
+            {"code": "200/error/其他状态码", "msg": "响应内容或错误信息"}
+        """
+        limiter = RateLimiter.getInstance(limiterName)
+        attempt = 0
+        while True:
+            if not limiter.acquire(cancelEvent):
+                return {"code": "error", "msg": "请求已取消"}
+            try:
+                response = self.apiSession.get(
+                    url,
+                    headers=self._get_headers(),
+                    proxies=self._get_proxies(),
+                    timeout=(connectTimeout / 1000, readTimeout / 1000),
+                    verify=False
+                )
+            except requests.exceptions.Timeout:
+                return {"code": "error", "msg": "请求超时"}
+            except requests.exceptions.RequestException as e:
+                return {"code": "error", "msg": str(e)}
+            except Exception as e:
+                return {"code": "error", "msg": str(e)}
+            
+            status = response.status_code
+            if status not in self.API_RETRY_STATUS or attempt >= self.API_RETRY_TOTAL:
+                # 不需要重试或重试次数用完，返回最后一次的响应
+                return self.buildResult(status, response.content if raw else response.text)
+            
+            backoff = self.API_RETRY_BACKOFF * (2 ** attempt)
+            attempt += 1
+            if status in (429, 503):
+                retry_after = RateLimiter.parseRetryAfter(response.headers.get("Retry-After"))
+                limiter.penalize(retry_after if retry_after is not None else backoff)
+            elif cancelEvent is not None:
+                if cancelEvent.wait(backoff):
+                    return {"code": "error", "msg": "请求已取消"}
+            else:
+                time.sleep(backoff)
+    
+    @staticmethod
+    def buildResult(status_code: int, text: str) -> Dict[str, str]:
+        """
+        根据状态码构造请求结果
+        
+        Args:
+            status_code: HTTP状态码
+            text: 响应内容
+        
+        Returns:
+            {"code": "状态码", "msg": "响应内容或错误信息"}
+        """
+        result = {"code": str(status_code)}
+        
+        if status_code == 200:
+            result["msg"] = text
+        elif status_code == 401:
+            result["msg"] = "请求错误状态码401，可能是没有在config中配置有效的key，或者您的账号权限不足无法使用api进行查询。"
+        elif status_code == 502:
+            result["msg"] = "请求错误状态码502，可能是账号限制了每次请求的最大数量，建议尝试修改config中的max_size为100"
+        else:
+            result["msg"] = f"请求响应错误,状态码{status_code}"
+        
+        return result
+    
+    @staticmethod
+    def replaceParam(url: str, name: str, value: str) -> str:
+        """
+        替换URL中的查询参数（参数不存在时原样返回）
+        
+        Args:
+            url: 请求URL
+            name: 参数名
+            value: 新的参数值
+        """
+        return re.sub(rf"(?<=[?&]){re.escape(name)}=[^&]*", lambda _: f"{name}={value}", url, count=1)
+    
+    @staticmethod
+    def checkUrl(url: str) -> Optional[str]:
+        """
+        验证URL
+        
+        Args:
+            url: 待验证的URL
+        
+        Returns:
+            错误信息，URL有效时为None
+        """
+        if not url:
+            return "无效的URL"
+        if len(url) > 2048:  # 防止URL过长攻击
+            return "URL过长"
+        parsed = urlparse(url)
+        if parsed.scheme not in ['http', 'https']:
+            return "不支持的协议"
+        if not parsed.netloc:
+            return "无效的URL"
+        return None
+    
+    def buildFaviconResult(self, content: bytes) -> Dict[str, str]:
+        """
+        计算favicon内容的hash
+        
+        Args:
+            content: favicon原始内容
+        
+        Returns:
+            {"code": "200/error", "msg": "icon_hash=\"xxx\"" 或错误信息}
+        """
+        if len(content) == 0:
+            return {"code": "error", "msg": "无响应内容"}
+        
+        # Base64编码
+        encoded = base64.b64encode(content).decode('utf-8')
+        # 计算icon hash (murmurhash3)
+        hash_value = self.getIconHash(encoded)
+        return {"code": "200", "msg": f'icon_hash="{hash_value}"'}
+    
+    @staticmethod
+    def parseLinkIcon(html: str, url: str) -> Optional[str]:
+        """
+        从HTML中解析favicon链接
+        
+        Args:
+            html: 网页内容
+            url: 网页URL（用于拼接相对路径）
+        
+        Returns:
+            favicon链接或None
+        """
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        links = soup.find_all('link')
+        
+        for link in links:
+            rel = link.get('rel', [])
+            if isinstance(rel, list):
+                rel = ' '.join(rel)
+            if rel in ['icon', 'shortcut icon']:
+                href = link.get('href', '')
+                if not href:
+                    continue
+                # 验证href长度
+                if len(href) > 2048:
+                    continue
+                if href.startswith('http'):
+                    return href
+                elif href.startswith('/'):
+                    parsed = urlparse(url)
+                    return f"{parsed.scheme}://{parsed.netloc}{href}"
+        
+        return None
+    
     def getLeftAmount(self, url: str, connectTimeout: int = 120000, readTimeout: int = 120000) -> Dict[str, str]:
         """获取剩余查询量"""
         try:
-            response = self.session.get(
-                url,
-                headers=self._get_headers(),
-                proxies=self._get_proxies(),
-                timeout=(connectTimeout / 1000, readTimeout / 1000),
-                verify=False
-            )
-            
-            if response.status_code == 200:
+            result = self.getAPI(url, connectTimeout, readTimeout)
+            if result["code"] == "200":
                 import json
-                obj = json.loads(response.text)
+                obj = json.loads(result["msg"])
                 remain_api_query = obj.get("remain_api_query", 0)
                 remain_api_data = obj.get("remain_api_data", 0)
                 msg = f"剩余查询量: {remain_api_query}  剩余数据量: {remain_api_data}"
                 return {"code": "200", "msg": msg}
-            else:
-                return {"code": str(response.status_code), "msg": response.text}
+            return result
         except Exception as e:
             return {"code": "error", "msg": str(e)}
     
@@ -142,28 +345,15 @@ class RequestUtil:
         
         Args:
             url: favicon URL
-            
+        
         Returns:
             {"code": "200/error", "msg": "icon_hash=\"xxx\"" 或错误信息}
         """
         try:
             # 验证URL格式
-            if not url or len(url) > 2048:
-                return {"code": "error", "msg": "无效的URL"}
-            
-            # 验证URL安全性
-            parsed = urlparse(url)
-            if parsed.scheme not in ['http', 'https']:
-                return {"code": "error", "msg": "不支持的协议"}
-            
-            # 验证URL格式
-            parsed = urlparse(url)
-            if not parsed.scheme or parsed.scheme not in ['http', 'https']:
-                return {"code": "error", "msg": "无效的URL协议"}
-            if not parsed.netloc:
-                return {"code": "error", "msg": "无效的URL"}
-            if len(url) > 2048:  # 防止URL过长攻击
-                return {"code": "error", "msg": "URL过长"}
+            error = self.checkUrl(url)
+            if error:
+                return {"code": "error", "msg": error}
             
             # 注意：verify=False存在安全风险，但为了兼容某些情况，暂时保留
             response = self.session.get(
@@ -177,21 +367,13 @@ class RequestUtil:
             
             if response.status_code == 200:
                 # 限制文件大小（防止内存溢出）
-                max_size = 5 * 1024 * 1024  # 5MB
                 content = b""
                 for chunk in response.iter_content(chunk_size=8192):
                     content += chunk
-                    if len(content) > max_size:
+                    if len(content) > self.MAX_FAVICON_SIZE:
                         return {"code": "error", "msg": "文件过大"}
                 
-                if len(content) == 0:
-                    return {"code": "error", "msg": "无响应内容"}
-                
-                # Base64编码
-                encoded = base64.b64encode(content).decode('utf-8')
-                # 计算icon hash (murmurhash3)
-                hash_value = self.getIconHash(encoded)
-                return {"code": "200", "msg": f'icon_hash="{hash_value}"'}
+                return self.buildFaviconResult(content)
             else:
                 return {"code": "error", "msg": f"HTTP {response.status_code}"}
         except requests.exceptions.Timeout:
@@ -207,17 +389,13 @@ class RequestUtil:
         
         Args:
             url: 网页URL
-            
+        
         Returns:
             favicon链接或None
         """
         try:
             # 验证URL格式
-            if not url or len(url) > 2048:
-                return None
-            
-            parsed = urlparse(url)
-            if parsed.scheme not in ['http', 'https']:
+            if self.checkUrl(url):
                 return None
             
             response = self.session.get(
@@ -231,34 +409,13 @@ class RequestUtil:
             
             if response.status_code == 200:
                 # 限制HTML大小
-                max_size = 10 * 1024 * 1024  # 10MB
                 content = b""
                 for chunk in response.iter_content(chunk_size=8192):
                     content += chunk
-                    if len(content) > max_size:
+                    if len(content) > self.MAX_HTML_SIZE:
                         return None
                 
-                soup = BeautifulSoup(content.decode('utf-8', errors='ignore'), 'html.parser')
-                links = soup.find_all('link')
-                
-                for link in links:
-                    rel = link.get('rel', [])
-                    if isinstance(rel, list):
-                        rel = ' '.join(rel)
-                    if rel in ['icon', 'shortcut icon']:
-                        href = link.get('href', '')
-                        if not href:
-                            continue
-                        # 验证href长度
-                        if len(href) > 2048:
-                            continue
-                        if href.startswith('http'):
-                            return href
-                        elif href.startswith('/'):
-                            parsed = urlparse(url)
-                            return f"{parsed.scheme}://{parsed.netloc}{href}"
-                
-                return None
+                return self.parseLinkIcon(content.decode('utf-8', errors='ignore'), url)
         except requests.exceptions.Timeout:
             return None
         except requests.exceptions.RequestException:
@@ -266,18 +423,52 @@ class RequestUtil:
         except Exception:
             return None
     
+    def getStatus(self, url: str, timeout: float = 5) -> Dict[str, str]:
+        """
+        检测网站存活（HEAD请求，不支持时改用GET只读取响应头；不跟随跳转）
+        
+        Args:
+            url: 网站URL
+            timeout: 超时时间（秒）
+        
+        Returns:
+            {"code": "状态码/error", "msg": "错误信息"}
+        """
+        error = self.checkUrl(url)
+        if error:
+            return {"code": "error", "msg": error}
+        try:
+            options = dict(
+                headers=self._get_headers(),
+                proxies=self._get_proxies(),
+                timeout=timeout,
+                verify=False,
+                allow_redirects=False
+            )
+            response = self.statusSession.head(url, **options)
+            if response.status_code in self.HEAD_UNSUPPORTED:
+                with self.statusSession.get(url, stream=True, **options) as response:
+                    pass
+            return {"code": str(response.status_code), "msg": ""}
+        except requests.exceptions.Timeout:
+            return {"code": "error", "msg": self.TIMEOUT_MESSAGE}
+        except Exception as e:
+            return {"code": "error", "msg": str(e)}
+    
     def getIconHash(self, content: str) -> str:
         """
         计算favicon hash值（murmurhash3）
         
         Args:
             content: Base64编码的favicon内容
-            
+        
         Returns:
             hash值字符串
         """
         # 移除\r，添加\n
         content = content.replace('\r', '') + '\n'
+        import mmh3  # murmurhash3 for icon hash
+        
         # 使用mmh3计算murmurhash3
         hash_value = mmh3.hash(content.encode('utf-8'))
         # 转换为无符号32位整数
@@ -291,72 +482,129 @@ class RequestUtil:
         
         Args:
             host: 域名
-            
+        
         Returns:
             cert="序列号" 或 None
         """
         try:
-            # 验证host格式
-            if not host or len(host) > 255:
-                return None
-            
-            # 移除协议前缀
-            clean_host = host.replace('https://', '').replace('http://', '').strip()
-            if not clean_host:
-                return None
-            
-            # 防止注入攻击：移除危险字符
-            dangerous_chars = ['<', '>', '"', "'", '&', '|', ';', '`', '$', '(', ')']
-            if any(char in clean_host for char in dangerous_chars):
-                return None
-            
-            # 解析hostname和port
-            if ':' in clean_host:
-                parts = clean_host.split(':')
-                hostname = parts[0]
-                try:
-                    port = int(parts[1])
-                except (ValueError, IndexError):
-                    port = 443
-            else:
-                hostname = clean_host
-                port = 443
-            
-            # 验证hostname格式
-            if not hostname or len(hostname) > 253:
+            target = self.parseHostPort(host)
+            if not target:
                 return None
-            
-            # 验证端口范围
-            if port < 1 or port > 65535:
-                return None
-            
-            # 创建SSL上下文
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+            hostname, port = target
             
             # 连接到服务器获取证书（设置超时）
             with socket.create_connection((hostname, port), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                with self.createSSLContext().wrap_socket(sock, server_hostname=hostname) as ssock:
                     cert_der = ssock.getpeercert(True)
                     if not cert_der:
                         return None
-                    cert = x509.load_der_x509_certificate(cert_der, default_backend())
-                    serial = cert.serial_number
-                    return f'cert="{serial}"'
+                    cert = self.parseCertificate(cert_der)
+                    return f'cert="{cert.serial}"'
         except (socket.timeout, socket.error):
             return None
         except Exception as e:
             # 记录错误但不抛出
             return None
     
+    @staticmethod
+    def parseHostPort(host: str, defaultPort: int = 443) -> Optional[Tuple[str, int]]:
+        """
+        解析并验证host中的hostname和端口
+        
+        Args:
+            host: host（可带协议前缀和端口）
+            defaultPort: 未带端口时使用的端口
+        
+        Returns:
+            (hostname, port)，host无效时为None
+        """
+        # 验证host格式
+        if not host or len(host) > 255:
+            return None
+        
+        # 移除协议前缀
+        clean_host = host.replace('https://', '').replace('http://', '').strip().rstrip('/')
+        if not clean_host:
+            return None
+        
+        # 防止注入攻击：移除危险字符
+        dangerous_chars = ['<', '>', '"', "'", '&', '|', ';', '`', '$', '(', ')']
+        if any(char in clean_host for char in dangerous_chars):
+            return None
+        
+        # 解析hostname和port
+        if ':' in clean_host:
+            parts = clean_host.split(':')
+            hostname = parts[0]
+            try:
+                port = int(parts[1])
+            except (ValueError, IndexError):
+                port = defaultPort
+        else:
+            hostname = clean_host
+            port = defaultPort
+        
+        # 验证hostname格式
+        if not hostname or len(hostname) > 253:
+            return None
+        
+        # 验证端口范围
+        if port < 1 or port > 65535:
+            return None
+        
+        return hostname, port
+    
+    @staticmethod
+    def createSSLContext() -> ssl.SSLContext:
+        """创建不验证证书的SSL上下文（只用于读取证书）"""
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    
+    @staticmethod
+    def parseCertificate(cert_der: bytes) -> CertBean:
+        """
+        解析DER格式证书
+        
+        Args:
+            cert_der: DER格式证书
+        
+        Returns:
+            证书信息（序列号、主题CN/O、SAN）
+        """
+        from cryptography import x509
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.x509.oid import NameOID
+        
+        cert = x509.load_der_x509_certificate(cert_der, default_backend())
+        
+        def subject(oid) -> str:
+            values = cert.subject.get_attributes_for_oid(oid)
+            return str(values[0].value) if values else ""
+        
+        sans = []
+        try:
+            ext = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+            sans = [str(name) for name in ext.get_values_for_type(x509.DNSName)]
+            sans += [str(ip) for ip in ext.get_values_for_type(x509.IPAddress)]
+        except x509.ExtensionNotFound:
+            pass
+        
+        return CertBean(
+            serial=str(cert.serial_number),
+            cn=subject(NameOID.COMMON_NAME),
+            org=subject(NameOID.ORGANIZATION_NAME),
+            sans=sans
+        )
+    
     def getTips(self, key: str) -> Optional[Dict[str, str]]:
         """
         获取自动提示
         
         Args:
             key: 查询关键词
-            
+        
         Returns:
             {提示名称: 查询语句} 或 None
         """
@@ -0,0 +1,292 @@
+"""
+查询分片工具类（突破单次查询的结果上限）
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from main.config import FofaConfig
+from models.table_bean import PageBean, ShardBean
+from utils.page_util import PaginationEngine
+from utils.request_util import RequestUtil
+
+
+class ShardPlanner:
+    """
+    查询分片规划器
+    
+    先探测查询的结果总数，超过单次查询上限时依次按国家、协议、端口拆分，
+    最后按更新时间（after/before）二分，递归直到每个分片都不超过上限。
+    枚举维度会额外生成一个排除全部枚举值的"其余"分片，时间维度会额外生成一个
+    DATE_START之前的分片，保证分片之间不重叠且覆盖完整。
+    每次探测消耗一次API查询，探测次数不超过maxProbes。
+    """
+    
+    # 拆分维度 (字段, 枚举值)
+    DIMENSIONS = [
+        ("country", ["CN", "US", "JP", "DE", "KR", "HK", "GB", "FR", "SG", "RU", "NL", "BR", "IN", "CA", "TW", "AU"]),
+        ("protocol", ["http", "https", "ssh", "ftp", "mysql", "rdp", "telnet", "smtp"]),
+        ("port", ["80", "443", "8080", "22", "21", "3389", "8443", "8000", "8888", "3306"]),
+    ]
+    
+    # 时间二分的起始日期
+    DATE_START = date(2015, 1, 1)
+    
+    # 探测次数上限
+    MAX_PROBES = 200
+    
+    # 并发探测数
+    PROBE_CONCURRENCY = 4
+    
+    def __init__(self, query: str, additionalField: List[str], isAll: bool = False,
+                 cap: Optional[int] = None, maxProbes: int = MAX_PROBES):
+        """
+        Args:
+            query: 查询语句
+            additionalField: 额外字段
+            isAll: 是否查询全部数据
+            cap: 单个分片的结果上限，默认为FofaConfig.max
+            maxProbes: 探测次数上限
+        """
+        self.config = FofaConfig.getInstance()
+        self.query = query
+        self.additionalField = list(additionalField)
+        self.isAll = isAll
+        self.cap = cap or self.config.max
+        self.maxProbes = maxProbes
+        self.probes = 0
+        self.total = 0
+        self.errors: List[str] = []
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        """取消规划"""
+        self._cancel.set()
+    
+    def buildUrl(self, query: str, size: Optional[str] = None) -> str:
+        """构建查询URL（不带next游标）"""
+        encoded_query = RequestUtil.getInstance().encode(query)
+        return self.config.getParam(self.isAll, size, self.additionalField) + encoded_query
+    
+    def probe(self, shard: ShardBean) -> Optional[str]:
+        """
+        探测分片的结果总数（只请求1条）
+        
+        Returns:
+            错误信息，成功时为None
+        """
+        with self._lock:
+            self.probes += 1
+        page = PaginationEngine(self.buildUrl(shard.query, "1")).fetchPage()
+        if page.error:
+            return page.error
+        shard.total = page.total
+        return None
+    
+    def _constrained(self, name: str) -> bool:
+        """查询语句是否已经限定了该字段"""
+        return re.search(rf'\b{name}\s*!?=', self.query) is not None
+    
+    def split(self, shard: ShardBean) -> Optional[List[ShardBean]]:
+        """
+        拆分分片
+        
+        Returns:
+            子分片列表，无法继续拆分时为None
+        """
+        dimension = shard.dimension
+        while dimension < len(self.DIMENSIONS):
+            name, values = self.DIMENSIONS[dimension]
+            dimension += 1
+            if self._constrained(name):
+                continue
+            children = [
+                ShardBean(conditions=shard.conditions + [f'{name}="{value}"'], dimension=dimension)
+                for value in values
+            ]
+            rest = " && ".join(f'{name}!="{value}"' for value in values)
+            children.append(ShardBean(conditions=shard.conditions + [rest], dimension=dimension))
+            return children
+        
+        # 按时间窗口二分
+        if self._constrained("after") or self._constrained("before"):
+            return None
+        start, end = shard.window or (self.DATE_START, date.today() + timedelta(days=1))
+        # DATE_START之前的分片没有起始时间，无法二分
+        if start is None or (end - start).days < 2:
+            return None
+        middle = start + (end - start) // 2
+        windows = [(start, middle), (middle, end)]
+        if shard.window is None:
+            windows.append((None, self.DATE_START))
+        return [
+            ShardBean(conditions=shard.conditions, dimension=dimension, window=window)
+            for window in windows
+        ]
+    
+    def plan(self) -> List[ShardBean]:
+        """
+        规划分片（阻塞，逐层并发探测）
+        
+        Returns:
+            分片列表；无法拆分到上限以内或探测失败的分片标记为truncated
+        
+        Raises:
+            RuntimeError: 探测整个查询失败
+        """
+        root = ShardBean()
+        root.query = self.query
+        error = self.probe(root)
+        if error:
+            raise RuntimeError(error)
+        self.total = root.total
+        
+        shards = []
+        pending = [root]
+        with ThreadPoolExecutor(max_workers=self.PROBE_CONCURRENCY) as executor:
+            while pending and not self._cancel.is_set():
+                children = []
+                for shard in pending:
+                    if shard.total <= self.cap:
+                        shards.append(shard)
+                        continue
+                    parts = self.split(shard)
+                    if parts is None or self.probes + len(children) + len(parts) > self.maxProbes:
+                        shard.truncated = True
+                        shard.probeLimited = parts is not None
+                        shards.append(shard)
+                        continue
+                    for part in parts:
+                        part.query = self.buildQuery(part)
+                    children.extend(parts)
+                
+                for shard, error in zip(children, executor.map(self.probe, children)):
+                    if error:
+                        # 探测失败的分片总数未知，不再拆分，按上限拉取
+                        self.errors.append(f"{shard.query}: {error}")
+                        shard.total = self.cap
+                        shard.truncated = shard.probeFailed = True
+                pending = [shard for shard in children if shard.total > 0]
+        return shards
+    
+    def describeTruncated(self, shards: List[ShardBean]) -> str:
+        """
+        说明无法完整拉取的分片（区分无法拆分、探测次数用完和探测失败）
+        
+        Args:
+            shards: plan返回的分片列表
+        
+        Returns:
+            说明文字，没有这样的分片时为空字符串
+        """
+        failed = sum(1 for shard in shards if shard.probeFailed)
+        limited = sum(1 for shard in shards if shard.probeLimited)
+        unsplittable = sum(1 for shard in shards if shard.truncated) - failed - limited
+        parts = []
+        if unsplittable:
+            parts.append(f"{unsplittable} 个分片无法继续拆分")
+        if limited:
+            parts.append(f"{limited} 个分片因探测次数达到上限（{self.maxProbes}）未继续拆分")
+        if failed:
+            parts.append(f"{failed} 个分片探测失败")
+        if not parts:
+            return ""
+        return "，".join(parts) + f"，只拉取前 {self.cap} 条"
+    
+    def buildQuery(self, shard: ShardBean) -> str:
+        """
+        拼接分片的查询语句
+        
+        时间窗口[start, end)写作after="start前一天" && before="end"：
+        不论FOFA的after/before是否包含当天，相邻窗口之间都不会有遗漏的日期，
+        重叠的一天由去重索引去掉。
+        """
+        conditions = list(shard.conditions)
+        if shard.window:
+            start, end = shard.window
+            if start is None:
+                conditions.append(f'before="{end.isoformat()}"')
+            else:
+                after = start - timedelta(days=1)
+                conditions.append(f'after="{after.isoformat()}" && before="{end.isoformat()}"')
+        if not conditions:
+            return self.query
+        return f"({self.query}) && " + " && ".join(conditions)
+
+
+class ShardRunner:
+    """
+    并发拉取分片
+    
+    每个分片独立翻页，总拉取条数不超过budget（按分片开始时预留）。
+    """
+    
+    # 并发拉取的分片数
+    CONCURRENCY = 4
+    
+    def __init__(self, planner: ShardPlanner, shards: List[ShardBean], budget: int = 0,
+                 concurrency: int = CONCURRENCY):
+        """
+        Args:
+            planner: 分片规划器（用于构建URL）
+            shards: 分片列表
+            budget: 总拉取条数上限，0表示不限制
+            concurrency: 并发拉取的分片数
+        """
+        self.planner = planner
+        self.shards = sorted(shards, key=lambda shard: shard.total, reverse=True)
+        self.budget = budget
+        self.concurrency = max(1, concurrency)
+        self.reserved = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._engines: List[PaginationEngine] = []
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        """取消拉取"""
+        self._cancel.set()
+        with self._lock:
+            for engine in self._engines:
+                engine.cancel()
+    
+    def _reserve(self, shard: ShardBean) -> int:
+        """预留分片的拉取条数，预算用完时为0"""
+        limit = min(shard.total, self.planner.cap)
+        with self._lock:
+            if self.budget:
+                limit = min(limit, self.budget - self.reserved)
+            limit = max(limit, 0)
+            self.reserved += limit
+            if limit == 0:
+                self.skipped += 1
+        return limit
+    
+    def _runShard(self, shard: ShardBean, onPage: Callable[[ShardBean, PageBean], None]):
+        """拉取单个分片"""
+        if self._cancel.is_set():
+            return
+        limit = self._reserve(shard)
+        if limit == 0:
+            return
+        engine = PaginationEngine(self.planner.buildUrl(shard.query), limit)
+        with self._lock:
+            self._engines.append(engine)
+        if self._cancel.is_set():
+            return
+        for page in engine.pages():
+            onPage(shard, page)
+    
+    def run(self, onPage: Callable[[ShardBean, PageBean], None]):
+        """
+        执行拉取（阻塞直到全部分片完成或取消）
+        
+        Args:
+            onPage: 每页回调（在工作线程中调用），参数为(分片, 页)
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(self._runShard, shard, onPage) for shard in self.shards]:
+                future.result()
@@ -0,0 +1,251 @@
+"""
+后台任务调度器
+"""
+import threading
+import time
+from enum import IntEnum
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class TaskPriority(IntEnum):
+    """任务优先级（数值越大越先执行）"""
+    EXPORT = 0  # 批量导出
+    ENRICH = 1  # 批量补充数据
+    QUERY = 2  # 交互查询
+
+
+class TaskState:
+    """任务状态"""
+    QUEUED = "等待中"
+    RUNNING = "运行中"
+    CANCELLING = "正在取消"
+    FINISHED = "已完成"
+    CANCELLED = "已取消"
+    FAILED = "失败"
+
+
+class Task(QObject):
+    """
+    后台任务基类
+    
+    子类必须实现run（在工作线程中执行，需定期检查isCancelled）并按需重写cancel，
+    通过自定义Signal把结果送回主线程。任务结束后发出finished；
+    run抛出异常时任务状态为FAILED，异常信息保存在error中。
+    """
+    finished = Signal()
+    
+    PRIORITY = TaskPriority.ENRICH
+    
+    # 短任务（单次请求等）使用单独的线程池，不排在翻页、导出等长任务之后
+    SHORT = False
+    
+    def __init__(self, title: str, owner: Optional[str] = None):
+        """
+        Args:
+            title: 任务名称（显示在任务队列中）
+            owner: 所属Tab标题，Tab关闭时取消任务；None表示不属于任何Tab
+        """
+        if type(self).run is Task.run:
+            raise TypeError(f"{type(self).__name__}未实现run")
+        super().__init__()
+        self.title = title
+        self.owner = owner
+        self.priority = self.PRIORITY
+        self.state = TaskState.QUEUED
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.error = ""
+        self.cancelEvent = threading.Event()
+    
+    def run(self):
+        """执行任务（工作线程，抽象方法，子类必须实现）"""
+    
+    def cancel(self):
+        """请求取消（子类重写时需调用父类方法）"""
+        self.cancelEvent.set()
+    
+    def isCancelled(self) -> bool:
+        """是否已请求取消"""
+        return self.cancelEvent.is_set()
+    
+    def isRunning(self) -> bool:
+        """是否正在执行或等待执行"""
+        return self.state in (TaskState.QUEUED, TaskState.RUNNING, TaskState.CANCELLING)
+
+
+class _TaskRunnable(QRunnable):
+    """在线程池中执行任务"""
+    
+    def __init__(self, scheduler: 'TaskScheduler', task: Task):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.scheduler = scheduler
+        self.task = task
+    
+    def run(self):
+        self.scheduler._execute(self.task)
+
+
+class TaskScheduler(QObject):
+    """
+    后台任务调度器
+    
+    长任务（翻页、分片、导出、批量补充数据）共用一个有界线程池，
+    等待中的任务按优先级出队（交互查询 > 批量补充数据 > 批量导出）；
+    短任务另用一个线程池，长任务占满工作线程时也不用等待。取消是协作式的：
+    等待中的任务直接移出队列，运行中的任务由自身的cancel停止。
+    
+    线程池只限制同时运行的任务数，任务内部另起的线程（翻页引擎的预取线程、
+    分片规划的探测线程和分片拉取线程）不计入。
+    """
+    changed = Signal()  # 任务列表或状态变化（用于任务队列视图）
+    failed = Signal(object, str)  # 任务执行失败(任务, 错误信息)，在工作线程中发出
+    
+    _instance: Optional['TaskScheduler'] = None
+    
+    # 长任务的工作线程数上限
+    MAX_WORKERS = 8
+    
+    # 短任务的工作线程数上限
+    SHORT_WORKERS = 4
+    
+    # 已结束任务在队列视图中的保留数量
+    KEEP_FINISHED = 50
+    
+    def __init__(self, maxWorkers: int = MAX_WORKERS, shortWorkers: int = SHORT_WORKERS):
+        """
+        Args:
+            maxWorkers: 长任务的工作线程数上限
+            shortWorkers: 短任务的工作线程数上限
+        """
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(maxWorkers)
+        self.shortPool = QThreadPool()
+        self.shortPool.setMaxThreadCount(shortWorkers)
+        self._tasks: List[Task] = []
+        self._runnables = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def getInstance(cls) -> 'TaskScheduler':
+        """单例模式获取调度器实例（需在主线程首次调用）"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def submit(self, task: Task) -> Task:
+        """
+        提交任务
+        
+        Args:
+            task: 任务（信号需在提交前连接）
+        
+        Returns:
+            同一个任务
+        """
+        runnable = _TaskRunnable(self, task)
+        with self._lock:
+            self._tasks.append(task)
+            self._runnables[id(task)] = runnable
+        task.finished.connect(self._onFinished)
+        self._poolOf(task).start(runnable, int(task.priority))
+        self.changed.emit()
+        return task
+    
+    def _poolOf(self, task: Task) -> QThreadPool:
+        """任务所在的线程池"""
+        return self.shortPool if task.SHORT else self.pool
+    
+    def _execute(self, task: Task):
+        """工作线程中执行任务"""
+        with self._lock:
+            if task.state != TaskState.QUEUED:
+                return
+            task.state = TaskState.RUNNING
+            task.started = time.time()
+        self.changed.emit()
+        try:
+            if not task.isCancelled():
+                task.run()
+        except Exception as e:
+            task.error = str(e) or type(e).__name__
+        finally:
+            with self._lock:
+                if task.error:
+                    task.state = TaskState.FAILED
+                elif task.isCancelled():
+                    task.state = TaskState.CANCELLED
+                else:
+                    task.state = TaskState.FINISHED
+                task.ended = time.time()
+            if task.error:
+                self.failed.emit(task, task.error)
+            task.finished.emit()
+    
+    def _onFinished(self):
+        """任务结束（主线程）"""
+        with self._lock:
+            self._runnables = {
+                key: runnable for key, runnable in self._runnables.items()
+                if runnable.task.isRunning()
+            }
+            finished = [task for task in self._tasks if not task.isRunning()]
+            for task in finished[:-self.KEEP_FINISHED or None]:
+                self._tasks.remove(task)
+        self.changed.emit()
+    
+    def cancel(self, task: Task):
+        """取消任务（等待中的任务直接移出队列）"""
+        with self._lock:
+            runnable = self._runnables.get(id(task))
+            queued = task.state == TaskState.QUEUED
+            if queued and runnable is not None and self._poolOf(task).tryTake(runnable):
+                task.state = TaskState.CANCELLED
+                task.ended = time.time()
+            elif task.state == TaskState.RUNNING:
+                task.state = TaskState.CANCELLING
+            else:
+                queued = False
+        task.cancel()
+        if queued and task.state == TaskState.CANCELLED:
+            task.finished.emit()
+        self.changed.emit()
+    
+    def cancelOwner(self, owner: str):
+        """取消属于指定Tab的全部任务（Tab关闭时调用）"""
+        for task in self.tasks():
+            if task.owner == owner and task.isRunning():
+                self.cancel(task)
+    
+    def tasks(self) -> List[Task]:
+        """全部任务（含最近结束的任务）"""
+        with self._lock:
+            return list(self._tasks)
+    
+    def activeCount(self) -> int:
+        """等待中和运行中的任务数"""
+        return sum(1 for task in self.tasks() if task.isRunning())
+    
+    def shutdown(self, timeout: int = 3000) -> bool:
+        """
+        取消全部任务并等待工作线程退出（程序退出时调用）
+        
+        Args:
+            timeout: 等待时间（毫秒）
+        
+        Returns:
+            是否全部退出
+        """
+        for task in self.tasks():
+            if task.isRunning():
+                self.cancel(task)
+        self.pool.clear()
+        self.shortPool.clear()
+        deadline = time.monotonic() + timeout / 1000
+        done = self.pool.waitForDone(timeout)
+        remaining = max(0, int((deadline - time.monotonic()) * 1000))
+        return self.shortPool.waitForDone(remaining) and done
@@ -1,6 +1,7 @@
 """
 主题管理器
 """
+from dataclasses import dataclass
 from enum import Enum
 from typing import Dict
 from PySide6.QtCore import Qt
@@ -13,6 +14,14 @@ class ThemeMode(Enum):
     WHITE = "white"    # 白色主题（浅色主题，白色背景）
 
 
+@dataclass(frozen=True)
+class ThemeBundle:
+    """预编译的主题（样式表和调色板）"""
+    mode: ThemeMode
+    styleSheet: str
+    palette: QPalette
+
+
 class ThemeManager:
     """主题管理器"""
     
@@ -21,6 +30,7 @@ class ThemeManager:
     
     def __init__(self):
         self.mode = ThemeMode.COMMON
+        self._bundles: Dict[ThemeMode, ThemeBundle] = {}
         self._initColors()
     
     def _initColors(self):
@@ -89,43 +99,25 @@ class ThemeManager:
         else:
             return self.common_colors
     
-    def applyTheme(self, widget):
-        """应用主题到widget"""
-        # 根据主题更新UIStyle的颜色
-        from utils.ui_style import UIStyle
-        
-        if self._current_mode == ThemeMode.COMMON:
-            # 常用主题（深色）- 恢复默认深色值
-            UIStyle.BG_PRIMARY = "#1E1E2A"
-            UIStyle.BG_SECONDARY = "#252837"
-            UIStyle.BG_CARD = "#2A2D3A"
-            UIStyle.BG_INPUT = "#2A2D3A"
-            UIStyle.BG_DIVIDER = "#313445"
-            UIStyle.TEXT_PRIMARY = "#FFFFFF"
-            UIStyle.TEXT_SECONDARY = "#A9B2C1"
-        elif self._current_mode == ThemeMode.WHITE:
-            # 白色主题 - 更新为浅色值
-            UIStyle.BG_PRIMARY = "#FFFFFF"
-            UIStyle.BG_SECONDARY = "#FFFFFF"
-            UIStyle.BG_CARD = "#F5F5FA"
-            UIStyle.BG_INPUT = "#F5F5FA"
-            UIStyle.BG_DIVIDER = "#DCDCE6"
-            UIStyle.TEXT_PRIMARY = "#1E1E2A"
-            UIStyle.TEXT_SECONDARY = "#646478"
-        else:
-            # 默认使用深色主题
-            UIStyle.BG_PRIMARY = "#1E1E2A"
-            UIStyle.BG_SECONDARY = "#252837"
-            UIStyle.BG_CARD = "#2A2D3A"
-            UIStyle.BG_INPUT = "#2A2D3A"
-            UIStyle.BG_DIVIDER = "#313445"
-            UIStyle.TEXT_PRIMARY = "#FFFFFF"
-            UIStyle.TEXT_SECONDARY = "#A9B2C1"
-        
-        # 设置调色板
-        palette = widget.palette()
-        colors = self.getColors()
-        
+    def getBundle(self) -> ThemeBundle:
+        """当前主题的样式表和调色板（每个主题只编译一次）"""
+        bundle = self._bundles.get(self._current_mode)
+        if bundle is None:
+            from utils.ui_style import UIStyle
+            
+            UIStyle.useTheme(self._current_mode.value)
+            bundle = ThemeBundle(
+                mode=self._current_mode,
+                styleSheet=UIStyle.getMainStyleSheet(),
+                palette=self._buildPalette(self.getColors()),
+            )
+            self._bundles[self._current_mode] = bundle
+        return bundle
+    
+    @staticmethod
+    def _buildPalette(colors: Dict[str, QColor]) -> QPalette:
+        """根据主题颜色生成调色板"""
+        palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, colors["background"])
         palette.setColor(QPalette.ColorRole.WindowText, colors["text"])
         palette.setColor(QPalette.ColorRole.Base, colors["surface"])
@@ -135,5 +127,20 @@ class ThemeManager:
         palette.setColor(QPalette.ColorRole.ButtonText, colors["text"])
         palette.setColor(QPalette.ColorRole.Highlight, colors["primary"])
         palette.setColor(QPalette.ColorRole.HighlightedText, colors["text"])
+        return palette
+    
+    def applyTheme(self, target):
+        """
+        应用主题（样式表和调色板只设置在target上，子组件继承，不再逐个设置）
+        
+        Args:
+            target: 顶层窗口（或QApplication）
+        """
+        from utils.ui_style import UIStyle
+        
+        # 自绘组件在绘制时读取UIStyle的颜色
+        UIStyle.useTheme(self._current_mode.value)
         
-        widget.setPalette(palette)
+        bundle = self.getBundle()
+        target.setPalette(bundle.palette)
+        target.setStyleSheet(bundle.styleSheet)
@@ -34,6 +34,34 @@ class UIStyle:
     RADIUS_MEDIUM = 12
     RADIUS_LARGE = 16
     
+    # 各主题的颜色（键为ThemeMode的值）
+    THEME_COLORS = {
+        "common": {
+            "BG_PRIMARY": "#1E1E2A",
+            "BG_SECONDARY": "#252837",
+            "BG_CARD": "#2A2D3A",
+            "BG_INPUT": "#2A2D3A",
+            "BG_DIVIDER": "#313445",
+            "TEXT_PRIMARY": "#FFFFFF",
+            "TEXT_SECONDARY": "#A9B2C1",
+        },
+        "white": {
+            "BG_PRIMARY": "#FFFFFF",
+            "BG_SECONDARY": "#FFFFFF",
+            "BG_CARD": "#F5F5FA",
+            "BG_INPUT": "#F5F5FA",
+            "BG_DIVIDER": "#DCDCE6",
+            "TEXT_PRIMARY": "#1E1E2A",
+            "TEXT_SECONDARY": "#646478",
+        },
+    }
+    
+    @classmethod
+    def useTheme(cls, theme: str):
+        """切换当前颜色（自绘组件在绘制时读取），未知主题使用深色主题"""
+        for name, value in cls.THEME_COLORS.get(theme, cls.THEME_COLORS["common"]).items():
+            setattr(cls, name, value)
+    
     @staticmethod
     def getMainStyleSheet() -> str:
         """获取主样式表"""
@@ -151,7 +179,7 @@ class UIStyle:
             }}
             
             /* 表格 */
-            QTableWidget {{
+            QTableView {{
                 background-color: {UIStyle.BG_SECONDARY};
                 border: 2px solid {UIStyle.BG_DIVIDER};
                 border-radius: {UIStyle.RADIUS_LARGE}px;
@@ -160,14 +188,14 @@ class UIStyle:
                 selection-color: {UIStyle.TEXT_PRIMARY};
             }}
             
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 10px;
                 border: none;
                 background-color: {UIStyle.BG_SECONDARY};
                 color: {UIStyle.TEXT_PRIMARY};
             }}
             
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {UIStyle.BTN_GRADIENT_START};
                 color: {UIStyle.TEXT_PRIMARY};
             }}
@@ -187,7 +215,7 @@ class UIStyle:
                 background-color: rgba(42, 45, 58, 0.8);
                 color: {UIStyle.TEXT_SECONDARY};
                 border-top: 1px solid {UIStyle.BG_DIVIDER};
-                padding: 5px;
+                padding: 8px;
             }}
             
             /* GroupBox */
@@ -227,8 +255,72 @@ class UIStyle:
             }}
             
             /* 表格内容 */
-            QTableWidget {{
+            QTableView {{
                 font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", "Arial", sans-serif;
             }}
+            
+            /* 查询区域卡片 */
+            #queryCard, #queryCard QWidget {{
+                background-color: {UIStyle.BG_CARD};
+                border-radius: {UIStyle.RADIUS_LARGE}px;
+                padding: 15px;
+            }}
+            
+            /* 命令指南 */
+            #commandGuideTitle {{
+                font-size: 16px;
+                font-weight: bold;
+                color: {UIStyle.TEXT_PRIMARY};
+                padding: 10px;
+                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
+            }}
+            
+            #commandGuide QScrollArea {{
+                border: 2px solid {UIStyle.BG_DIVIDER};
+                border-radius: {UIStyle.RADIUS_MEDIUM}px;
+                background-color: {UIStyle.BG_CARD};
+            }}
+            
+            #commandGuide QScrollBar:vertical {{
+                background-color: {UIStyle.BG_SECONDARY};
+                width: 12px;
+                border-radius: 6px;
+            }}
+            
+            #commandGuide QScrollBar::handle:vertical {{
+                background-color: {UIStyle.BTN_GRADIENT_START};
+                border-radius: 6px;
+                min-height: 30px;
+            }}
+            
+            #commandGuide QScrollBar::handle:vertical:hover {{
+                background-color: {UIStyle.BTN_GRADIENT_END};
+            }}
+            
+            #commandGuide QGroupBox {{
+                background-color: {UIStyle.BG_CARD};
+                border: 2px solid {UIStyle.BG_DIVIDER};
+                border-radius: {UIStyle.RADIUS_MEDIUM}px;
+                margin-top: 10px;
+                padding-top: 15px;
+                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
+            }}
+            
+            #commandGuide QPushButton {{
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 {UIStyle.BTN_GRADIENT_START},
+                    stop:1 {UIStyle.BTN_GRADIENT_END});
+                color: {UIStyle.TEXT_PRIMARY};
+                border-radius: {UIStyle.RADIUS_SMALL}px;
+                padding: 8px;
+                text-align: left;
+                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
+            }}
+            
+            #commandGuide QPushButton:hover {{
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 {UIStyle.BTN_GRADIENT_END},
+                    stop:1 {UIStyle.BTN_GRADIENT_START});
+            }}
         """
 
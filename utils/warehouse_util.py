@@ -0,0 +1,314 @@
+"""
+本地结果库（全部查询拉取到的结果）
+"""
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from main.config import FofaConfig
+from utils.data_util import DataUtil
+
+
+class ResultWarehouse:
+    """
+    本地结果库（SQLite，WAL模式）
+    
+    翻页引擎从FOFA拉取的每一页结果都写入本库，按(ip, port, host)合并：
+    记录首次和最近一次看到的时间，以及首次和最近一次找到它的查询语句；
+    新结果中为空的字段不覆盖已有的值。写入由后台线程合并成批，
+    每批一个事务，查询线程只负责入队。
+    
+    之后可以用search在本地检索历史结果，不再消耗查询额度。
+    """
+    _instance: Optional['ResultWarehouse'] = None
+    
+    # 每个事务最多写入的行数
+    BATCH_ROWS = 5000
+    
+    # search默认返回的条数上限
+    SEARCH_LIMIT = 10000
+    
+    # 行记录字段（DataUtil.RECORD_FIELDS）-> 表字段
+    COLUMNS = (
+        "host", "title", "ip", "domain", "port", "protocol", "server", "link",
+        "lastupdatetime", "fid", "os", "icp", "product", "cert_cn", "cert_org"
+    )
+    
+    # 保存的额外字段（检索结果显示这些列）
+    ADDITIONAL_FIELDS = (
+        "fid", "os", "icp", "product", "certs_subject_cn", "certs_subject_org", "lastupdatetime"
+    )
+    
+    # 可检索的字段 -> 表字段（cert同时匹配证书CN和组织）
+    SEARCH_FIELDS = {
+        "ip": ("ip",),
+        "port": ("port",),
+        "host": ("host_key",),
+        "domain": ("domain",),
+        "product": ("product",),
+        "icp": ("icp",),
+        "cert": ("cert_cn", "cert_org"),
+        "title": ("title",),
+        "server": ("server",),
+        "protocol": ("protocol",),
+        "query": ("query", "last_query"),
+    }
+    
+    # 检索条件：字段="值"（==为精确匹配），多个条件用&&连接
+    CONDITION_PATTERN = re.compile(r'^\s*(\w+)\s*(==|=)\s*"((?:[^"\\]|\\.)*)"\s*$')
+    
+    SCHEMA = (
+        # 主键以ip开头，按ip检索直接使用主键索引
+        "CREATE TABLE IF NOT EXISTS assets ("
+        "ip TEXT NOT NULL, port INTEGER NOT NULL, host_key TEXT NOT NULL, "
+        "host TEXT NOT NULL, title TEXT NOT NULL, domain TEXT NOT NULL, protocol TEXT NOT NULL, "
+        "server TEXT NOT NULL, link TEXT NOT NULL, lastupdatetime TEXT NOT NULL, fid TEXT NOT NULL, "
+        "os TEXT NOT NULL, icp TEXT NOT NULL, product TEXT NOT NULL, "
+        "cert_cn TEXT NOT NULL, cert_org TEXT NOT NULL, "
+        "query TEXT NOT NULL, last_query TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL, "
+        "PRIMARY KEY (ip, port, host_key)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS idx_assets_domain ON assets(domain)",
+        "CREATE INDEX IF NOT EXISTS idx_assets_product ON assets(product)",
+        "CREATE INDEX IF NOT EXISTS idx_assets_icp ON assets(icp)",
+        "CREATE INDEX IF NOT EXISTS idx_assets_cert_cn ON assets(cert_cn)",
+        "CREATE INDEX IF NOT EXISTS idx_assets_cert_org ON assets(cert_org)",
+        "CREATE INDEX IF NOT EXISTS idx_assets_last_seen ON assets(last_seen)",
+    )
+    
+    # 合并写入：保留首次看到的时间和查询，空字段不覆盖已有的值
+    UPSERT = (
+        "INSERT INTO assets (ip, port, host_key, host, title, domain, protocol, server, link, "
+        "lastupdatetime, fid, os, icp, product, cert_cn, cert_org, query, last_query, first_seen, last_seen) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (ip, port, host_key) DO UPDATE SET "
+        + ", ".join(
+            f"{name} = COALESCE(NULLIF(excluded.{name}, ''), {name})"
+            for name in COLUMNS if name not in ("ip", "port")
+        )
+        + ", last_query = excluded.last_query, last_seen = excluded.last_seen"
+    )
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: 数据库路径，默认在项目目录的cache下
+        """
+        if path is None:
+            path = Path(__file__).parent.parent / "cache" / "fofa_warehouse.db"
+        self.path = path
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self.written = 0
+    
+    @classmethod
+    def getInstance(cls) -> 'ResultWarehouse':
+        """单例模式获取结果库实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def isEnabled(self) -> bool:
+        """是否启用结果库"""
+        return FofaConfig.getInstance().warehouseStatus
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库（首次使用时创建），每个线程使用自己的连接"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        # WAL模式下写入不阻塞检索
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+    
+    def add(self, query: str, records: List[tuple]):
+        """
+        写入一页结果（只入队，由后台线程批量写入）
+        
+        Args:
+            query: 找到这些结果的查询语句
+            records: DataUtil.parseResults解析出的行记录
+        """
+        if not records or not self.isEnabled():
+            return
+        self._queue.put((query, time.time(), records))
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writeLoop, name="ResultWarehouse", daemon=True)
+                self._writer.start()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待已入队的结果全部写入
+        
+        Args:
+            timeout: 最长等待时间（秒），None表示一直等待
+        
+        Returns:
+            是否已全部写入
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def _writeLoop(self):
+        """后台写入循环（队列空闲一段时间后退出，有新结果时重新启动）"""
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            print(f"打开结果库失败: {e}", file=sys.stderr)
+            self._drain()
+            return
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=5)
+                except queue.Empty:
+                    with self._lock:
+                        # 加锁后再次确认，避免刚入队的结果无人写入
+                        if self._queue.empty():
+                            self._writer = None
+                            return
+                    continue
+                
+                # 合并队列中已有的页，一个事务写入
+                batch = [item]
+                rows = len(item[2])
+                while rows < self.BATCH_ROWS:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                    rows += len(item[2])
+                
+                try:
+                    with conn:
+                        conn.executemany(self.UPSERT, self._iterRows(batch))
+                    self.written += rows
+                except sqlite3.Error as e:
+                    print(f"写入结果库失败: {e}", file=sys.stderr)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            conn.close()
+    
+    def _drain(self):
+        """丢弃队列中的结果（数据库无法打开时）"""
+        with self._lock:
+            self._writer = None
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                self._queue.task_done()
+    
+    @staticmethod
+    def _iterRows(batch: List[Tuple[str, float, List[tuple]]]):
+        """行记录转为表中的一行"""
+        dedupe_key = DataUtil.dedupeKey
+        for query, seen, records in batch:
+            tail = (query, query, seen, seen)
+            for record in records:
+                # 去掉ip和port（已在主键中），其余字段按表中的顺序
+                yield dedupe_key(record[2], record[4], record[0]) + record[:2] + record[3:4] + record[5:] + tail
+    
+    @classmethod
+    def parseCondition(cls, expression: str) -> Tuple[str, list]:
+        """
+        解析检索条件
+        
+        Args:
+            expression: 如 product="nginx" && icp=="京ICP备xxx号"；
+                title为包含匹配，其余字段=和==都是精确匹配（可使用索引）
+        
+        Returns:
+            (SQL条件, 参数)
+        
+        Raises:
+            ValueError: 条件格式错误或字段不支持
+        """
+        clauses = []
+        params = []
+        for part in expression.split("&&"):
+            match = cls.CONDITION_PATTERN.match(part)
+            if not match:
+                raise ValueError(f"无法解析的条件: {part.strip()}")
+            field_name, _, value = match.groups()
+            columns = cls.SEARCH_FIELDS.get(field_name)
+            if columns is None:
+                raise ValueError(f"不支持的字段: {field_name}（可选: {','.join(cls.SEARCH_FIELDS)}）")
+            value = value.replace('\\"', '"')
+            if field_name == "port":
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise ValueError(f"端口必须是数字: {value}") from None
+            elif field_name == "host":
+                value = DataUtil.dedupeKey("", 0, value)[2]
+            
+            if field_name == "title":
+                escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append("title LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+            else:
+                clauses.append("(" + " OR ".join(f"{column} = ?" for column in columns) + ")")
+                params.extend([value] * len(columns))
+        return " AND ".join(clauses), params
+    
+    def search(self, expression: str, limit: int = SEARCH_LIMIT) -> List[tuple]:
+        """
+        检索本地结果库（按最近看到的时间倒序）
+        
+        Args:
+            expression: 检索条件，见parseCondition
+            limit: 最多返回的条数，0表示不限制
+        
+        Returns:
+            行记录列表（与DataUtil.parseResults的格式一致，可直接写入Tab数据）
+        
+        Raises:
+            ValueError: 条件格式错误
+            sqlite3.Error: 读取失败
+        """
+        where, params = self.parseCondition(expression)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM assets WHERE {where} ORDER BY last_seen DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        if not self.path.exists():
+            return []
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    
+    def stats(self) -> dict:
+        """获取结果库统计（条数、文件大小）"""
+        if not self.path.exists():
+            return {"count": 0, "size": 0}
+        try:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            try:
+                count = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            count = 0
+        size = sum(
+            path.stat().st_size for path in (self.path, Path(f"{self.path}-wal")) if path.exists()
+        )
+        return {"count": count, "size": size}
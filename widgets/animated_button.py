@@ -2,20 +2,23 @@
 动态按钮组件
 """
 from PySide6.QtWidgets import QPushButton, QGraphicsDropShadowEffect
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QEvent
 from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen, QFont
+from utils.animation_clock import AnimationClock
 from utils.theme import ThemeManager
 
 
 class AnimatedButton(QPushButton):
     """带动态效果的圆角按钮"""
     
+    # 缩放动画时长（秒）
+    ANIMATION_DURATION = 0.2
+    
     def __init__(self, text="", parent=None, radius=12):
         super().__init__(text, parent)
         self._radius = radius
         self._hovered = False
         self._pressed = False
-        self._animation = None
         self._scale = 1.0
         
         self.setMinimumHeight(40)
@@ -47,6 +50,12 @@ class AnimatedButton(QPushButton):
         self._text_color = colors["text"]
         self.update()
     
+    def changeEvent(self, event):
+        """主题切换（调色板变化）时更新颜色"""
+        if event.type() == QEvent.Type.PaletteChange:
+            self.updateStyle()
+        super().changeEvent(event)
+    
     def paintEvent(self, event):
         """绘制按钮"""
         painter = QPainter(self)
@@ -112,36 +121,10 @@ class AnimatedButton(QPushButton):
         super().mouseReleaseEvent(event)
     
     def animateScale(self, target_scale: float):
-        """动画改变缩放（使用定时器实现）"""
-        if self._animation:
-            self._animation.stop()
-            self._animation.deleteLater()
-        
-        # 使用定时器实现平滑动画
-        from PySide6.QtCore import QTimer
-        
-        start_scale = self._scale
-        steps = 10
-        current_step = 0
-        
-        def update_scale():
-            nonlocal current_step
-            if current_step <= steps:
-                t = current_step / steps
-                # 使用缓动函数
-                ease_t = t * t * (3.0 - 2.0 * t)  # smoothstep
-                self._scale = start_scale + (target_scale - start_scale) * ease_t
-                self.update()
-                current_step += 1
-            else:
-                self._scale = target_scale
-                self.update()
-                if self._animation:
-                    self._animation.stop()
-                    self._animation.deleteLater()
-                    self._animation = None
-        
-        self._animation = QTimer(self)
-        self._animation.timeout.connect(update_scale)
-        self._animation.start(20)  # 每20ms更新一次
-
+        """动画改变缩放（由全局动画时钟驱动）"""
+        AnimationClock.getInstance().animate(
+            self, "scale", self._scale, target_scale, self.ANIMATION_DURATION, self._setScale
+        )
+    
+    def _setScale(self, scale: float):
+        self._scale = scale
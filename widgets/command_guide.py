@@ -6,7 +6,6 @@ from PySide6.QtWidgets import (
     QGroupBox, QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PySide6.QtCore import Qt, Signal
-from utils.ui_style import UIStyle
 
 
 class CommandGuide(QWidget):
@@ -15,6 +14,8 @@ class CommandGuide(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # 样式统一在UIStyle.getMainStyleSheet中按对象名定义，随主题切换
+        self.setObjectName("commandGuide")
         self.initUI()
     
     def initUI(self):
@@ -25,40 +26,12 @@ class CommandGuide(QWidget):
         
         # 标题
         title = QLabel("命令指南")
-        title.setStyleSheet(f"""
-            QLabel {{
-                font-size: 16px;
-                font-weight: bold;
-                color: {UIStyle.TEXT_PRIMARY};
-                padding: 10px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-        """)
+        title.setObjectName("commandGuideTitle")
         layout.addWidget(title)
         
         # 创建滚动区域
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet(f"""
-            QScrollArea {{
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                background-color: {UIStyle.BG_CARD};
-            }}
-            QScrollBar:vertical {{
-                background-color: {UIStyle.BG_SECONDARY};
-                width: 12px;
-                border-radius: 6px;
-            }}
-            QScrollBar::handle:vertical {{
-                background-color: {UIStyle.BTN_GRADIENT_START};
-                border-radius: 6px;
-                min-height: 30px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background-color: {UIStyle.BTN_GRADIENT_END};
-            }}
-        """)
         
         # 内容容器
         content_widget = QWidget()
@@ -101,21 +74,6 @@ class CommandGuide(QWidget):
     def addLogicalOperators(self, layout):
         """添加逻辑连接符"""
         group = QGroupBox("逻辑连接符")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         operators = [
@@ -130,23 +88,6 @@ class CommandGuide(QWidget):
         
         for op, desc in operators:
             btn = QPushButton(f"{op} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, o=op: self.command_clicked.emit(o))
             group_layout.addWidget(btn)
         
@@ -156,21 +97,6 @@ class CommandGuide(QWidget):
     def addGeneralCommands(self, layout):
         """添加基础类命令"""
         group = QGroupBox("基础类（General）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -189,23 +115,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -215,21 +124,6 @@ class CommandGuide(QWidget):
     def addSpecialLabelCommands(self, layout):
         """添加标记类命令"""
         group = QGroupBox("标记类（Special Label）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -244,23 +138,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -270,21 +147,6 @@ class CommandGuide(QWidget):
     def addProtocolCommands(self, layout):
         """添加协议类命令"""
         group = QGroupBox("协议类（type=service）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -296,23 +158,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -322,21 +167,6 @@ class CommandGuide(QWidget):
     def addWebsiteCommands(self, layout):
         """添加网站类命令"""
         group = QGroupBox("网站类（type=subdomain）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -351,23 +181,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -377,21 +190,6 @@ class CommandGuide(QWidget):
     def addLocationCommands(self, layout):
         """添加地理位置命令"""
         group = QGroupBox("地理位置（Location）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -404,23 +202,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -430,21 +211,6 @@ class CommandGuide(QWidget):
     def addCertificateCommands(self, layout):
         """添加证书类命令"""
         group = QGroupBox("证书类（Certificate）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -459,23 +225,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -485,21 +234,6 @@ class CommandGuide(QWidget):
     def addTimeCommands(self, layout):
         """添加时间类命令"""
         group = QGroupBox("时间类（Last update time）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -510,23 +244,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -536,21 +253,6 @@ class CommandGuide(QWidget):
     def addIPCommands(self, layout):
         """添加独立IP语法命令"""
         group = QGroupBox("独立IP语法（独立IP系列语法，不可和上面其他语法共用）")
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {UIStyle.BG_CARD};
-                border: 2px solid {UIStyle.BG_DIVIDER};
-                border-radius: {UIStyle.RADIUS_MEDIUM}px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-            }}
-        """)
         group_layout = QVBoxLayout()
         
         commands = [
@@ -563,23 +265,6 @@ class CommandGuide(QWidget):
         
         for cmd, desc in commands:
             btn = QPushButton(f"{cmd} - {desc}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_START}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_END});
-                    color: {UIStyle.TEXT_PRIMARY};
-                    border-radius: {UIStyle.RADIUS_SMALL}px;
-                    padding: 8px;
-                    text-align: left;
-                    font-family: "Microsoft YaHei UI", "Microsoft YaHei", "SimHei", "PingFang SC", "Segoe UI", sans-serif;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 {UIStyle.BTN_GRADIENT_END}, 
-                        stop:1 {UIStyle.BTN_GRADIENT_START});
-                }}
-            """)
             btn.clicked.connect(lambda checked, c=cmd: self.command_clicked.emit(c))
             group_layout.addWidget(btn)
         
@@ -4,12 +4,16 @@
 from PySide6.QtWidgets import QPushButton, QGraphicsDropShadowEffect
 from PySide6.QtCore import Qt, QRectF
 from PySide6.QtGui import QPainter, QPainterPath, QLinearGradient, QColor, QPen, QBrush
+from utils.animation_clock import AnimationClock
 from utils.ui_style import UIStyle
 
 
 class ModernButton(QPushButton):
     """现代风格渐变按钮"""
     
+    # 悬停动画时长（秒）
+    ANIMATION_DURATION = 0.2
+    
     def __init__(self, text="", parent=None, gradient_start=None, gradient_end=None):
         super().__init__(text, parent)
         self.gradient_start = gradient_start or UIStyle.BTN_GRADIENT_START
@@ -61,12 +65,12 @@ class ModernButton(QPushButton):
             end_color.setAlpha(255)
             gradient.setColorAt(0, start_color)
             gradient.setColorAt(1, end_color)
-            glow_intensity = 1.0
+            glow_intensity = self._glow_intensity
         else:
             # 默认状态
             gradient.setColorAt(0, QColor(self.gradient_start))
             gradient.setColorAt(1, QColor(self.gradient_end))
-            glow_intensity = 0.5
+            glow_intensity = self._glow_intensity
         
         painter.fillPath(path, QBrush(gradient))
         
@@ -115,30 +119,10 @@ class ModernButton(QPushButton):
         super().mouseReleaseEvent(event)
     
     def _animateGlow(self, target_intensity: float):
-        """动画改变发光强度"""
-        if hasattr(self, '_glow_animation') and self._glow_animation:
-            self._glow_animation.stop()
-        
-        # 使用定时器实现动画
-        from PySide6.QtCore import QTimer
-        start_intensity = self._glow_intensity
-        steps = 10
-        current_step = [0]
-        
-        def updateGlow():
-            if current_step[0] <= steps:
-                t = current_step[0] / steps
-                ease_t = t * t * (3.0 - 2.0 * t)  # smoothstep
-                self._glow_intensity = start_intensity + (target_intensity - start_intensity) * ease_t
-                self.update()
-                current_step[0] += 1
-            else:
-                self._glow_intensity = target_intensity
-                self.update()
-                if hasattr(self, '_glow_timer') and self._glow_timer:
-                    self._glow_timer.stop()
-        
-        self._glow_timer = QTimer(self)
-        self._glow_timer.timeout.connect(updateGlow)
-        self._glow_timer.start(20)  # 每20ms更新一次
-
+        """动画改变发光强度（由全局动画时钟驱动）"""
+        AnimationClock.getInstance().animate(
+            self, "glow", self._glow_intensity, target_intensity, self.ANIMATION_DURATION, self._setGlowIntensity
+        )
+    
+    def _setGlowIntensity(self, intensity: float):
+        self._glow_intensity = intensity
@@ -2,8 +2,9 @@
 动态圆角UI组件
 """
 from PySide6.QtWidgets import QWidget, QFrame
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, Signal
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen
+from utils.animation_clock import AnimationClock
 
 
 class RoundedWidget(QFrame):
@@ -12,7 +13,6 @@ class RoundedWidget(QFrame):
     def __init__(self, parent=None, radius=10):
         super().__init__(parent)
         self._radius = radius
-        self._animation = None
         self.setAttribute(Qt.WA_TranslucentBackground)
     
     def setRadius(self, radius: int):
@@ -25,16 +25,19 @@ class RoundedWidget(QFrame):
         return self._radius
     
     def animateRadius(self, target_radius: int, duration: int = 300):
-        """动画改变圆角半径"""
-        if self._animation:
-            self._animation.stop()
-        
-        self._animation = QPropertyAnimation(self, b"radius")
-        self._animation.setDuration(duration)
-        self._animation.setStartValue(self._radius)
-        self._animation.setEndValue(target_radius)
-        self._animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-        self._animation.start()
+        """动画改变圆角半径（由全局动画时钟驱动，duration单位为毫秒）"""
+        AnimationClock.getInstance().animate(
+            self, "radius", self._radius, target_radius, duration / 1000, self._setAnimatedRadius,
+            self.inOutQuad
+        )
+    
+    def _setAnimatedRadius(self, radius: float):
+        self._radius = round(radius)
+    
+    @staticmethod
+    def inOutQuad(t: float) -> float:
+        """缓动函数（与QEasingCurve.InOutQuad一致）"""
+        return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
     
     def paintEvent(self, event):
         """绘制圆角"""